@@ -1,7 +1,163 @@
-from manim import *
+import argparse
+import sys
+
+from utils.render import QUALITIES, SCENES, render
+
+
+def print_render(result):
+    for scene in result.scenes:
+        status = "cached" if scene.cached else "rendered"
+        print(f"{scene.name:<16} {scene.wall_time:8.2f}s  {status:<8}  {scene.movie}")
+    print(f"{'Total':<16} {result.wall_time:8.2f}s  {'':<8}  {result.movie}")
+
+
+def warn_unsplit(result, segments):
+    for scene in result.scenes:
+        if scene.segments < segments:
+            print(f"warning: {scene.name} rendered as {scene.segments} segment(s) instead of {segments}: "
+                  f"scenes with dt updaters are not split, and every segment holds at least one play",
+                  file=sys.stderr)
+
+
+def print_batch(batch):
+    for variant in batch.variants:
+        print(f"{variant.index:<6} {variant.wall_time:8.2f}s  {variant.frames:>6} frames  {variant.movie}")
+    print(f"{len(batch.variants)} variants of {batch.scene} in {batch.wall_time:.2f}s: "
+          f"{batch.variants_per_hour:.0f} variants/hour, {batch.frames_per_second:.1f} frames/s")
+
+
+def print_benchmark(results, regressions):
+    metrics = list(next(iter(results["scenes"].values())))
+    print(f"{'':<16}" + "".join(f"{metric:>18}" for metric in metrics))
+    for name, values in results["scenes"].items():
+        print(f"{name:<16}" + "".join(f"{values[metric]:>18.2f}" for metric in metrics))
+    for r in regressions:
+        print(f"REGRESSION {r.scene} {r.metric}: {r.baseline:.2f} -> {r.current:.2f} "
+              f"({r.change:+.0%}, limit {r.threshold:.0%})")
+
+
+def parse_threshold(value):
+    metric, _, limit = value.partition("=")
+    try:
+        return metric, float(limit)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected METRIC=FRACTION, got {value!r}")
+
+
+def run_benchmark(args):
+    from utils.benchmark import (BASELINE_PATH, RESULTS_PATH, benchmark, compare,
+                                 load_results, save_results)
+
+    results = benchmark(args.scenes or None, args.qualities, args.repeat, args.seed,
+                        render=args.render)
+    print(f"Results written to {save_results(results, args.output or RESULTS_PATH)}")
+
+    baseline_path = args.baseline or BASELINE_PATH
+    baseline = None if args.save_baseline else load_results(baseline_path)
+    regressions = []
+    if baseline is not None:
+        regressions = compare(results, baseline, args.max_regression, dict(args.thresholds))
+    print_benchmark(results, regressions)
+
+    if args.save_baseline:
+        print(f"Baseline saved to {save_results(results, baseline_path)}")
+    elif baseline is None:
+        print(f"No baseline at {baseline_path}, run with --save-baseline to create one")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the TPG animations.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    render_parser = subparsers.add_parser("render", help="Render scenes in parallel and join them")
+    render_parser.add_argument("scenes", nargs="*", metavar="SCENE",
+                               help=f"Scenes to render (default: all, in story order): {', '.join(SCENES)}")
+    render_parser.add_argument("-q", "--quality", choices=QUALITIES,
+                               help="Render quality, as in manim -q (default: h, or l with --draft)")
+    render_parser.add_argument("-w", "--workers", type=int,
+                               help="Worker processes (default: one per scene)")
+    render_parser.add_argument("-o", "--output", help="Path of the joined video")
+    render_parser.add_argument("-s", "--segments", type=int,
+                               help="Render scenes one at a time, each split across this many workers")
+    render_parser.add_argument("--seed", type=int, help="Seed for random and numpy.random")
+    render_parser.add_argument("--no-cache", dest="cache", action="store_false",
+                               help="Always re-render instead of reusing unchanged scenes")
+    render_parser.add_argument("--draft", action="store_true",
+                               help="Stand-in geometry for quick timing passes (implies -ql unless -q is given)")
+    render_parser.add_argument("--trace", action="store_true",
+                               help="Write a Chrome trace of every play() to output/traces/")
+
+    publish_parser = subparsers.add_parser(
+        "publish", help="Render every scene once for several qualities and join one video per quality")
+    publish_parser.add_argument("scenes", nargs="*", metavar="SCENE",
+                                help="Scenes to render (default: all, in story order)")
+    publish_parser.add_argument("-q", "--qualities", nargs="+", default=["l", "h", "k"], choices=QUALITIES,
+                                help="Qualities to write (default: l h k)")
+    publish_parser.add_argument("-w", "--workers", type=int,
+                                help="Worker processes (default: one per scene)")
+    publish_parser.add_argument("--seed", type=int, help="Seed for random and numpy.random")
+
+    batch_parser = subparsers.add_parser(
+        "batch", help="Render parameter variants of one scene in long-lived workers")
+    batch_parser.add_argument("scene", choices=SCENES, help="Scene class to render")
+    batch_parser.add_argument("variants",
+                              help="Path of a JSON file holding a list of parameter objects, "
+                                   "e.g. [{\"max_bar_height\": 2}]")
+    batch_parser.add_argument("-q", "--quality", default="l", choices=QUALITIES,
+                              help="Render quality (default: l)")
+    batch_parser.add_argument("-w", "--workers", type=int,
+                              help="Worker processes (default: one per CPU, at most one per variant)")
+    batch_parser.add_argument("--seed", type=int, help="Seed for random and numpy.random")
+    batch_parser.add_argument("--draft", action="store_true", help="Stand-in geometry, as for render")
+
+    bench_parser = subparsers.add_parser("bench", help="Benchmark scene construction and rendering")
+    bench_parser.add_argument("scenes", nargs="*", metavar="SCENE",
+                              help="Scenes to benchmark (default: all)")
+    bench_parser.add_argument("-q", "--qualities", nargs="+", default=["l", "h"], choices=QUALITIES,
+                              help="Qualities to measure frame rates at (default: l h)")
+    bench_parser.add_argument("--no-render", dest="render", action="store_false",
+                              help="Only time construct() with animations skipped")
+    bench_parser.add_argument("-r", "--repeat", type=int, default=1,
+                              help="Runs per measurement, the fastest one counts (default: 1)")
+    bench_parser.add_argument("--seed", type=int, default=0, help="Seed for random and numpy.random")
+    bench_parser.add_argument("-o", "--output", help="Path of the results JSON")
+    bench_parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    bench_parser.add_argument("--save-baseline", action="store_true",
+                              help="Store these results as the new baseline instead of comparing")
+    bench_parser.add_argument("--max-regression", type=float, default=0.10,
+                              help="Allowed relative change for every metric (default: 0.10)")
+    bench_parser.add_argument("--threshold", dest="thresholds", action="append", default=[],
+                              type=parse_threshold, metavar="METRIC=FRACTION",
+                              help="Allowed relative change for one metric, e.g. h_fps=0.2")
+
+    args = parser.parse_args(argv)
+    unknown = [name for name in getattr(args, "scenes", []) if name not in SCENES]
+    if unknown:
+        parser.error(f"unknown scene(s): {', '.join(unknown)}")
+
+    if args.command == "render":
+        quality = args.quality or ("l" if args.draft else "h")
+        result = render(args.scenes or None, quality, args.workers, args.output,
+                        seed=args.seed, cache=args.cache, trace=args.trace, draft=args.draft,
+                        segments=args.segments)
+        print_render(result)
+        if args.segments:
+            warn_unsplit(result, args.segments)
+    elif args.command == "publish":
+        from utils.multires import publish
+
+        for result in publish(args.scenes or None, args.qualities, args.workers, args.seed).values():
+            print_render(result)
+    elif args.command == "batch":
+        from utils.batch import load_variants, render_batch
+
+        batch = render_batch(args.scene, load_variants(args.variants), args.quality, args.workers,
+                             args.seed, args.draft)
+        print_batch(batch)
+    elif args.command == "bench":
+        return run_benchmark(args)
 
-def main():
-    pass
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
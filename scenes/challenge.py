@@ -1,14 +1,24 @@
+import sys
+from pathlib import Path
+
 from manim import *
-import math
 import numpy as np
 
-class ChallengeScene(Scene):
+# Let `manim scenes/<file>.py` find the shared helpers in utils/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.cartpole import CART_SCALE, concatenate, simulate, transition
+from utils.labels import label
+from utils.playback import CartPolePlayback
+from utils.seeded import SeededScene
+
+
+class ChallengeScene(SeededScene):
     def construct(self):
         # Setup
         # Create base
         base = Square(side_length=1.0, fill_opacity=1, color=BLUE)
         base.move_to(DOWN * 3 + UP * 0.5)
-        initial_base_pos = base.get_center()
 
         # Create object to balance
         object_to_balance = Line(
@@ -26,7 +36,7 @@ class ChallengeScene(Scene):
         ).move_to(DOWN * 3)
 
         # Create text
-        challenge_text = Text("Problem: Learning to balance the rod").move_to(UP * 2.5)
+        challenge_text = label("Problem: Learning to balance the rod").move_to(UP * 2.5)
 
         # Fade in elements
         self.play(
@@ -36,68 +46,24 @@ class ChallengeScene(Scene):
         )
         self.wait(0.5)
 
-        # Attempt 1 - Instability & Fall
-        rotation_point = base.get_top()
-        
-        # Animation group for instability
-        self.play(
-            AnimationGroup(
-                Rotate(object_to_balance, angle=PI/3, about_point=rotation_point),
-                Succession(
-                    base.animate(rate_func=linear).shift(LEFT*0.3),
-                    base.animate(rate_func=linear).shift(RIGHT*0.4),
-                    base.animate(rate_func=linear).shift(LEFT*0.2),
-                    base.animate(rate_func=linear).shift(RIGHT*0.1),
-                ),
-                lag_ratio=0.5
-            ),
-            run_time=1.5
-        )
-
-        # Fall completely
-        self.play(
-            Rotate(object_to_balance, angle=PI/2 - PI/3, about_point=rotation_point),
-            run_time=0.5
+        # Two untrained attempts: recorded pushes that fail to catch the rod
+        wiggle = 0.3 * np.repeat([-1, 1, -1, 1], 5)
+        first_fall = simulate([0, 0, -0.05, 0], 2.0, actions=wiggle)
+        second_fall = simulate([0, 0, 0.05, 0], 1.6, actions=-wiggle[::-1])
+        attempts = concatenate(
+            first_fall,
+            transition(first_fall.final_state, np.zeros(4), 0.5),  # Reset system
+            second_fall,
         )
-        self.wait(0.5)
-
-        # Attempt 2 - Reset & Different Fall
-        # Reset system
-        self.play(
-            base.animate.move_to(initial_base_pos),
-            Rotate(object_to_balance, angle=-PI/2, about_point=rotation_point),
-            run_time=0.5
-        )
-
-        # Second instability animation
-        self.play(
-            AnimationGroup(
-                Rotate(object_to_balance, angle=-PI/3.5, about_point=rotation_point),
-                Succession(
-                    base.animate(rate_func=linear).shift(RIGHT*0.2),
-                    base.animate(rate_func=linear).shift(LEFT*0.3),
-                    base.animate(rate_func=linear).shift(RIGHT*0.1),
-                    base.animate(rate_func=linear).shift(LEFT*0.2),
-                ),
-                lag_ratio=0.5
-            ),
-            run_time=1.5
-        )
-
-        # Second fall
-        self.play(
-            Rotate(object_to_balance, angle=PI/2 - PI/3.5, about_point=rotation_point),
-            run_time=0.5
-        )
-        self.wait(0.5)
+        self.play(CartPolePlayback(base, object_to_balance, attempts, x_scale=CART_SCALE))
 
         # Show text
         self.play(Write(challenge_text))
         self.wait(2)
 
         # Solution text
-        solution_text = Text("Solution: TPG - Tangled Program Graphs", color=GREEN).move_to(UP * 2.5)
-        explanation_text = Text("A team-based approach where programs work together\nto learn optimal balancing strategies", font_size=24).next_to(solution_text, DOWN)
+        solution_text = label("Solution: TPG - Tangled Program Graphs", color=GREEN).move_to(UP * 2.5)
+        explanation_text = label("A team-based approach where programs work together\nto learn optimal balancing strategies", font_size=24).next_to(solution_text, DOWN)
 
         # Transform challenge text to solution text
         self.play(
@@ -117,7 +83,7 @@ class ChallengeScene(Scene):
         # Create team circle
         team_circle = Circle(radius=1.5, color=BLUE)
         team_circle.move_to(ORIGIN)  # Start at origin
-        team_label = Text("Decision Team", font_size=24).move_to(team_circle.get_center())
+        team_label = label("Decision Team", font_size=24).move_to(team_circle.get_center())
 
         # First transform the rod into a tree structure
         tree_branches = VGroup()
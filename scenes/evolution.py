@@ -1,7 +1,36 @@
+import sys
+from dataclasses import replace
+from pathlib import Path
+
 from manim import *
-import random
 
-class EvolutionScene(Scene):
+# Let `manim scenes/<file>.py` find the shared helpers in utils/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.camera import TPGCamera
+from utils.diagram import DECISION_TEAM, compile_team
+from utils.draft import arrow
+from utils.labels import label, prewarm
+from utils.evolution import evolve
+from utils.population import PopulationGrid, PopulationTransition, logged_generation
+from utils.seeded import SeededScene
+from utils.streams import stream
+
+POPULATION_SIZE = 400      # Teams in the scaled-up population
+POPULATION_GENERATIONS = 12
+EVOLUTION_SEED = 0         # Replayed run, evolved once and cached under output/cache/
+
+class EvolutionScene(SeededScene):
+    def __init__(self, **kwargs):
+        # TPGCamera draws the whole population grid as a single mobject
+        kwargs.setdefault("camera_class", TPGCamera)
+        super().__init__(**kwargs)
+
+    def setup(self):
+        # Parse the generation numbers and final diagram labels up front
+        prewarm("Generation: ", "1", "2", "3", "Team A", "Action", font_size=24)
+        prewarm("Crossover", "Mutation", font_size=20)
+
     def create_team_structure(self, position, color=BLUE):
         """Create a team structure with a circle and 1-2 program arrows."""
         # Create team circle
@@ -9,7 +38,7 @@ class EvolutionScene(Scene):
         team_circle.move_to(position)
         
         # Create program arrows
-        arrow1 = Arrow(
+        arrow1 = arrow(
             start=team_circle.get_right(),
             end=team_circle.get_right() + RIGHT * 1.5,
             buff=0.2,
@@ -17,8 +46,8 @@ class EvolutionScene(Scene):
         )
         
         # Randomly decide if we should add a second arrow
-        if np.random.random() > 0.5:
-            arrow2 = Arrow(
+        if stream("evolution.teams").random() > 0.5:
+            arrow2 = arrow(
                 start=team_circle.get_bottom(),
                 end=team_circle.get_bottom() + DOWN * 1.5,
                 buff=0.2,
@@ -30,47 +59,8 @@ class EvolutionScene(Scene):
 
     def construct(self):
         # Start with Scene 3's final state
-        # Create Team Circle with input
-        team_circle = Circle(radius=1.5, color=BLUE)
-        team_circle.move_to(ORIGIN + UP * 1.5)
-        team_circle.set_fill(BLUE, opacity=0.3)
-        
-        # Create Actions
-        action1 = Square(side_length=0.5, color=RED)
-        action1.move_to(team_circle.get_right() + RIGHT * 2.5)
-        
-        action2 = Circle(radius=0.3, color=YELLOW)
-        action2.move_to(team_circle.get_bottom() + DOWN * 2.5)
-        
-        action3 = Triangle(color=PURPLE).scale(0.3)
-        action3.move_to(team_circle.get_left() + LEFT * 2.5)
-
-        # Create Program Arrows (all green)
-        arrow1 = Arrow(
-            start=team_circle.get_right(),
-            end=action1.get_left(),
-            buff=0.2,
-            color=GREEN
-        )
-        arrow2 = Arrow(
-            start=team_circle.get_bottom(),
-            end=action2.get_top(),
-            buff=0.2,
-            color=GREEN
-        )
-        arrow3 = Arrow(
-            start=team_circle.get_left(),
-            end=action3.get_right(),
-            buff=0.2,
-            color=GREEN
-        )
-
-        # Create initial state group (without input square and bars)
-        initial_state = VGroup(
-            team_circle,
-            action1, action2, action3,
-            arrow1, arrow2, arrow3
-        )
+        # Team circle, actions and program arrows (all green), without input square and bars
+        initial_state = compile_team(replace(DECISION_TEAM, fill_opacity=0.3))
 
         # Show initial state
         self.add(initial_state)
@@ -105,8 +95,8 @@ class EvolutionScene(Scene):
         self.wait(0.5)
 
         # Create generation counter
-        generation_text = Text("Generation: ", font_size=24)
-        generation_number = Text("1", font_size=24)
+        generation_text = label("Generation: ", font_size=24)
+        generation_number = label("1", font_size=24)
         generation_counter = VGroup(generation_text, generation_number)
         generation_counter.arrange(RIGHT, buff=0.2)
         generation_counter.to_corner(UL)
@@ -122,7 +112,7 @@ class EvolutionScene(Scene):
         # Evolution loop (2 generations)
         for gen in range(2):
             # Increment generation
-            new_number = Text(str(gen + 2), font_size=24)
+            new_number = label(str(gen + 2), font_size=24)
             new_number.move_to(generation_number.get_center())
             
             self.play(
@@ -173,7 +163,7 @@ class EvolutionScene(Scene):
                 center_point = ORIGIN + UP * 0.5
                 
                 # Create "Crossover" text
-                crossover_text = Text("Crossover", font_size=20)
+                crossover_text = label("Crossover", font_size=20)
                 crossover_text.next_to(center_point, UP)
                 
                 self.play(
@@ -199,8 +189,8 @@ class EvolutionScene(Scene):
                 )
                 
                 # Show arrows connecting parents to child
-                arrow_to_child1 = Arrow(parent1_copy.get_bottom(), target_pos + UP * 0.5, color=YELLOW)
-                arrow_to_child2 = Arrow(parent2_copy.get_bottom(), target_pos + UP * 0.5, color=YELLOW)
+                arrow_to_child1 = arrow(start=parent1_copy.get_bottom(), end=target_pos + UP * 0.5, color=YELLOW)
+                arrow_to_child2 = arrow(start=parent2_copy.get_bottom(), end=target_pos + UP * 0.5, color=YELLOW)
                 
                 self.play(
                     GrowArrow(arrow_to_child1),
@@ -233,7 +223,7 @@ class EvolutionScene(Scene):
                 mutated_team = team_to_mutate.copy()
                 
                 # Create "Mutation" text
-                mutation_text = Text("Mutation", font_size=20)
+                mutation_text = label("Mutation", font_size=20)
                 mutation_text.next_to(team_to_mutate, UP)
                 
                 self.play(
@@ -257,12 +247,12 @@ class EvolutionScene(Scene):
                 # Change appearance after mutation
                 mutated_team[0].set_color(TEAL)  # Different color than crossover
                 
-                # Add some random rotation to arrows to show mutation
-                for arrow in mutated_team[4:]:  # Arrows start at index 4
-                    self.play(
-                        arrow.animate.rotate(0.3 * (random.random() - 0.5)),
-                        run_time=0.3
-                    )
+                # Add some random rotation to arrows to show mutation, all at once
+                self.play(
+                    *[arrow.animate.rotate(0.3 * (stream("evolution.mutation").random() - 0.5))
+                      for arrow in mutated_team[4:]],  # Arrows start at index 4
+                    run_time=0.3
+                )
                 
                 # Move mutated team to deleted position
                 self.play(
@@ -275,6 +265,22 @@ class EvolutionScene(Scene):
             
             self.wait(0.5)
 
+        # Scale up: replay a real evolution run, one generation per step
+        run = evolve(teams=POPULATION_SIZE, generations=POPULATION_GENERATIONS, seed=EVOLUTION_SEED)
+        population = PopulationGrid.from_log(run, width=12, height=6, center=DOWN * 0.4)
+        self.play(FadeOut(teams), FadeIn(population), run_time=1)
+
+        for gen in range(run.generations):
+            new_number = label(str(gen + 4), font_size=24)
+            new_number.move_to(generation_number.get_center())
+            target, replaced, origins = logged_generation(run, gen, population.state.positions)
+            self.play(
+                PopulationTransition(population, target, replaced, origins),
+                Transform(generation_number, new_number),
+                run_time=0.6
+            )
+
+        self.play(FadeOut(population), FadeIn(teams), run_time=1)
         self.wait(2)
 
         # Zoom into bottom left team and transition to simple diagram
@@ -283,13 +289,13 @@ class EvolutionScene(Scene):
         # Create the target simple diagram
         target_team = Circle(radius=0.5, color=BLUE)
         target_team.move_to(LEFT * 2)
-        team_a_label = Text("Team A", font_size=24).next_to(target_team, UP, buff=0.2)
+        team_a_label = label("Team A", font_size=24).next_to(target_team, UP, buff=0.2)
         
         target_action = Square(side_length=0.5, color=RED)
         target_action.move_to(RIGHT * 2)
-        action_label = Text("Action", font_size=24).next_to(target_action, DOWN, buff=0.2)
+        action_label = label("Action", font_size=24).next_to(target_action, DOWN, buff=0.2)
         
-        target_arrow = Arrow(
+        target_arrow = arrow(
             start=target_team.get_right(),
             end=target_action.get_left(),
             buff=0.2,
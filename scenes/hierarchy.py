@@ -1,43 +1,61 @@
+import os
+import sys
+from pathlib import Path
+
 from manim import *
-import random
-
-class HierarchyScene(Scene):
-    def create_complex_node(self, position, node_id, colors=None):
-        """Create a complex node with multiple color segments."""
-        if colors is None:
-            # Default colors if none provided
-            colors = [BLUE, RED, YELLOW, GREEN, PURPLE]
-            random.shuffle(colors)
-            colors = colors[:random.randint(2, 5)]  # Use 2-5 colors
-        
-        # Create circle with segments
-        radius = 0.25  # Reduced radius for better fit
-        circle = Circle(radius=radius)
-        segments = VGroup()
-        
-        # Create pie segments
-        num_segments = len(colors)
-        for i, color in enumerate(colors):
-            angle_start = i * TAU / num_segments
-            angle_end = (i + 1) * TAU / num_segments
-            segment = AnnularSector(
-                inner_radius=0,
-                outer_radius=radius,
-                angle=angle_end - angle_start,
-                start_angle=angle_start,
-                color=color,
-                fill_opacity=1
-            )
-            segments.add(segment)
-        
-        # Add node ID
-        node_id_text = Text(str(node_id), font_size=14, color=WHITE)  # Smaller font
-        node_id_text.move_to(circle.get_center())
-        
-        # Group everything
-        node = VGroup(segments, node_id_text)
-        node.move_to(position)
-        return node
+import numpy as np
+
+# Let `manim scenes/<file>.py` find the shared helpers in utils/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import replay
+from utils.cache import CACHE_DIR, code_hash
+from utils.camera import TPGCamera
+from utils.draft import arrow
+from utils.freeze import freeze
+from utils.graph import create_tpg_graph
+from utils.idle import IdleFrameScene
+from utils.labels import label, prewarm
+from utils.particles import ParticleSystem
+from utils.playback import TraceReplay
+from utils.replay import record_cartpole_trace, replay_rates
+from utils.streams import stream
+
+# Set TPG_TRACE to a recorded execution trace of teams A-D (0-3) to replay it
+# instead of the two hand-built routes, or to "demo" for a cart-pole demo trace
+TRACE_PATH = os.environ.get("TPG_TRACE")
+TRACE_DEMO = "demo"
+TRACE_DEMO_STEPS = 1_000_000
+TRACE_SECONDS = 6
+PARTICLE_COUNT = 5000  # Inputs streaming through the hierarchy at once
+
+
+def trace_file():
+    """The trace named by TPG_TRACE, recording the demo trace on first use."""
+    if TRACE_PATH == TRACE_DEMO:
+        path = CACHE_DIR / "traces" / f"cartpole_{TRACE_DEMO_STEPS}_{code_hash(replay.__file__)}.trace"
+        if not path.exists():
+            record_cartpole_trace(path, TRACE_DEMO_STEPS)
+        return path
+    path = Path(TRACE_PATH)
+    if not path.is_file():
+        raise FileNotFoundError(f"TPG_TRACE={TRACE_PATH} is not a trace file, "
+                                f"set TPG_TRACE={TRACE_DEMO} for the demo trace")
+    return path
+
+
+class HierarchyScene(IdleFrameScene):
+    # Particle updaters keep every frame dynamic, even once the stream has drained
+    def __init__(self, **kwargs):
+        # TPGCamera draws the single-mobject pie nodes of the TPG graph
+        kwargs.setdefault("camera_class", TPGCamera)
+        super().__init__(**kwargs)
+
+    def setup(self):
+        # "Team A" and "Action" are each used several times below
+        prewarm("Team A", "Team B", "Team C", "Team D", "Action", font_size=24)
+        # Fail before rendering anything when the trace is missing
+        self.trace = trace_file() if TRACE_PATH else None
 
     def construct(self):
         # Cleanup: Fade out previous scene elements
@@ -48,15 +66,15 @@ class HierarchyScene(Scene):
         # Create initial centered Team A
         team_a = Circle(radius=0.5, color=BLUE)
         team_a.move_to(LEFT * 2)  # Move left to make room for arrow
-        team_a_label = Text("Team A", font_size=24).next_to(team_a, UP, buff=0.2)
+        team_a_label = label("Team A", font_size=24).next_to(team_a, UP, buff=0.2)
 
         # Create initial action
         initial_action = Square(side_length=0.5, color=RED)
         initial_action.move_to(RIGHT * 2)  # Move right to make room for arrow
-        initial_action_label = Text("Action", font_size=24).next_to(initial_action, DOWN, buff=0.2)
+        initial_action_label = label("Action", font_size=24).next_to(initial_action, DOWN, buff=0.2)
 
         # Create initial arrow
-        initial_arrow = Arrow(
+        initial_arrow = arrow(
             start=team_a.get_right(),
             end=initial_action.get_left(),
             buff=0.2,
@@ -85,53 +103,53 @@ class HierarchyScene(Scene):
         # Level 1 (Top) - Move Team A up
         team_a_target = Circle(radius=0.5, color=BLUE)
         team_a_target.move_to(UP * 2)
-        team_a_label_target = Text("Team A", font_size=24).next_to(team_a_target, UP, buff=0.2)
+        team_a_label_target = label("Team A", font_size=24).next_to(team_a_target, UP, buff=0.2)
 
         # Level 2 (Middle)
         team_b = Circle(radius=0.5, color=BLUE)
         team_b.move_to(ORIGIN + LEFT * 1.5)
-        team_b_label = Text("Team B", font_size=24).next_to(team_b, LEFT, buff=0.2)
+        team_b_label = label("Team B", font_size=24).next_to(team_b, LEFT, buff=0.2)
 
         team_c = Circle(radius=0.5, color=BLUE)
         team_c.move_to(ORIGIN + RIGHT * 1.5)
-        team_c_label = Text("Team C", font_size=24).next_to(team_c, RIGHT, buff=0.2)
+        team_c_label = label("Team C", font_size=24).next_to(team_c, RIGHT, buff=0.2)
 
         # Level 3 (Bottom)
         team_d = Circle(radius=0.5, color=BLUE)
         team_d.move_to(DOWN * 2)
-        team_d_label = Text("Team D", font_size=24).next_to(team_d, DOWN, buff=0.2)
+        team_d_label = label("Team D", font_size=24).next_to(team_d, DOWN, buff=0.2)
 
         # Final Action Icon
         final_action = Square(side_length=0.5, color=RED)
         final_action.move_to(DOWN * 2 + RIGHT * 3)
-        final_action_label = Text("Action", font_size=24).next_to(final_action, DOWN, buff=0.2)
+        final_action_label = label("Action", font_size=24).next_to(final_action, DOWN, buff=0.2)
 
         # Create hierarchical arrows
-        arrow1 = Arrow(
+        arrow1 = arrow(
             start=team_a_target.get_bottom(),
             end=team_b.get_top(),
             buff=0.2,
             color=GREEN
         )
-        arrow2 = Arrow(
+        arrow2 = arrow(
             start=team_a_target.get_bottom(),
             end=team_c.get_top(),
             buff=0.2,
             color=GREEN
         )
-        arrow3 = Arrow(
+        arrow3 = arrow(
             start=team_b.get_bottom(),
             end=team_d.get_top(),
             buff=0.2,
             color=GREEN
         )
-        arrow4 = Arrow(
+        arrow4 = arrow(
             start=team_c.get_bottom(),
             end=team_d.get_top(),
             buff=0.2,
             color=GREEN
         )
-        arrow5 = Arrow(
+        arrow5 = arrow(
             start=team_d.get_right(),
             end=final_action.get_left(),
             buff=0.2,
@@ -178,55 +196,88 @@ class HierarchyScene(Scene):
         )
         self.wait(0.5)
 
-        # Animation 6: Show information flow using MoveAlongPath
-        # Create dots for each input
-        input1_dot = Dot(color=YELLOW, radius=0.1)
-        input2_dot = Dot(color=RED, radius=0.1)
-        input1_dot.move_to(team_a_target.get_center())
-        input2_dot.move_to(team_a_target.get_center())
-
-        # Create smooth paths using VMobject
-        def create_path(*arrows):
-            path = VMobject()
-            points = []
-            for arrow in arrows:
-                points.extend(arrow.points)
-            path.set_points_as_corners(points)
-            return path
-
-        # Create paths for both routes
-        path1 = create_path(arrow1, arrow3, arrow5)
-        path2 = create_path(arrow2, arrow4, arrow5)
-
-        # Create a circle to transform into
-        circle_action = Circle(radius=0.25, color=PURPLE)
-        circle_action.move_to(final_action.get_center())
-        circle_action_label = Text("Action", font_size=24).next_to(circle_action, DOWN, buff=0.2)
-
-        # Animate first input through path1
-        self.play(
-            MoveAlongPath(input1_dot, path1, rate_func=rate_functions.ease_in_out_sine),
-            run_time=3
-        )
-        self.wait(0.5)
+        if TRACE_PATH:
+            # Animation 6: Replay a recorded trace, teams and edges lit by how often they were visited
+            self.play(
+                Create(final_action),
+                Write(final_action_label),
+                GrowArrow(arrow5),
+                run_time=1
+            )
+            # Both recorded actions (push left, push right) land on the one action shown
+            node_rates, edge_rates = replay_rates(
+                self.trace,
+                bins=int(TRACE_SECONDS * config.frame_rate),
+                node_map=[0, 1, 2, 3, 4, 4],
+                edges=[(0, 1), (0, 2), (1, 3), (2, 3), (3, 4)],
+            )
+            self.play(
+                TraceReplay(
+                    [team_a, team_b, team_c, team_d, final_action],
+                    [arrow1, arrow2, arrow3, arrow4, arrow5],
+                    node_rates, edge_rates,
+                ),
+                run_time=TRACE_SECONDS
+            )
+        else:
+            # Animation 6: Show information flow using MoveAlongPath
+            # Create dots for each input
+            input1_dot = Dot(color=YELLOW, radius=0.1)
+            input2_dot = Dot(color=RED, radius=0.1)
+            input1_dot.move_to(team_a_target.get_center())
+            input2_dot.move_to(team_a_target.get_center())
+
+            # Create smooth paths using VMobject
+            def create_path(*arrows):
+                path = VMobject()
+                points = []
+                for arrow in arrows:
+                    points.extend(arrow.points)
+                path.set_points_as_corners(points)
+                return path
+
+            # Create paths for both routes
+            path1 = create_path(arrow1, arrow3, arrow5)
+            path2 = create_path(arrow2, arrow4, arrow5)
+
+            # Create a circle to transform into
+            circle_action = Circle(radius=0.25, color=PURPLE)
+            circle_action.move_to(final_action.get_center())
+            circle_action_label = label("Action", font_size=24).next_to(circle_action, DOWN, buff=0.2)
+
+            # Animate first input through path1
+            self.play(
+                MoveAlongPath(input1_dot, path1, rate_func=rate_functions.ease_in_out_sine),
+                run_time=3
+            )
+            self.wait(0.5)
         
-        # Create final action and arrow after first input completes
-        self.play(
-            Create(final_action),
-            Write(final_action_label),
-            GrowArrow(arrow5),
-            run_time=1
-        )
-        self.play(FadeOut(input1_dot))
+            # Create final action and arrow after first input completes
+            self.play(
+                Create(final_action),
+                Write(final_action_label),
+                GrowArrow(arrow5),
+                run_time=1
+            )
+            self.play(FadeOut(input1_dot))
 
-        # Animate second input through path2 and transform the action
-        self.play(
-            MoveAlongPath(input2_dot, path2, rate_func=rate_functions.ease_in_out_sine),
-            Transform(final_action, circle_action),
-            Transform(final_action_label, circle_action_label),
-            run_time=3
-        )
-        self.play(FadeOut(input2_dot))
+            # Animate second input through path2 and transform the action
+            self.play(
+                MoveAlongPath(input2_dot, path2, rate_func=rate_functions.ease_in_out_sine),
+                Transform(final_action, circle_action),
+                Transform(final_action_label, circle_action_label),
+                run_time=3
+            )
+            self.play(FadeOut(input2_dot))
+
+            # Thousands of inputs streaming down both routes at once
+            particles = ParticleSystem([path1, path2], count=PARTICLE_COUNT, colors=[YELLOW, RED], speed=0.6,
+                                       rng=stream("hierarchy.particles"))
+            self.add(particles.start_flow())
+            self.wait(3)
+            particles.drain()
+            self.wait(particles.drain_time)
+            self.remove(particles.stop_flow())
 
         # Hold final state
         self.wait(0.5)
@@ -242,7 +293,7 @@ class HierarchyScene(Scene):
         )
         
         # Transition text
-        transition_text = Text("Evolving into a complex program graph...", font_size=32)
+        transition_text = label("Evolving into a complex program graph...", font_size=32)
         transition_text.to_edge(UP)
         
         # Show transition text
@@ -252,98 +303,9 @@ class HierarchyScene(Scene):
         )
         self.wait(0.5)
         
-        # Create complex nodes
-        nodes = VGroup()
-        
-        # Define clear hierarchical levels
-        LEVEL_SPACING = 1.25  # Vertical spacing between levels
-        NODE_SPACING = 1.5    # Horizontal spacing between nodes
-        
-        # Level 1 (Top) - Root node
-        level1_y = 2.5
-        node_positions = [
-            ORIGIN + UP * level1_y,  # Node 1 (root)
-        ]
-        
-        # Level 2
-        level2_y = level1_y - LEVEL_SPACING
-        level2_nodes = 3
-        for i in range(level2_nodes):
-            x = (i - 1) * NODE_SPACING
-            node_positions.append(RIGHT * x + UP * level2_y)  # Nodes 2-4
-        
-        # Level 3
-        level3_y = level2_y - LEVEL_SPACING
-        level3_nodes = 4
-        for i in range(level3_nodes):
-            x = (i - 1.5) * NODE_SPACING
-            node_positions.append(RIGHT * x + UP * level3_y)  # Nodes 5-8
-        
-        # Level 4
-        level4_y = level3_y - LEVEL_SPACING
-        level4_nodes = 5
-        for i in range(level4_nodes):
-            x = (i - 2) * NODE_SPACING
-            node_positions.append(RIGHT * x + UP * level4_y)  # Nodes 9-13
-        
-        # Level 5 (Bottom)
-        level5_y = level4_y - LEVEL_SPACING
-        level5_nodes = 5
-        for i in range(level5_nodes):
-            x = (i - 2) * NODE_SPACING
-            node_positions.append(RIGHT * x + UP * level5_y)  # Nodes 14-18
-        
-        # Create nodes with random color segments
-        for i, pos in enumerate(node_positions, 1):
-            node = self.create_complex_node(pos, i)
-            nodes.add(node)
-        
-        # Create arrows between nodes ensuring hierarchical structure
-        arrows = VGroup()
-        connections = [
-            # From root (Node 1) to Level 2
-            (0, 1), (0, 2), (0, 3),
-            
-            # From Level 2 to Level 3
-            (1, 4), (1, 5), 
-            (2, 5), (2, 6),
-            (3, 6), (3, 7),
-            
-            # From Level 3 to Level 4
-            (4, 8), (4, 9),
-            (5, 9), (5, 10),
-            (6, 10), (6, 11),
-            (7, 11), (7, 12),
-            
-            # From Level 4 to Level 5
-            (8, 13), (8, 14),
-            (9, 14), (9, 15),
-            (10, 15), (10, 16),
-            (11, 16), (11, 17),
-            (12, 17),
-            
-            # Additional cross-connections for complexity
-            (2, 4), (2, 7),
-            (5, 8), (6, 12),
-            (9, 13), (10, 17),
-            (14, 16), (15, 17)
-        ]
-        
-        for start_idx, end_idx in connections:
-            start_node = nodes[start_idx]
-            end_node = nodes[end_idx]
-            arrow = Arrow(
-                start=start_node.get_center(),
-                end=end_node.get_center(),
-                buff=0.2,
-                color=GREEN,
-                max_tip_length_to_length_ratio=0.08,  # Smaller arrowheads
-                stroke_width=1.5  # Thinner arrows
-            )
-            arrows.add(arrow)
-        
         # Create the complex graph group
-        complex_graph = VGroup(nodes, arrows)
+        # The graph never changes shape, so render it as a handful of merged mobjects
+        complex_graph = freeze(create_tpg_graph())
         
         # Fade out hierarchy while fading in complex graph
         self.play(
@@ -1,102 +1,100 @@
+import sys
+from dataclasses import replace
+from pathlib import Path
+
 from manim import *
+import numpy as np
+
+# Let `manim scenes/<file>.py` find the shared helpers in utils/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.cartpole import balancing_policy, simulate
+from utils.diagram import DECISION_TEAM, TeamSpec, compile_team
+from utils.labels import label
+from utils.playback import BidPlayback
+from utils.programs import Programs
+from utils.seeded import SeededScene
+from utils.streams import stream
+
+# The team's programs over cart-pole inputs x0..x3 (cart position and
+# speed, pole angle and spin): A pushes when the pole leans and falls one
+# way, B the other way, C bids on the cart straying from the middle
+TEAM_PROGRAMS = Programs.compile([
+    [("add", 0, "x2"), ("add", 0, "x3")],
+    [("sub", 0, "x2"), ("sub", 0, "x3")],
+    [("add", 1, "x0"), ("mul", 1, "x0"), ("add", 0, "r1"), ("mul", 0, "r1")],
+])
+BID_SECONDS = 8  # Simulated time shown in the bid sequence
+
+class TPGScene(SeededScene):
+    # Variant parameters, overridden per instance by utils.batch
+    team = replace(DECISION_TEAM, label="Decision Team", programs=TEAM_PROGRAMS, bars=True)
+    max_bar_height = 1.5
+
+    def team_spec(self):
+        """The team to draw, with bars, and random programs if it has none for its actions."""
+        spec = self.team if isinstance(self.team, TeamSpec) else TeamSpec.from_dict(self.team)
+        spec = replace(spec, bars=True)
+        if spec.programs is None or len(spec.programs) != len(spec.actions):
+            spec = replace(spec, programs=Programs.random(len(spec.actions), inputs=4, rng=stream("tpg.programs")))
+        return spec
 
-class TPGScene(Scene):
     def construct(self):
         # Cleanup: Fade out previous scene elements
         if self.mobjects:  # Check if there are any mobjects to fade out
             self.play(FadeOut(Group(*self.mobjects)))
             self.wait(0.5)
 
-        # Create Team Circle and Label
-        team_circle = Circle(radius=1.5, color=BLUE)
-        team_circle.move_to(ORIGIN + UP * 1.5)
-        team_label = Text("Decision Team", font_size=24).move_to(team_circle.get_center())
-        
-        # Create Action Representations first to position arrows correctly
-        action1 = Square(side_length=0.5, color=RED)
-        action1.move_to(team_circle.get_right() + RIGHT * 2.5)
-        action1_label = Text("Action A", font_size=16).next_to(action1, DOWN, buff=0.1)
-        
-        action2 = Circle(radius=0.3, color=YELLOW)
-        action2.move_to(team_circle.get_bottom() + DOWN * 2.5)
-        action2_label = Text("Action B", font_size=16).next_to(action2, DOWN, buff=0.1)
-        
-        action3 = Triangle(color=PURPLE).scale(0.3)
-        action3.move_to(team_circle.get_left() + LEFT * 2.5)
-        action3_label = Text("Action C", font_size=16).next_to(action3, DOWN, buff=0.1)
-
-        # Create Program Arrows pointing to the actions
-        arrow1 = Arrow(
-            start=team_circle.get_right(),
-            end=action1.get_left(),
-            buff=0.2,  # Add some space between arrow and shape
-            color=GREEN
-        )
-        arrow2 = Arrow(
-            start=team_circle.get_bottom(),
-            end=action2.get_top(),
-            buff=0.2,
-            color=GREEN
-        )
-        arrow3 = Arrow(
-            start=team_circle.get_left(),
-            end=action3.get_right(),
-            buff=0.2,
-            color=GREEN
-        )
+        # Team circle and label, actions, and program arrows pointing at them
+        team = compile_team(self.team_spec())
+        team_circle = team.circle
+        actions, arrows, bars = team.actions, team.arrows, team.bars
+        team_texts = [text for text in [team.label] if text is not None]
 
         # Animation Sequence
         # 1. Create Team Circle and Label
         self.play(
             Create(team_circle),
-            FadeIn(team_label),
+            *[FadeIn(text) for text in team_texts],
             run_time=1
         )
         self.wait(0.5)
 
         # 2. Grow Program Arrows
         self.play(
-            GrowArrow(arrow1),
-            GrowArrow(arrow2),
-            GrowArrow(arrow3),
+            *[GrowArrow(arrow) for arrow in arrows],
             run_time=1
         )
         self.wait(0.5)
 
         # 4. Show Actions
         self.play(
-            FadeIn(action1),
-            FadeIn(action1_label),
-            FadeIn(action2),
-            FadeIn(action2_label),
-            FadeIn(action3),
-            FadeIn(action3_label),
+            *[FadeIn(action) for action in actions],
+            *[FadeIn(text) for text in team.action_labels],
             run_time=1
         )
         self.wait(1)
 
         # Highlight team circle when "Teams" appears
         self.play(
-            team_circle.animate.set_fill(BLUE, opacity=0.3),
+            team_circle.animate.set_fill(team.spec.color, opacity=0.3),
             run_time=0.5
         )
         self.wait(0.2)
 
         # Scene 3: The Decision Process - Input and Action
         # 1. Cleanup previous text labels
-        self.play(
-            FadeOut(team_label),
-            FadeOut(action1_label),
-            FadeOut(action2_label),
-            FadeOut(action3_label),
-            run_time=0.5
-        )
-        self.wait(0.5)
+        if team_texts or team.action_labels:
+            self.play(
+                *[FadeOut(text) for text in team_texts + team.action_labels],
+                run_time=0.5
+            )
+            self.wait(0.5)
 
         # 2. Create and animate input
         input_icon = Square(side_length=0.5, color=WHITE)
         input_icon.move_to(LEFT * 4)
-        input_text = Text("Input", font_size=16).next_to(input_icon, DOWN, buff=0.1)
+        input_text = label("Input", font_size=16).next_to(input_icon, DOWN, buff=0.1)
         
         self.play(
             FadeIn(input_icon),
@@ -113,43 +111,37 @@ class TPGScene(Scene):
         )
         self.wait(0.5)
 
-        # 3. Create and animate suggestion bars
-        # Create bars with initial height
-        bar1 = Rectangle(height=0.1, width=0.2, color=RED, fill_opacity=0.8)
-        bar1.next_to(action1, RIGHT, buff=0.2)
-        bar2 = Rectangle(height=0.1, width=0.2, color=YELLOW, fill_opacity=0.8)
-        bar2.next_to(action2, RIGHT, buff=0.2)
-        bar3 = Rectangle(height=0.1, width=0.2, color=PURPLE, fill_opacity=0.8)
-        bar3.next_to(action3, LEFT, buff=0.2)  # Changed to LEFT side
-
-        # First show the bars
+        # 3. Show the suggestion bars, one per action
         self.play(
-            FadeIn(bar1),
-            FadeIn(bar2),
-            FadeIn(bar3),
+            *[FadeIn(bar) for bar in bars],
             run_time=0.5
         )
         self.wait(0.5)
 
-        # Then animate them growing to different heights
-        self.play(
-            bar1.animate.stretch_to_fit_height(1.5),
-            bar2.animate.stretch_to_fit_height(0.8),
-            bar3.animate.stretch_to_fit_height(1.2),
-            run_time=1
-        )
+        # Then grow them to the team's real bids on the first input
+        inputs = simulate(np.array([0, 0, 0.1, 0]), BID_SECONDS, policy=balancing_policy()).states
+        bids = team.spec.bids(inputs)
+        bid_range = (bids.min(), bids.max())
+        winner = bids[0].argmax()
+        self.play(BidPlayback(bars, bids[:1], bid_range=bid_range, max_height=self.max_bar_height), run_time=1)
         self.wait(0.5)
 
-        # Highlight winning bar (bar1)
+        # Highlight winning bar
         self.play(
-            Flash(bar1, color=RED, line_length=0.2, flash_radius=0.3),
+            Flash(bars[winner], color=bars[winner].get_color(), line_length=0.2, flash_radius=0.3),
             run_time=0.5
         )
 
         # 4. Highlight winning program and action
         self.play(
-            arrow1.animate.set_color(YELLOW),
-            Indicate(action1),
+            arrows[winner].animate.set_color(YELLOW),
+            Indicate(actions[winner]),
             run_time=0.5
         )
         self.wait(0.5)
+
+        # 5. The same team bidding on every input as the pole is balanced
+        self.play(arrows[winner].animate.set_color(team.spec.arrow_color), run_time=0.3)
+        self.play(BidPlayback(bars, bids[1:], arrows=arrows, bid_range=bid_range,
+                              max_height=self.max_bar_height), run_time=4, rate_func=linear)
+        self.wait(0.5)
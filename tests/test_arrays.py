@@ -0,0 +1,47 @@
+import importlib.util
+import unittest
+
+import numpy as np
+
+from utils.arrays import csr_gather, line_curves
+
+HAS_MANIM = importlib.util.find_spec("manim") is not None
+
+
+class CsrGatherTest(unittest.TestCase):
+    def test_gathers_rows_in_the_given_order(self):
+        offsets = np.array([0, 2, 2, 5])
+        np.testing.assert_array_equal(csr_gather(offsets, np.array([2, 0])), [2, 3, 4, 0, 1])
+        self.assertEqual(len(csr_gather(offsets, np.array([1]))), 0)
+        self.assertEqual(len(csr_gather(offsets, np.array([], dtype=int))), 0)
+
+
+class LineCurvesTest(unittest.TestCase):
+    def test_handles_split_the_segment_in_thirds(self):
+        start, end = np.zeros((2, 3)), np.array([[3.0, 0, 0], [0, 3.0, 0]])
+        curves = line_curves(start, end)
+        self.assertEqual(curves.shape, (2, 4, 3))
+        np.testing.assert_allclose(curves[0, :, 0], [0, 1, 2, 3])
+        np.testing.assert_allclose(curves[1, :, 1], [0, 1, 2, 3])
+
+
+@unittest.skipUnless(HAS_MANIM, "needs manim")
+class IncidentEdgesTest(unittest.TestCase):
+    def test_moving_a_node_updates_only_its_edges(self):
+        from manim import Dot
+        from utils.linked import LinkedGraph
+
+        nodes = [Dot([x, 0, 0]) for x in range(4)]
+        graph = LinkedGraph(nodes, [(0, 1), (1, 2), (2, 3), (0, 3)])
+        np.testing.assert_array_equal(graph.incident_edges([0]), [0, 3])
+        np.testing.assert_array_equal(graph.incident_edges([1, 2]), [0, 1, 2])
+
+        before = graph.arrows.points.reshape(4, -1, 3).copy()
+        graph.move_nodes([3], [[3, 2, 0]])
+        after = graph.arrows.points.reshape(4, -1, 3)
+        np.testing.assert_array_equal(after[[0, 1]], before[[0, 1]])
+        self.assertFalse(np.allclose(after[[2, 3]], before[[2, 3]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import importlib.util
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.batch import Batch, VariantRender, check_params, declared_params, load_variants
+
+
+class BatchTest(unittest.TestCase):
+    def test_throughput(self):
+        variants = [VariantRender(index, {}, Path(f"{index}.mp4"), 1.0, 30) for index in range(3)]
+        batch = Batch("TPGScene", variants, wall_time=1.5)
+        self.assertEqual(batch.variants_per_hour, 7200)
+        self.assertEqual(batch.frames_per_second, 60)
+        self.assertEqual(Batch("TPGScene").variants_per_hour, 0.0)
+
+    def test_load_variants(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "variants.json"
+            path.write_text(json.dumps([{"max_bar_height": 2}]), encoding="utf-8")
+            self.assertEqual(load_variants(path), [{"max_bar_height": 2}])
+            path.write_text(json.dumps({"max_bar_height": 2}), encoding="utf-8")
+            with self.assertRaises(ValueError):
+                load_variants(path)
+
+    def test_declared_params(self):
+        class ManimScene:
+            camera_class = None
+
+            def construct(self):
+                pass
+        ManimScene.__module__ = "manim.scene.scene"
+
+        class BaseScene(ManimScene):
+            team = None
+
+        class VariantScene(BaseScene):
+            max_bar_height = 1.5
+            _private = 0
+
+            @property
+            def height(self):
+                return self.max_bar_height
+
+            def setup(self):
+                pass
+
+        self.assertEqual(declared_params(VariantScene), {"team", "max_bar_height"})
+
+    @unittest.skipUnless(importlib.util.find_spec("manim") is not None, "needs manim")
+    def test_unknown_parameters(self):
+        check_params("TPGScene", [{"max_bar_height": 2}])
+        with self.assertRaises(ValueError):
+            check_params("TPGScene", [{"max_bar_height": 2}, {"no_such_parameter": 1}])
+        with self.assertRaises(ValueError):
+            check_params("TPGScene", [{"construct": 1}])
@@ -0,0 +1,41 @@
+import unittest
+
+from utils.benchmark import compare, higher_is_better
+
+BASELINE = {"scenes": {"TPGScene": {"construct_s": 10.0, "peak_memory_mb": 200.0, "h_fps": 30.0}}}
+
+
+def results(**metrics):
+    return {"scenes": {"TPGScene": {**BASELINE["scenes"]["TPGScene"], **metrics}}}
+
+
+class CompareTest(unittest.TestCase):
+    def test_direction_of_each_metric(self):
+        self.assertTrue(higher_is_better("h_fps"))
+        self.assertFalse(higher_is_better("construct_s"))
+        self.assertFalse(higher_is_better("peak_memory_mb"))
+
+    def test_better_results_pass(self):
+        self.assertEqual(compare(results(construct_s=5.0, h_fps=60.0), BASELINE), [])
+
+    def test_worse_results_beyond_the_threshold_fail(self):
+        regressions = compare(results(construct_s=11.5, h_fps=20.0), BASELINE)
+        self.assertEqual({r.metric for r in regressions}, {"construct_s", "h_fps"})
+        slower = next(r for r in regressions if r.metric == "construct_s")
+        self.assertAlmostEqual(slower.change, 0.15)
+
+    def test_threshold(self):
+        # 9% slower and 9% fewer frames stay within the default 10%
+        self.assertEqual(compare(results(construct_s=10.9, h_fps=27.3), BASELINE), [])
+        regressions = compare(results(construct_s=10.9, h_fps=27.3), BASELINE, thresholds={"h_fps": 0.05})
+        self.assertEqual([r.metric for r in regressions], ["h_fps"])
+        self.assertEqual(compare(results(construct_s=11.5), BASELINE, max_regression=0.2), [])
+
+    def test_new_scenes_and_metrics_are_skipped(self):
+        current = results(l_fps=1.0)
+        current["scenes"]["NewScene"] = {"construct_s": 100.0}
+        self.assertEqual(compare(current, BASELINE), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils import cache
+from utils.cache import local_imports, scene_hash, source_closure
+from utils.render import ROOT, scene_file
+
+
+class SceneHashTest(unittest.TestCase):
+    def test_key_is_stable(self):
+        self.assertEqual(scene_hash("TPGScene", "h", 0), scene_hash("TPGScene", "high_quality", 0))
+
+    def test_every_parameter_changes_the_key(self):
+        base = scene_hash("TPGScene", "h", 0)
+        for other in (scene_hash("TPGScene", "l", 0), scene_hash("TPGScene", "h", 1),
+                      scene_hash("TPGScene", "h", 0, draft=True), scene_hash("ResultScene", "h", 0)):
+            self.assertNotEqual(base, other)
+
+    def test_render_switches_change_the_key(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop("TPG_TRACE", None)
+            base = scene_hash("HierarchyScene", "h", 0)
+            os.environ["TPG_TRACE"] = "run.trace"
+            traced = scene_hash("HierarchyScene", "h", 0)
+            os.environ["TPG_TRACE"] = "other.trace"
+            self.assertNotEqual(base, traced)
+            self.assertNotEqual(traced, scene_hash("HierarchyScene", "h", 0))
+
+    def test_trace_contents_change_the_key(self):
+        with tempfile.TemporaryDirectory() as directory, mock.patch.dict(os.environ):
+            trace = Path(directory) / "run.trace"
+            trace.write_bytes(b"first")
+            os.environ["TPG_TRACE"] = str(trace)
+            first = scene_hash("HierarchyScene", "h", 0)
+            trace.write_bytes(b"second")
+            self.assertNotEqual(first, scene_hash("HierarchyScene", "h", 0))
+
+    def test_recorded_label_sizes_change_draft_keys(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(cache, "LABEL_EXTENT_DIR", Path(directory)):
+            full, draft = cache.draft_config(False), cache.draft_config(True)
+            (Path(directory) / "label.json").write_text("[1.5, 0.4]", encoding="utf-8")
+            self.assertEqual(cache.draft_config(False), full)
+            self.assertNotEqual(cache.draft_config(True), draft)
+
+    def test_layer_switch_changes_the_key(self):
+        with mock.patch.dict(os.environ):
+            os.environ["TPG_LAYERS"] = "1"
+            layered = scene_hash("ResultScene", "h", 0)
+            os.environ["TPG_LAYERS"] = "0"
+            self.assertNotEqual(layered, scene_hash("ResultScene", "h", 0))
+
+    def test_sources_include_imported_helpers(self):
+        closure = {path.relative_to(ROOT).as_posix() for path in source_closure(scene_file("HierarchyScene"))}
+        self.assertIn("scenes/hierarchy.py", closure)
+        self.assertIn("utils/graph.py", closure)
+        # Imported by utils/graph.py rather than by the scene itself
+        self.assertIn("utils/layout.py", closure)
+
+    def test_third_party_imports_are_ignored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "scene.py"
+            path.write_text("import numpy as np\nfrom manim import *\nfrom utils import layout\n")
+            self.assertEqual(local_imports(path), {ROOT / "utils" / "__init__.py", ROOT / "utils" / "layout.py"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from utils import evolution
+from utils.evolution import MAX_STEPS, Genealogy, evolve, run_key
+
+HAS_MANIM = importlib.util.find_spec("manim") is not None
+
+
+class EvolveTest(unittest.TestCase):
+    def test_run_is_reproducible_and_well_formed(self):
+        log = evolve(teams=20, generations=3, episodes=1, seed=3, cache=False)
+        again = evolve(teams=20, generations=3, episodes=1, seed=3, cache=False)
+        np.testing.assert_array_equal(log.fitness, again.fitness)
+        self.assertEqual(log.fitness.shape, (4, 20))
+        # Half the teams survive, the others get two parents among the survivors
+        np.testing.assert_array_equal(log.survived.sum(axis=1), [10, 10, 10])
+        replaced = ~log.survived
+        self.assertTrue((log.parents[replaced] >= 0).all())
+        self.assertTrue((log.parents[log.survived] == -1).all())
+        for g in range(log.generations):
+            self.assertTrue(log.survived[g][log.parents[g][replaced[g]]].all())
+
+    def test_code_changes_invalidate_cached_runs(self):
+        before = run_key(teams=20, seed=3)
+        self.assertEqual(before, run_key(teams=20, seed=3))
+        with mock.patch.object(evolution, "code_hash", lambda path: "edited"):
+            self.assertNotEqual(before, run_key(teams=20, seed=3))
+
+    def test_save_and_load_round_trip(self):
+        log = evolve(teams=8, generations=1, episodes=1, cache=False)
+        with tempfile.TemporaryDirectory() as directory:
+            path = log.save(Path(directory) / "run.npz")
+            self.assertEqual([p.name for p in Path(directory).iterdir()], ["run.npz"])
+            loaded = Genealogy.load(path)
+        for name in Genealogy.__dataclass_fields__:
+            np.testing.assert_array_equal(getattr(loaded, name), getattr(log, name))
+
+
+@unittest.skipUnless(HAS_MANIM, "needs manim")
+class FitnessColorsTest(unittest.TestCase):
+    def test_colors_run_through_the_stops(self):
+        from utils.population import fitness_colors
+
+        stops = ([1, 0, 0], [0, 0, 1])
+        colors = fitness_colors([0, MAX_STEPS / 2, MAX_STEPS, 2 * MAX_STEPS], stops=["#ff0000", "#0000ff"])
+        np.testing.assert_allclose(colors, [stops[0], [0.5, 0, 0.5], stops[1], stops[1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
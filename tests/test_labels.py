@@ -0,0 +1,38 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+@unittest.skipUnless(importlib.util.find_spec("manim") is not None, "needs manim")
+class ExtentTest(unittest.TestCase):
+    def setUp(self):
+        from utils import labels
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        for patch in (mock.patch.object(labels, "LABEL_EXTENT_DIR", Path(directory.name)),
+                      mock.patch.object(labels, "_extents", {})):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.labels = labels
+
+    def test_workers_keep_each_others_extents(self):
+        labels = self.labels
+        labels._record_extent("a", 1.0, 2.0)
+        # Another worker with its own memory records a different label
+        labels._extents.clear()
+        labels._record_extent("b", 3.0, 4.0)
+        labels._extents.clear()
+        self.assertEqual(labels._load_extent("a"), [1.0, 2.0])
+        self.assertEqual(labels._load_extent("b"), [3.0, 4.0])
+        self.assertIsNone(labels._load_extent("c"))
+        self.assertEqual(sorted(p.suffix for p in labels.LABEL_EXTENT_DIR.iterdir()), [".json", ".json"])
+
+    def test_draft_box_takes_the_recorded_size(self):
+        labels = self.labels
+        labels._record_extent(labels._extent_key("Team A", "", 24.0, labels.NORMAL), 1.5, 0.4)
+        box = labels.text_box("Team A", font_size=24)
+        self.assertAlmostEqual(box.width, 1.5)
+        self.assertAlmostEqual(box.height, 0.4)
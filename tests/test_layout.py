@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from utils import layout
+from utils.layout import _peel, assign_layers, layered_layout
+
+
+def peel_reference(num_nodes, edges):
+    """_peel written out node by node, rescanning for every forced node."""
+    pending = np.bincount(edges[:, 1], minlength=num_nodes)
+    layers = np.full(num_nodes, -1)
+    frontier = np.flatnonzero(pending == 0)
+    depth = 0
+    while (layers < 0).any():
+        if len(frontier) == 0:
+            unplaced = np.flatnonzero(layers < 0)
+            frontier = unplaced[[np.argmin(pending[unplaced])]]
+        layers[frontier] = depth
+        for node in frontier:
+            for target in edges[edges[:, 0] == node, 1]:
+                pending[target] -= 1
+        frontier = np.array([n for n in range(num_nodes) if layers[n] < 0 and pending[n] == 0], dtype=int)
+        depth += 1
+    return layers
+
+
+class LayeredLayoutTest(unittest.TestCase):
+    def test_edges_point_down_one_or_more_layers(self):
+        edges = np.array([(0, 1), (0, 2), (1, 3), (2, 3), (0, 3)])
+        layers, flipped = assign_layers(4, edges)
+        np.testing.assert_array_equal(layers, [0, 1, 1, 2])
+        self.assertFalse(flipped.any())
+
+    def test_cycles_are_broken_by_flipping_edges(self):
+        edges = np.array([(0, 1), (1, 2), (2, 0)])
+        layers, flipped = assign_layers(3, edges)
+        oriented = np.where(flipped[:, None], edges[:, ::-1], edges)
+        self.assertTrue(flipped.any())
+        self.assertTrue((layers[oriented[:, 0]] < layers[oriented[:, 1]]).all())
+
+    def test_forced_nodes_follow_the_fewest_pending_inputs(self):
+        rng = np.random.default_rng(3)
+        edges = rng.integers(0, 60, (150, 2))
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        np.testing.assert_array_equal(_peel(60, edges), peel_reference(60, edges))
+
+    def test_nodes_of_a_layer_do_not_overlap(self):
+        edges = [(0, 1), (0, 2), (0, 3), (1, 4), (2, 4), (3, 5)]
+        result = layered_layout(6, edges, node_spacing=1.5, cache=False)
+        for layer in np.unique(result.layers):
+            x = np.sort(result.positions[result.layers == layer, 0])
+            self.assertTrue((np.diff(x) >= 1.5 - 1e-9).all())
+
+    def test_cached_layout_matches_fresh_one(self):
+        edges = [(0, 1), (1, 2), (0, 2)]
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(layout, "LAYOUT_CACHE_DIR", Path(directory)):
+            fresh = layered_layout(3, edges)
+            self.assertEqual([p.suffix for p in Path(directory).iterdir()], [".npz"])
+            cached = layered_layout(3, edges)
+        np.testing.assert_array_equal(fresh.positions, cached.positions)
+        np.testing.assert_array_equal(fresh.flipped, cached.flipped)
+
+    def test_code_changes_invalidate_cached_layouts(self):
+        before = layout.topology_key(3, np.array([(0, 1)]))
+        with mock.patch.object(layout, "code_hash", lambda path: "edited"):
+            self.assertNotEqual(before, layout.topology_key(3, np.array([(0, 1)])))
+
+
+if __name__ == "__main__":
+    unittest.main()
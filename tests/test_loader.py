@@ -0,0 +1,75 @@
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from utils.loader import load_agent_graph
+
+RECORDS = [
+    {"type": "team", "id": "t1"},
+    {"type": "program", "id": "p1", "team": "t1", "target": "t2"},
+    {"type": "program", "id": "p2", "team": "t1", "action": 0},
+    {"type": "team", "id": "t2", "programs": [{"id": "p3", "action": 1}]},
+    {"type": "action", "id": 0, "name": "push left"},
+    {"type": "action", "id": 1, "name": "push right"},
+]
+
+
+class LoadAgentGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, text):
+        path = Path(self.directory.name) / name
+        if name.endswith(".gz"):
+            with gzip.open(path, "wt", encoding="utf-8") as fp:
+                fp.write(text)
+        else:
+            path.write_text(text, encoding="utf-8")
+        return path
+
+    def check(self, graph):
+        self.assertEqual(graph.team_ids, ["t1", "t2"])
+        np.testing.assert_array_equal(graph.team_edges, [[0, 1]])
+        # Actions are numbered in the order they first appear, which depends on the layout
+        chosen = {(graph.team_ids[team], graph.action_names[action]) for team, action in graph.action_edges}
+        self.assertEqual(chosen, {("t1", "push left"), ("t2", "push right")})
+
+    def test_every_layout_gives_the_same_graph(self):
+        by_kind = {"teams": [], "programs": [], "actions": []}
+        for record in RECORDS:
+            record = dict(record)
+            by_kind[record.pop("type") + "s"].append(record)
+        exports = {
+            "agent.ndjson": "\n".join(json.dumps(r) for r in RECORDS),
+            "agent.json": json.dumps(RECORDS),
+            "agent.json.gz": json.dumps(RECORDS),
+            "agent_object.json": json.dumps({"version": 2, **by_kind}),
+        }
+        for name, text in exports.items():
+            with self.subTest(name):
+                self.check(load_agent_graph(self.write(name, text), chunk_size=7))
+
+    def test_visible_subgraph_is_breadth_first_and_capped(self):
+        records = [{"type": "program", "team": f"t{a}", "target": f"t{b}"}
+                   for a, b in [(0, 1), (0, 2), (1, 3), (2, 4), (3, 5)]]
+        graph = load_agent_graph(self.write("chain.ndjson", "\n".join(json.dumps(r) for r in records)))
+        teams, edges = graph.visible_subgraph(max_teams=4)
+        self.assertEqual([graph.team_ids[t] for t in teams], ["t0", "t1", "t2", "t3"])
+        np.testing.assert_array_equal(edges, [[0, 1], [0, 2], [1, 3]])
+
+
+    def test_cyclic_export_starts_at_the_busiest_team(self):
+        records = [{"type": "program", "team": f"t{a}", "target": f"t{b}"}
+                   for a, b in [(0, 1), (1, 2), (1, 0), (2, 0)]]
+        graph = load_agent_graph(self.write("cycle.ndjson", "\n".join(json.dumps(r) for r in records)))
+        teams, edges = graph.visible_subgraph()
+        self.assertEqual([graph.team_ids[t] for t in teams], ["t1", "t2", "t0"])
+        self.assertEqual(len(edges), 4)
+
+if __name__ == "__main__":
+    unittest.main()
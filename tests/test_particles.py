@@ -0,0 +1,31 @@
+import importlib.util
+import unittest
+
+import numpy as np
+
+HAS_MANIM = importlib.util.find_spec("manim") is not None
+
+
+@unittest.skipUnless(HAS_MANIM, "needs manim")
+class ParticleSystemTest(unittest.TestCase):
+    def setUp(self):
+        from utils.particles import FlowPaths, ParticleSystem
+
+        paths = [np.array([[0, 0, 0], [1, 0, 0]]), np.array([[0, 1, 0], [0, 3, 0]])]
+        self.flow = FlowPaths(paths)
+        self.particles = ParticleSystem(paths, count=200, speed=0.6, rng=np.random.default_rng(0))
+
+    def test_positions_follow_arc_length(self):
+        points = self.flow.positions(np.array([0, 1]), np.array([0.5, 0.25]))
+        np.testing.assert_allclose(points, [[0.5, 0, 0], [0, 1.5, 0]])
+
+    def test_one_long_step_keeps_looping_particles_on_their_paths(self):
+        # A skipped wait(3) advances updaters in a single step
+        self.particles.advance(3)
+        progress = self.particles.progress
+        self.assertTrue(((progress >= 0) & (progress < 1) | (progress < 0)).all())
+        self.assertGreater(len(self.particles.points), 150)
+
+
+if __name__ == "__main__":
+    unittest.main()
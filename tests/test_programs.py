@@ -0,0 +1,60 @@
+import math
+import unittest
+
+import numpy as np
+
+from utils.programs import OPERATIONS, REGISTERS, Programs, execute, winners
+
+
+def run_one(programs, index, state):
+    """Scalar reference interpreter for program ``index`` on one state."""
+    memory = [0.0] * REGISTERS
+    for position in range(programs.operations.shape[1]):
+        operation = OPERATIONS[programs.operations[index, position]]
+        target, source = programs.targets[index, position], programs.sources[index, position]
+        value = memory[target]
+        operand = state[source % len(state)] if programs.from_input[index, position] else memory[source % REGISTERS]
+        if operation == "add":
+            value += operand
+        elif operation == "sub":
+            value -= operand
+        elif operation == "mul":
+            value *= operand
+        elif operation == "div" and operand != 0:
+            value /= operand
+        elif operation == "cos":
+            value = math.cos(operand)
+        elif operation == "log" and operand != 0:
+            value = math.log(abs(operand))
+        elif operation == "negate" and value < operand:
+            value = -value
+        memory[target] = float(np.nan_to_num(value, posinf=1e12, neginf=-1e12))
+    return memory[0]
+
+
+class ExecuteTest(unittest.TestCase):
+    def test_compiled_programs(self):
+        programs = Programs.compile([
+            [("add", 0, "x0"), ("mul", 0, "x1")],
+            [("add", 1, "x1"), ("sub", 0, "r1"), ("negate", 0, "x0")],
+        ])
+        bids = execute(programs, [[2.0, 3.0], [-1.0, 0.5]])
+        np.testing.assert_allclose(bids, [[6.0, 3.0], [-0.5, -0.5]])
+        np.testing.assert_array_equal(winners(bids), [0, 0])
+
+    def test_matches_scalar_interpreter(self):
+        rng = np.random.default_rng(1)
+        programs = Programs.random(16, inputs=4, rng=rng)
+        states = rng.normal(0, 2, (30, 4))
+        bids = execute(programs, states)
+        self.assertEqual(bids.shape, (30, 16))
+        reference = [[run_one(programs, p, state) for p in range(16)] for state in states]
+        np.testing.assert_allclose(bids, reference, rtol=1e-9)
+
+    def test_bad_source_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Programs.compile([[("add", 0, "y1")]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from utils.replay import TraceWriter, read_trace, replay_rates
+
+# Teams 0 and 1 are nodes 0 and 1, actions 0 and 1 are nodes 2 and 3
+NODE_MAP = [0, 1, 2, 3]
+EDGES = [(0, 1), (1, 2), (0, 3)]
+
+
+class ReplayTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "run.trace"
+        # Five steps through both teams to action 0, then five from team 0 to action 1
+        with TraceWriter(self.path, depth=2, teams=2) as writer:
+            writer.append([[0, 1]] * 5, [0] * 5)
+            writer.append([[0]] * 5, [1] * 5)
+
+    def test_round_trip(self):
+        header, records = read_trace(self.path)
+        self.assertEqual((int(header["depth"]), int(header["teams"]), len(records)), (2, 2, 10))
+        np.testing.assert_array_equal(records["teams"][-1], [0, -1])
+        self.assertEqual(len(list(self.path.parent.iterdir())), 1)
+
+    def test_rates_per_bin(self):
+        for chunk_steps in (3, 1 << 16):
+            nodes, edges = replay_rates(self.path, 2, NODE_MAP, EDGES, chunk_steps=chunk_steps)
+            np.testing.assert_allclose(nodes, [[1, 1, 1, 0], [1, 0, 0, 1]])
+            np.testing.assert_allclose(edges, [[1, 1, 0], [0, 0, 1]])
+
+    def test_uneven_bins_and_hidden_nodes(self):
+        # Three bins of 4, 3 and 3 steps; team 1 is not shown
+        nodes, edges = replay_rates(self.path, 3, [0, -1, 1, 2], [(0, 1), (0, 2)])
+        np.testing.assert_allclose(nodes[:, 0], [1, 1, 1])
+        np.testing.assert_allclose(nodes[:, 2], [0, 2 / 3, 1])
+        np.testing.assert_allclose(edges[:, 1], [0, 2 / 3, 1])
+        # Action 0 is reached through the hidden team, so no shown edge leads to it
+        np.testing.assert_allclose(edges[:, 0], [0, 0, 0])
+
+    def test_more_bins_than_steps(self):
+        nodes, _ = replay_rates(self.path, 50, NODE_MAP, EDGES)
+        self.assertEqual(nodes.shape, (10, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
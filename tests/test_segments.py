@@ -0,0 +1,40 @@
+import importlib.util
+import unittest
+
+from utils.segments import play_seed, split_plays
+
+
+class SplitPlaysTest(unittest.TestCase):
+    def test_ranges_cover_every_play_in_order(self):
+        ranges = split_plays([1, 1, 1, 1, 1, 1], 3)
+        self.assertEqual(ranges, [(0, 2), (2, 4), (4, 6)])
+
+    def test_ranges_balance_duration(self):
+        # The long first play makes a segment of its own
+        self.assertEqual(split_plays([6, 1, 1, 1, 1, 1, 1], 2), [(0, 1), (1, 7)])
+
+    def test_every_segment_keeps_a_play(self):
+        ranges = split_plays([10, 0.1, 0.1], 3)
+        self.assertEqual(ranges, [(0, 1), (1, 2), (2, 3)])
+        self.assertEqual(split_plays([1, 1], 5), [(0, 1), (1, 2)])
+
+    def test_one_segment(self):
+        self.assertEqual(split_plays([1, 2, 3], 1), [(0, 3)])
+
+    def test_play_seed(self):
+        self.assertEqual(play_seed(3, 4), play_seed(3, 4))
+        self.assertNotEqual(play_seed(3, 4), play_seed(3, 5))
+
+
+@unittest.skipUnless(importlib.util.find_spec("manim") is not None, "needs manim")
+class DtUpdaterTest(unittest.TestCase):
+    def test_has_dt_updaters(self):
+        from manim import Dot, Scene
+        from utils.segments import has_dt_updaters
+
+        scene = Scene()
+        dot = Dot()
+        scene.add(dot)
+        self.assertFalse(has_dt_updaters(scene))
+        dot.add_updater(lambda mobject, dt: mobject.shift(dt))
+        self.assertTrue(has_dt_updaters(scene))
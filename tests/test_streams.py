@@ -0,0 +1,95 @@
+import functools
+import importlib.util
+import unittest
+from unittest import mock
+
+from utils import cache, streams
+from utils.streams import get_seed, set_seed, stream
+
+
+class StreamsTest(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(set_seed, get_seed())
+        set_seed(7)
+
+    def test_streams_are_independent(self):
+        expected = stream("test.b").random(3)
+        set_seed(7)
+        stream("test.a").random(100)
+        self.assertEqual(stream("test.b").random(3).tolist(), expected.tolist())
+        self.assertNotEqual(stream("test.a").random(3).tolist(), expected.tolist())
+
+    def test_set_seed_restarts_handed_out_generators(self):
+        generator = stream("test.restart")
+        first = generator.random(3).tolist()
+        set_seed(7)
+        self.assertEqual(generator.random(3).tolist(), first)
+        set_seed(8)
+        self.assertNotEqual(generator.random(3).tolist(), first)
+
+    def test_none_restarts_from_the_default_seed(self):
+        set_seed(None)
+        self.assertEqual(get_seed(), streams.DEFAULT_SEED)
+
+
+class DefaultSeedKeyTest(unittest.TestCase):
+    def test_unseeded_renders_key_on_the_default_seed(self):
+        with mock.patch.object(cache, "DEFAULT_SEED", 5):
+            self.assertEqual(cache.cache_path("TPGScene", "h", None), cache.cache_path("TPGScene", "h", 5))
+            unseeded = cache.cache_path("TPGScene", "h", None)
+        with mock.patch.object(cache, "DEFAULT_SEED", 6):
+            self.assertNotEqual(unseeded, cache.cache_path("TPGScene", "h", None))
+
+
+@unittest.skipUnless(importlib.util.find_spec("manim") is not None, "needs manim")
+class FeedTest(unittest.TestCase):
+    def digest(self, value):
+        import hashlib
+        from utils.seeded import _feed
+
+        digest = hashlib.blake2b(digest_size=16)
+        _feed(digest, value, {})
+        return digest.hexdigest()
+
+    def test_closures_defaults_and_partials(self):
+        def shift(by):
+            return lambda x: x + by
+
+        def scale(factor):
+            def scaled(x, factor=factor):
+                return x * factor
+            return scaled
+
+        def multiply(x, factor):
+            return x * factor
+
+        self.assertEqual(self.digest(shift(1)), self.digest(shift(1)))
+        self.assertNotEqual(self.digest(shift(1)), self.digest(shift(2)))
+        self.assertNotEqual(self.digest(scale(1)), self.digest(scale(2)))
+        self.assertNotEqual(self.digest(functools.partial(multiply, factor=2)),
+                            self.digest(functools.partial(multiply, factor=3)))
+
+    def test_called_names(self):
+        import math
+
+        import numpy as np
+
+        self.assertNotEqual(self.digest(lambda m: m.shift(1)), self.digest(lambda m: m.scale(1)))
+        self.assertNotEqual(self.digest(lambda t: np.sin(t)), self.digest(lambda t: np.cos(t)))
+        self.assertNotEqual(self.digest(np.sin), self.digest(np.cos))
+        self.assertNotEqual(self.digest(math.sin), self.digest(math.cos))
+
+    def test_bound_methods_hash_their_object(self):
+        class Counter:
+            def __init__(self, count):
+                self.count = count
+
+            def step(self):
+                return self.count + 1
+
+        self.assertEqual(self.digest(Counter(1).step), self.digest(Counter(1).step))
+        self.assertNotEqual(self.digest(Counter(1).step), self.digest(Counter(2).step))
+
+    def test_sets_by_content(self):
+        self.assertEqual(self.digest({"a", "b"}), self.digest({"b", "a"}))
+        self.assertNotEqual(self.digest({"a", "b"}), self.digest({"a", "c"}))
@@ -0,0 +1,19 @@
+"""NumPy helpers shared by the graph, layout and population modules."""
+import numpy as np
+
+
+def csr_gather(offsets, rows):
+    """Indices of all CSR entries belonging to ``rows``, in one vectorized step.
+
+    Entries of row ``r`` are ``offsets[r]:offsets[r + 1]``; the result
+    lists them row after row, in the order of ``rows``.
+    """
+    starts, counts = offsets[rows], offsets[rows + 1] - offsets[rows]
+    total = counts.sum()
+    return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+
+
+def line_curves(start, end):
+    """Straight segments as degenerate cubic curves, shaped (..., 4, 3)."""
+    thirds = np.linspace(0, 1, 4)[:, None]
+    return start[..., None, :] + thirds * (end - start)[..., None, :]
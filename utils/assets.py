@@ -0,0 +1,71 @@
+import hashlib
+import os
+
+from manim import *
+import numpy as np
+
+from utils.cache import CACHE_DIR
+
+# Geometry of labels and shape templates, shared on disk between processes.
+# Set TPG_ASSETS=1, or call set_assets(), to read and fill it; batch workers do.
+ASSET_DIR = CACHE_DIR / "assets"
+_enabled = os.environ.get("TPG_ASSETS", "") not in ("", "0")
+
+
+def assets_enabled():
+    return _enabled
+
+
+def set_assets(enabled=True):
+    global _enabled
+    _enabled = enabled
+
+
+def asset_path(kind, key):
+    return ASSET_DIR / kind / f"{hashlib.sha1(repr(key).encode()).hexdigest()[:20]}.npz"
+
+
+def save_geometry(path, mobject):
+    """Store the points and plain style of every family member that has points."""
+    members = mobject.family_members_with_points()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(f".{os.getpid()}.part")
+    with partial.open("wb") as fp:
+        np.savez(
+            fp,
+            points=np.concatenate([member.points for member in members]) if members else np.zeros((0, 3)),
+            counts=np.array([len(member.points) for member in members], dtype=int),
+            fill_opacity=np.array([member.get_fill_opacity() for member in members]),
+            stroke_width=np.array([member.get_stroke_width() for member in members]),
+            grouped=len(members) != 1 or members[0] is not mobject,
+        )
+    partial.replace(path)
+
+
+def load_geometry(path):
+    """Plain VMobjects with the stored points, grouped unless one mobject was stored."""
+    with np.load(path) as data:
+        pieces = np.split(data["points"], np.cumsum(data["counts"])[:-1]) if len(data["counts"]) else []
+        members = [
+            VMobject(fill_opacity=fill, stroke_width=stroke).set_points(points)
+            for points, fill, stroke in zip(pieces, data["fill_opacity"], data["stroke_width"])
+        ]
+        grouped = bool(data["grouped"])
+    return VGroup(*members) if grouped else members[0]
+
+
+def cached_geometry(kind, key, build):
+    """``build()``, or its geometry from the asset store once any process has built it.
+
+    Only points and plain style survive the store, which is all that
+    labels and shape templates need, since callers recolour their copies.
+    Returns the mobject and whether ``build`` ran.
+    """
+    if not _enabled:
+        return build(), True
+    path = asset_path(kind, key)
+    if path.exists():
+        return load_geometry(path), False
+    mobject = build()
+    save_geometry(path, mobject)
+    return mobject, True
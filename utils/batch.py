@@ -0,0 +1,127 @@
+"""Render many parameter variants of one scene in long-lived workers.
+
+A fresh ``manim`` run per variant pays for importing manim, importing
+the scene and typesetting every label before the first frame. Here a
+pool of workers is started once: each imports manim and the scene in its
+initializer and then renders variant after variant, with labels kept in
+memory across variants and geometry shared between workers through the
+on-disk asset store (``utils.assets``). Variant parameters set scene
+class attributes on the instance, e.g. ``TPGScene.team``.
+"""
+from dataclasses import dataclass, field
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils.render import OUTPUT_DIR, render_config, resolve_quality, scene_class
+
+BATCH_DIR = OUTPUT_DIR / "batch"
+
+
+@dataclass
+class VariantRender:
+    """One rendered variant and what it cost inside its worker."""
+    index: int
+    params: dict
+    movie: Path
+    wall_time: float
+    frames: int
+
+
+@dataclass
+class Batch:
+    """Every variant of a batch, in input order, and the batch wall time."""
+    scene: str
+    variants: list[VariantRender] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    @property
+    def variants_per_hour(self):
+        return 3600 * len(self.variants) / self.wall_time if self.wall_time else 0.0
+
+    @property
+    def frames_per_second(self):
+        return sum(v.frames for v in self.variants) / self.wall_time if self.wall_time else 0.0
+
+
+def load_variants(path):
+    """Parameter sets from a JSON file holding a list of objects."""
+    with open(path, encoding="utf-8") as fp:
+        variants = json.load(fp)
+    if not isinstance(variants, list) or not all(isinstance(v, dict) for v in variants):
+        raise ValueError(f"{path} must hold a list of parameter objects")
+    return variants
+
+
+def declared_params(cls):
+    """Plain class attributes of a scene and its project base classes.
+
+    Methods, properties and everything inherited from manim itself are
+    not parameters, even though a variant could set them.
+    """
+    params = set()
+    for base in cls.__mro__:
+        if base is object or base.__module__.split(".")[0] == "manim":
+            continue
+        for key, value in vars(base).items():
+            if not key.startswith("_") and not callable(value) and not isinstance(
+                    value, (property, classmethod, staticmethod)):
+                params.add(key)
+    return params
+
+
+def check_params(name, variants):
+    """Raise on parameters that the scene class does not declare."""
+    declared = declared_params(scene_class(name))
+    unknown = sorted({key for params in variants for key in params if key not in declared})
+    if unknown:
+        raise ValueError(f"{name} has no variant parameter(s) {unknown}")
+
+
+def _start_worker(name, draft):
+    """Pool initializer: pay for imports and the asset store once per worker."""
+    from utils.assets import set_assets
+    from utils.draft import set_draft
+
+    set_assets(True)
+    set_draft(draft)
+    scene_class(name)
+
+
+def render_variant(name, index, params, quality="h", seed=None):
+    """Render one variant of a scene in the current (warm) worker.
+
+    Every variant has its own media directory, so no two variants share
+    partial movies, and only the finished movie is copied to ``BATCH_DIR``.
+    """
+    start = time.perf_counter()
+    from manim import config, tempconfig
+
+    output = f"{name}_{index:04}"
+    with tempconfig(render_config(name, quality, BATCH_DIR / "media" / output, output_file=output)):
+        scene = scene_class(name)(random_seed=seed)
+        for key, value in params.items():
+            setattr(scene, key, value)
+        scene.render()
+        rendered = Path(scene.renderer.file_writer.movie_file_path)
+        frames = round(scene.renderer.time * config.frame_rate)
+    movie = BATCH_DIR / f"{output}{rendered.suffix}"
+    shutil.copyfile(rendered, movie)
+    return VariantRender(index, params, movie, time.perf_counter() - start, frames)
+
+
+def render_batch(name, variants, quality="l", workers=None, seed=None, draft=False):
+    """Render every parameter set in ``variants`` as its own movie of scene ``name``."""
+    start = time.perf_counter()
+    quality = resolve_quality(quality)
+    variants = list(variants)
+    check_params(name, variants)
+    workers = workers or min(len(variants), os.cpu_count() or 1) or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker, initargs=(name, draft)) as pool:
+        futures = [pool.submit(render_variant, name, index, params, quality, seed)
+                   for index, params in enumerate(variants)]
+        renders = [future.result() for future in futures]
+    return Batch(name, renders, time.perf_counter() - start)
@@ -0,0 +1,192 @@
+import json
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from importlib import metadata
+from multiprocessing import get_context
+from pathlib import Path
+
+from utils.render import OUTPUT_DIR, render_config, resolve_quality, resolve_scenes, scene_class
+
+BENCH_DIR = OUTPUT_DIR / "benchmarks"
+RESULTS_PATH = BENCH_DIR / "results.json"
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+
+# Qualities rendered for the frame rate measurements
+BENCH_QUALITIES = ("l", "h")
+# Allowed relative slowdown (or growth) before a metric counts as a regression
+MAX_REGRESSION = 0.10
+
+
+@dataclass
+class Regression:
+    """A metric that got worse than the baseline by more than its threshold."""
+    scene: str
+    metric: str
+    baseline: float
+    current: float
+    threshold: float
+
+    @property
+    def change(self):
+        return self.current / self.baseline - 1 if self.baseline else float("inf")
+
+
+def higher_is_better(metric):
+    return metric.endswith("_fps")
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+
+
+def instrumented(cls):
+    """Subclass of a scene that tracks its peak mobject count and played time."""
+
+    class Benchmarked(cls):
+        def setup(self):
+            super().setup()
+            self.bench_mobjects = self.bench_points = self.bench_plays = 0
+            self.bench_duration = 0.0
+
+        def play(self, *args, **kwargs):
+            super().play(*args, **kwargs)
+            family = self.get_mobject_family_members()
+            self.bench_mobjects = max(self.bench_mobjects, len(family))
+            self.bench_points = max(self.bench_points, sum(len(mob.points) for mob in family))
+            self.bench_plays += 1
+            self.bench_duration += self.duration
+
+    Benchmarked.__name__ = Benchmarked.__qualname__ = cls.__name__
+    return Benchmarked
+
+
+def measure_scene(name, quality=None, seed=0):
+    """One benchmark run of a scene, meant to run in a fresh process.
+
+    With ``quality`` None only ``construct`` runs, every animation skipped
+    and nothing written. Otherwise the scene is rendered to a scratch
+    movie with manim's partial-movie cache off, so every frame is drawn.
+    Import time is not included.
+    """
+    from manim import config, tempconfig
+
+    cls = instrumented(scene_class(name))
+    options = render_config(name, quality or "l", BENCH_DIR / "media",
+                            disable_caching=True, write_to_movie=quality is not None)
+    with tempconfig(options):
+        start = time.perf_counter()
+        scene = cls(random_seed=seed, skip_animations=quality is None)
+        scene.render()
+        wall_time = time.perf_counter() - start
+        frames = scene.bench_duration * config.frame_rate
+
+    return {
+        "wall_time": wall_time,
+        "frames": frames,
+        "peak_mb": peak_memory_mb(),
+        "mobjects": scene.bench_mobjects,
+        "points": scene.bench_points,
+        "plays": scene.bench_plays,
+    }
+
+
+def _best(runs):
+    """Fastest of repeated runs, with the largest memory peak seen."""
+    best = min(runs, key=lambda run: run["wall_time"])
+    return {**best, "peak_mb": max(run["peak_mb"] for run in runs)}
+
+
+def benchmark(scenes=None, qualities=BENCH_QUALITIES, repeat=1, seed=0, render=True):
+    """Measure every scene and return a JSON-ready results dict.
+
+    Runs are sequential, each in its own spawned process, so timings do
+    not compete for cores and memory peaks belong to a single run.
+    """
+    names = resolve_scenes(scenes)
+    qualities = list(qualities) if render else []
+    for quality in qualities:
+        resolve_quality(quality)  # Fail before spending minutes on the other runs
+    jobs = [(name, None) for name in names] + [(name, q) for name in names for q in qualities]
+
+    runs = {}
+    context = get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as pool:
+        for job in jobs:
+            futures = [pool.submit(measure_scene, *job, seed) for _ in range(repeat)]
+            runs[job] = _best([future.result() for future in futures])
+
+    results = {}
+    for name in names:
+        construct = runs[name, None]
+        metrics = {
+            "construct_s": construct["wall_time"],
+            "construct_peak_mb": construct["peak_mb"],
+            "mobjects": construct["mobjects"],
+            "points": construct["points"],
+            "plays": construct["plays"],
+        }
+        for quality in qualities:
+            run = runs[name, quality]
+            metrics[f"{quality}_render_s"] = run["wall_time"]
+            metrics[f"{quality}_fps"] = run["frames"] / run["wall_time"]
+            metrics[f"{quality}_peak_mb"] = run["peak_mb"]
+        results[name] = metrics
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "manim": metadata.version("manim"),
+        },
+        "repeat": repeat,
+        "seed": seed,
+        "scenes": results,
+    }
+
+
+def save_results(results, path=RESULTS_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def load_results(path=BASELINE_PATH):
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare(results, baseline, max_regression=MAX_REGRESSION, thresholds=None):
+    """Metrics that got worse than the baseline by more than their threshold.
+
+    ``thresholds`` maps metric names to relative limits that override
+    ``max_regression``. Scenes and metrics missing on either side are
+    skipped, so adding a scene or a quality never fails the comparison.
+    """
+    thresholds = thresholds or {}
+    regressions = []
+    for scene, metrics in results["scenes"].items():
+        old_metrics = baseline["scenes"].get(scene, {})
+        for metric, current in metrics.items():
+            old = old_metrics.get(metric)
+            if old is None:
+                continue
+            threshold = thresholds.get(metric, max_regression)
+            if higher_is_better(metric):
+                worse = current < old * (1 - threshold)
+            else:
+                worse = current > old * (1 + threshold)
+            if worse:
+                regressions.append(Regression(scene, metric, old, current, threshold))
+    return regressions
@@ -0,0 +1,159 @@
+import ast
+import hashlib
+import json
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+
+from utils.render import OUTPUT_DIR, ROOT, SceneRender, render_scene, resolve_quality, scene_file
+from utils.streams import DEFAULT_SEED
+
+CACHE_DIR = OUTPUT_DIR / "cache"
+
+# Label sizes recorded by full renders (utils.labels), which draft label boxes use
+LABEL_EXTENT_DIR = CACHE_DIR / "label_extents"
+
+# Top-level packages whose modules count as a scene's helper imports
+LOCAL_PACKAGES = ("assets", "scenes", "utils")
+
+# Environment switches read by scenes that change what they render
+RENDER_ENV = ("TPG_TRACE", "TPG_LAYERS")
+
+# Switches naming an input file, keyed on the file's contents as well as its path
+RENDER_FILES = ("TPG_TRACE",)
+
+
+def module_path(module):
+    """Path of a project module, or None if it lives outside the repo."""
+    if module.split(".")[0] not in LOCAL_PACKAGES:
+        return None
+    base = ROOT.joinpath(*module.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def local_imports(path):
+    """Project modules imported by a source file, resolved to their paths."""
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    paths = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            # "from utils import graph" may name a submodule rather than an attribute
+            modules = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+        else:
+            continue
+        for module in modules:
+            found = module_path(module)
+            if found is not None:
+                paths.add(found)
+    return paths
+
+
+def source_closure(path):
+    """A source file plus every project module it imports, transitively."""
+    seen = set()
+    pending = [Path(path)]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        pending.extend(local_imports(current) - seen)
+    return sorted(seen)
+
+
+@lru_cache(maxsize=None)
+def code_hash(path):
+    """Hash of a module's source and every project module it imports.
+
+    Keys on-disk caches of computed data, so that editing the code that
+    produced them invalidates them.
+    """
+    digest = hashlib.sha256()
+    for source in source_closure(Path(path).resolve()):
+        digest.update(source.relative_to(ROOT).as_posix().encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def file_hash(path):
+    """Content hash of a file, read in chunks so large traces stay out of memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def scene_hash(name, quality="h", seed=None, **config):
+    """Content hash of everything that determines a scene's finished movie."""
+    digest = hashlib.sha256()
+    for path in source_closure(scene_file(name)):
+        digest.update(path.relative_to(ROOT).as_posix().encode())
+        digest.update(path.read_bytes())
+    params = {"scene": name, "quality": resolve_quality(quality), "seed": seed, "config": config}
+    # Only switches that are set, so the keys of default renders stay the same
+    env = {key: os.environ[key] for key in RENDER_ENV if key in os.environ}
+    for key in RENDER_FILES:
+        if key in env and Path(env[key]).is_file():
+            env[key] = [env[key], file_hash(env[key])]
+    if env:
+        params["env"] = env
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def cache_path(name, quality="h", seed=None, **config):
+    # Scenes render without a seed as DEFAULT_SEED, which TPG_SEED sets
+    seed = DEFAULT_SEED if seed is None else seed
+    return CACHE_DIR / f"{name}_{scene_hash(name, quality, seed, **config)}.mp4"
+
+
+def label_extents_hash():
+    """Content hash of the recorded label sizes that draft label boxes take."""
+    digest = hashlib.sha256()
+    for path in sorted(LABEL_EXTENT_DIR.glob("*.json")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def draft_config(draft):
+    """Extra cache key for draft renders, leaving full-render keys unchanged.
+
+    Drafts size their label boxes from the extents of earlier full renders,
+    so a draft rendered with estimated boxes is redone once real sizes exist.
+    """
+    return {"draft": True, "label_extents": label_extents_hash()} if draft else {}
+
+
+def lookup(name, quality="h", seed=None, draft=False):
+    """Return a finished render from the store, or None on a miss."""
+    path = cache_path(name, quality, seed, **draft_config(draft))
+    if path.exists():
+        return SceneRender(name, path, 0.0, cached=True)
+    return None
+
+
+def store(result, path):
+    """Copy a freshly rendered movie into the store and point the result at it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Copy next to the target first so readers never see a partial file
+    partial = path.with_suffix(".part")
+    shutil.copyfile(result.movie, partial)
+    partial.replace(path)
+    result.movie = path
+    return result
+
+
+def cached_render_scene(name, quality="h", media_dir=None, seed=None, trace=False, draft=False):
+    """Like render_scene, but served from the store when nothing changed."""
+    path = cache_path(name, quality, seed, **draft_config(draft))
+    if path.exists() and not trace:
+        return SceneRender(name, path, 0.0, cached=True)
+    return store(render_scene(name, quality, media_dir, seed, trace, draft), path)
@@ -0,0 +1,79 @@
+from manim import *
+import numpy as np
+
+from utils.nodes import PieNode
+from utils.population import CIRCLE_CURVES, PopulationGrid
+
+
+class TPGCamera(Camera):
+    """Cairo camera that also knows how to draw the project's compact mobjects."""
+
+    def display_vectorized(self, vmobject, ctx):
+        if isinstance(vmobject, PieNode):
+            return self.display_pie_node(vmobject, ctx)
+        if isinstance(vmobject, PopulationGrid):
+            return self.display_population(vmobject, ctx)
+        return super().display_vectorized(vmobject, ctx)
+
+    def display_pie_node(self, node, ctx):
+        """Fill and stroke each wedge subpath in its own colour."""
+        points = self.transform_points_pre_display(node, node.points)
+        if len(points) != len(node.points):
+            return self
+        fill_opacity = node.get_fill_opacity()
+        stroke_opacity = node.get_stroke_opacity()
+        stroke_width = node.get_stroke_width() * self.cairo_line_width_multiple
+
+        wedges = points.reshape(node.get_wedges().shape)
+        for curves, rgb in zip(wedges, node.wedge_colors):
+            ctx.new_path()
+            ctx.move_to(*curves[0, 0, :2])
+            for _p0, p1, p2, p3 in curves:
+                ctx.curve_to(*p1[:2], *p2[:2], *p3[:2])
+            ctx.close_path()
+            # Cairo surfaces store channels in reverse order
+            ctx.set_source_rgba(*rgb[::-1], fill_opacity)
+            ctx.fill_preserve()
+            if stroke_width > 0:
+                ctx.set_source_rgba(*rgb[::-1], stroke_opacity)
+                ctx.set_line_width(stroke_width)
+                ctx.stroke_preserve()
+        return self
+
+    def display_population(self, grid, ctx):
+        """Stroke team circles and fill arrow tips, one Cairo path per colour."""
+        points = self.transform_points_pre_display(grid, grid.points)
+        if len(points) != len(grid.points):
+            return self
+        state = grid.state
+        teams = points.reshape(grid.get_teams().shape)
+        circles = teams[:, :CIRCLE_CURVES]
+        arrows = teams[:, CIRCLE_CURVES:].reshape(len(state), state.angles.shape[1], -1, 4, 3)
+        stroke_opacity = grid.get_stroke_opacity() * state.opacity
+        ctx.set_line_width(grid.get_stroke_width() * self.cairo_line_width_multiple)
+
+        def draw(paths, rgb, alpha, fill):
+            ctx.new_path()
+            for curves in paths:
+                ctx.move_to(*curves[0, 0, :2])
+                for _p0, p1, p2, p3 in curves:
+                    ctx.curve_to(*p1[:2], *p2[:2], *p3[:2])
+            # Cairo surfaces store channels in reverse order
+            ctx.set_source_rgba(*rgb[::-1], alpha)
+            if fill:
+                ctx.fill_preserve()
+            ctx.stroke()
+
+        # Teams sharing a colour and opacity are drawn together
+        circle_keys = np.round(np.column_stack([state.colors, stroke_opacity]) * 255)
+        keys, group = np.unique(circle_keys, axis=0, return_inverse=True)
+        for index, key in enumerate(keys):
+            if key[3] > 0:
+                draw(circles[group == index], key[:3] / 255, key[3] / 255, fill=False)
+
+        arrow_opacity = np.round(stroke_opacity[:, None] * state.arrows * 255)
+        for alpha in np.unique(arrow_opacity[arrow_opacity > 0]):
+            shown = arrows[arrow_opacity == alpha]
+            draw(shown[:, :1], grid.arrow_rgb, alpha / 255, fill=False)
+            draw(shown[:, 1:], grid.arrow_rgb, alpha / 255 * grid.get_fill_opacity(), fill=True)
+        return self
@@ -0,0 +1,158 @@
+"""Cart-pole physics, integrated ahead of time into NumPy trajectories.
+
+Uses the classic cart-pole equations (Barto, Sutton & Anderson 1983, as
+in Gym's CartPole) with explicit Euler steps. ``theta`` is the pole angle
+from upright, positive when leaning right, and the pole falls flat once
+it passes horizontal. Many rollouts are integrated at once, so policies
+receive and return arrays.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+GRAVITY = 9.8
+CART_MASS = 1.0
+POLE_MASS = 0.1
+POLE_HALF_LENGTH = 0.5
+FORCE = 10.0   # Push of one action, in newtons
+DT = 0.02      # Integration step, in seconds
+
+# Scene units per metre of cart travel, matching the 3-unit rods drawn for the 1 m pole
+CART_SCALE = 3
+
+# Columns of a state vector
+X, X_DOT, THETA, THETA_DOT = range(4)
+
+
+@dataclass
+class Trajectory:
+    """States of one or more rollouts sampled every ``dt`` seconds."""
+    states: np.ndarray   # (..., steps + 1, 4) x, x_dot, theta, theta_dot
+    actions: np.ndarray  # (..., steps) applied force in units of FORCE
+    dt: float = DT
+
+    @property
+    def x(self):
+        return self.states[..., X]
+
+    @property
+    def theta(self):
+        return self.states[..., THETA]
+
+    @property
+    def duration(self):
+        return (self.states.shape[-2] - 1) * self.dt
+
+    @property
+    def final_state(self):
+        return self.states[..., -1, :]
+
+    def __getitem__(self, rollout):
+        """A single rollout out of a batch."""
+        return Trajectory(self.states[rollout], self.actions[rollout], self.dt)
+
+    def sample(self, times):
+        """Linearly interpolated ``(x, theta)`` at the given times in seconds."""
+        grid = np.arange(self.states.shape[-2]) * self.dt
+        times = np.clip(times, 0, grid[-1])
+        return np.interp(times, grid, self.x), np.interp(times, grid, self.theta)
+
+
+def step(states, force, dt=DT):
+    """Advance every state by one Euler step under ``force`` newtons."""
+    x, x_dot, theta, theta_dot = np.moveaxis(states, -1, 0)
+    cos, sin = np.cos(theta), np.sin(theta)
+    total_mass = CART_MASS + POLE_MASS
+    polemass_length = POLE_MASS * POLE_HALF_LENGTH
+
+    temp = (force + polemass_length * theta_dot ** 2 * sin) / total_mass
+    theta_acc = (GRAVITY * sin - cos * temp) / (
+        POLE_HALF_LENGTH * (4 / 3 - POLE_MASS * cos ** 2 / total_mass)
+    )
+    x_acc = temp - polemass_length * theta_acc * cos / total_mass
+    return np.stack([
+        x + dt * x_dot,
+        x_dot + dt * x_acc,
+        theta + dt * theta_dot,
+        theta_dot + dt * theta_acc,
+    ], axis=-1)
+
+
+def simulate(initial, duration, policy=None, actions=None, dt=DT, track=2.4):
+    """Integrate rollouts from ``initial`` states for ``duration`` seconds.
+
+    Forces come from ``policy(states, time) -> actions`` or from a recorded
+    ``actions`` sequence, which is padded with 0 (no push). An action is a
+    push in units of FORCE, usually -1, 0 or 1. A fallen pole lies flat and
+    stops its cart, and carts stop at ``track`` metres from the center.
+    """
+    states = np.array(initial, dtype=float)
+    steps = int(round(duration / dt))
+    history = np.empty(states.shape[:-1] + (steps + 1, 4))
+    applied = np.zeros(states.shape[:-1] + (steps,))
+    recorded = np.zeros(states.shape[:-1] + (steps,))
+    if actions is not None:
+        actions = np.asarray(actions, dtype=float)[..., :steps]
+        recorded[..., :actions.shape[-1]] = actions
+
+    history[..., 0, :] = states
+    fallen = np.abs(states[..., THETA]) >= np.pi / 2
+    for i in range(steps):
+        action = policy(states, i * dt) if policy is not None else recorded[..., i]
+        action = np.where(fallen, 0.0, action)
+        moved = step(states, FORCE * action, dt)
+
+        # Poles that hit the ground, and carts that hit the end of the track, stop there
+        landed = np.abs(moved[..., THETA]) >= np.pi / 2
+        moved[..., THETA] = np.clip(moved[..., THETA], -np.pi / 2, np.pi / 2)
+        moved[..., [X_DOT, THETA_DOT]] *= ~landed[..., None]
+        moved[..., X_DOT] *= np.abs(moved[..., X]) < track
+        moved[..., X] = np.clip(moved[..., X], -track, track)
+        states = np.where(fallen[..., None], states, moved)
+        fallen = fallen | landed
+
+        history[..., i + 1, :] = states
+        applied[..., i] = action
+    return Trajectory(history, applied, dt)
+
+
+def transition(start, end, duration, dt=DT):
+    """Smoothstep from one state to another, e.g. to reset a fallen pole."""
+    t = np.linspace(0, 1, int(round(duration / dt)) + 1)[:, None]
+    smooth = t * t * (3 - 2 * t)
+    start, end = np.asarray(start, dtype=float), np.asarray(end, dtype=float)
+    states = start + (end - start) * smooth
+    return Trajectory(states, np.zeros(len(states) - 1), dt)
+
+
+def concatenate(*trajectories):
+    """Play single rollouts one after the other, sharing the joint states."""
+    dt = trajectories[0].dt
+    states = [trajectories[0].states] + [t.states[1:] for t in trajectories[1:]]
+    return Trajectory(
+        np.concatenate(states),
+        np.concatenate([t.actions for t in trajectories]),
+        dt,
+    )
+
+
+def balancing_policy(gains=(0.1, 0.5, 10.0, 2.0)):
+    """Bang-bang state feedback that keeps the pole up and the cart near 0."""
+    gains = np.asarray(gains)
+
+    def policy(states, time):
+        return np.sign(states @ gains)
+    return policy
+
+
+def random_policy(seed=0, hold=0.2):
+    """Random pushes held for ``hold`` seconds, a stand-in for an untrained agent."""
+    rng = np.random.default_rng(seed)
+    choices = {}
+
+    def policy(states, time):
+        block = int(time / hold + 1e-9)
+        if block not in choices:
+            choices[block] = rng.choice([-1.0, 1.0], size=states.shape[:-1])
+        return choices[block]
+    return policy
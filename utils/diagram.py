@@ -0,0 +1,191 @@
+"""Team diagrams described as data and compiled into mobjects.
+
+A ``TeamSpec`` lists a team's circle, its actions (shape, colour, side
+of the circle, label and optional bid) and, optionally, the programs
+that bid for them. ``compile_teams`` lays out every team of a batch in
+one NumPy pass, then copies each shape from a template built once per
+shape and size, so many variants cost little more than the copies.
+Specs also load from JSON, e.g.::
+
+    {"label": "Decision Team", "actions": [
+        {"shape": "square", "color": "RED", "side": "right", "label": "Action A", "bid": 0.8}]}
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+import json
+
+from manim import *
+import numpy as np
+
+from utils.assets import cached_geometry
+from utils.draft import arrow
+from utils.labels import label
+from utils.playback import bid_heights
+from utils.programs import Programs, execute
+
+# Unit vector from the team's center to each side
+SIDES = {"right": RIGHT, "bottom": DOWN, "left": LEFT, "top": UP}
+
+# Shape builders taking the shape's half size, and that half size by default
+SHAPES = {
+    "square": lambda size: Square(side_length=2 * size),
+    "circle": lambda size: Circle(radius=size),
+    "triangle": lambda size: Triangle().scale(size),
+}
+SHAPE_SIZES = {"square": 0.25, "circle": 0.3, "triangle": 0.3}
+
+BAR_WIDTH = 0.2
+
+
+@dataclass
+class ActionSpec:
+    """One action of a team and the program arrow pointing at it."""
+    shape: str
+    color: ParsableManimColor = RED
+    side: str = "right"
+    label: str = ""
+    bid: float | None = None
+    size: float | None = None
+
+
+@dataclass
+class TeamSpec:
+    """A team circle with its actions, drawn around ``position``."""
+    actions: list[ActionSpec] = field(default_factory=list)
+    position: tuple = (0, 1.5, 0)
+    radius: float = 1.5
+    color: ParsableManimColor = BLUE
+    fill_opacity: float = 0.0
+    label: str = ""
+    label_size: float = 24
+    action_label_size: float = 16
+    distance: float = 2.5           # From the circle's edge to the action's center
+    arrow_color: ParsableManimColor = GREEN
+    bars: bool = False              # Bid bars even for actions without a bid
+    bid_range: tuple | None = None  # Bid mapped to the lowest and highest bar
+    programs: Programs | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data["actions"] = [ActionSpec(**action) for action in data.get("actions", [])]
+        if data.get("programs") is not None:
+            data["programs"] = Programs.compile(data["programs"])
+        return cls(**data)
+
+    def bids(self, states):
+        """Bids of the team's programs on input ``states``, shaped (states, actions)."""
+        return execute(self.programs, states)
+
+
+# The team of TPGScene and EvolutionScene: three actions around a blue circle
+DECISION_TEAM = TeamSpec(actions=[
+    ActionSpec("square", RED, "right", "Action A"),
+    ActionSpec("circle", YELLOW, "bottom", "Action B"),
+    ActionSpec("triangle", PURPLE, "left", "Action C"),
+])
+
+
+def load_specs(path):
+    """Team specs from a JSON file holding one spec or a list of them."""
+    with open(path, encoding="utf-8") as fp:
+        data = json.load(fp)
+    return [TeamSpec.from_dict(spec) for spec in (data if isinstance(data, list) else [data])]
+
+
+@lru_cache(maxsize=64)
+def _template(shape, size):
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown action shape {shape!r}, expected one of {list(SHAPES)}")
+    template, _ = cached_geometry("shape", (shape, size), lambda: SHAPES[shape](size).move_to(ORIGIN))
+    return template
+
+
+def shape(name, size, color):
+    """Copy of the cached ``name`` template, centered on the origin."""
+    return _template(name, float(size)).copy().set_color(color)
+
+
+class TeamDiagram(VGroup):
+    """Compiled team: the circle, its actions, then its arrows, in that order.
+
+    The parts are also kept by role, with ``label``, ``action_labels``
+    and ``bars`` not added to the group, so scenes can bring them in
+    separately.
+    """
+
+    def __init__(self, spec, circle, actions, arrows, label=None, action_labels=(), bars=(), **kwargs):
+        self.spec = spec
+        self.circle = circle
+        self.actions = list(actions)
+        self.arrows = list(arrows)
+        self.label = label
+        self.action_labels = list(action_labels)
+        self.bars = list(bars)
+        super().__init__(circle, *self.actions, *self.arrows, **kwargs)
+
+
+def compile_teams(specs):
+    """Mobjects of every team spec, placed together in array operations."""
+    specs = list(specs)
+    actions = [action for spec in specs for action in spec.actions]
+    team = np.repeat(np.arange(len(specs)), [len(spec.actions) for spec in specs])
+    centers = np.array([spec.position for spec in specs], dtype=float)[team]
+    radius = np.array([spec.radius for spec in specs])[team]
+    distance = np.array([spec.distance for spec in specs])[team]
+    direction = np.array([SIDES[action.side] for action in actions], dtype=float).reshape(-1, 3)
+
+    sizes = [action.size or SHAPE_SIZES.get(action.shape, 0.3) for action in actions]
+    shapes = [shape(action.shape, size, action.color) for action, size in zip(actions, sizes)]
+    extents = np.array([[s.width / 2, s.height / 2, 0] for s in shapes]).reshape(-1, 3)
+
+    # Arrows run from the circle's edge to the action's facing side
+    starts = centers + direction * radius[:, None]
+    action_centers = starts + direction * distance[:, None]
+    ends = action_centers - direction * extents
+    for s, center in zip(shapes, action_centers):
+        s.shift(center)
+
+    # Bars sit beside their action, on the far side of left-hand actions
+    bar_side = np.where(direction[:, 0] < 0, -1.0, 1.0)
+    bar_x = action_centers[:, 0] + bar_side * (extents[:, 0] + 0.2 + BAR_WIDTH / 2)
+
+    diagrams = []
+    for index, spec in enumerate(specs):
+        rows = np.flatnonzero(team == index)
+        diagrams.append(_build_team(spec, [shapes[i] for i in rows], starts[rows], ends[rows],
+                                     extents[rows], bar_x[rows]))
+    return diagrams
+
+
+def compile_team(spec):
+    """Mobjects of one team spec."""
+    return compile_teams([spec])[0]
+
+
+def _build_team(spec, shapes, starts, ends, extents, bar_x):
+    """A team's mobjects around action shapes already placed by ``compile_teams``."""
+    circle = shape("circle", spec.radius, spec.color).shift(np.array(spec.position, dtype=float))
+    circle.set_fill(spec.color, opacity=spec.fill_opacity)
+    arrows = [arrow(start=start, end=end, buff=0.2, color=spec.arrow_color) for start, end in zip(starts, ends)]
+
+    team_label = None
+    if spec.label:
+        team_label = label(spec.label, font_size=spec.label_size).move_to(circle.get_center())
+    action_labels = []
+    for action, s, extent in zip(spec.actions, shapes, extents):
+        if action.label:
+            text = label(action.label, font_size=spec.action_label_size)
+            action_labels.append(text.move_to(s.get_center() + DOWN * (extent[1] + 0.1 + text.height / 2)))
+
+    bars = []
+    bids = np.array([np.nan if action.bid is None else action.bid for action in spec.actions])
+    if spec.bars or not np.isnan(bids).all():
+        known = bids[~np.isnan(bids)]
+        bid_range = spec.bid_range or ((known.min(), known.max()) if len(known) else (0, 0))
+        heights = np.where(np.isnan(bids), 0.1, bid_heights(np.nan_to_num(bids), bid_range))
+        for action, s, x, height in zip(spec.actions, shapes, bar_x, heights):
+            bar = Rectangle(height=height, width=BAR_WIDTH, color=action.color, fill_opacity=0.8)
+            bars.append(bar.move_to([x, s.get_center()[1], 0]))
+
+    return TeamDiagram(spec, circle, shapes, arrows, team_label, action_labels, bars)
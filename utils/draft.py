@@ -0,0 +1,29 @@
+import os
+
+from manim import *
+
+# Draft renders swap heavy mobjects for stand-ins with the same size and timing.
+# Set TPG_DRAFT=1 for `manim scenes/...`, or pass --draft to `main.py render`.
+_enabled = os.environ.get("TPG_DRAFT", "") not in ("", "0")
+
+# Arrow options that only affect the tip, which a draft line does not have
+TIP_OPTIONS = ("tip_length", "tip_shape", "max_tip_length_to_length_ratio", "max_stroke_width_to_length_ratio")
+
+
+def is_draft():
+    return _enabled
+
+
+def set_draft(enabled=True):
+    """Switch proxy geometry on or off for mobjects created from now on."""
+    global _enabled
+    _enabled = enabled
+
+
+def arrow(start=LEFT, end=RIGHT, buff=MED_SMALL_BUFF, **kwargs):
+    """``Arrow``, or in draft mode a bare line spanning the same tail and tip."""
+    if not _enabled:
+        return Arrow(start=start, end=end, buff=buff, **kwargs)
+    for option in TIP_OPTIONS:
+        kwargs.pop(option, None)
+    return Line(start=start, end=end, buff=buff, **kwargs)
@@ -0,0 +1,213 @@
+"""A small TPG evolution loop on cart-pole, vectorized over the whole population.
+
+Teams hold a fixed number of program slots. Each active program bids
+with a linear function of the cart-pole state and the highest bid picks
+that program's action, as in a single-level Tangled Program Graph. A
+generation evaluates every team on the same few episodes in one batch,
+keeps the fittest, and refills the rest with mutated crossovers of the
+survivors. Everything the scene needs to replay a run is written to a
+compressed ``.npz`` log.
+"""
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from utils.cache import CACHE_DIR, code_hash
+from utils.cartpole import DT, FORCE, THETA, X, step
+
+EVOLUTION_DIR = CACHE_DIR / "evolution"
+
+# Gym's CartPole-v1 termination and episode length
+THETA_LIMIT = 12 * np.pi / 180
+X_LIMIT = 2.4
+MAX_STEPS = 500
+
+
+@dataclass
+class Population:
+    """Program slots of every team as arrays, shaped (teams, programs, ...)."""
+    weights: np.ndarray  # (teams, programs, 4) bid weights over the cart-pole state
+    bias: np.ndarray     # (teams, programs)
+    actions: np.ndarray  # (teams, programs) push direction, -1 or 1
+    active: np.ndarray   # (teams, programs) which slots hold a program
+
+    def __len__(self):
+        return len(self.weights)
+
+    @classmethod
+    def random(cls, teams, programs, rng):
+        active = rng.random((teams, programs)) < 0.5
+        active[:, 0] = True
+        return cls(
+            weights=rng.normal(0, 1, (teams, programs, 4)).astype(np.float32),
+            bias=rng.normal(0, 1, (teams, programs)).astype(np.float32),
+            actions=rng.choice(np.array([-1, 1], dtype=np.int8), (teams, programs)),
+            active=active,
+        )
+
+    def take(self, index):
+        return Population(*(value[index] for value in vars(self).values()))
+
+    def put(self, index, other):
+        for name, value in vars(other).items():
+            getattr(self, name)[index] = value
+
+    def arrow_angles(self):
+        """Display direction of each program: its weights on pole angle and spin."""
+        return np.arctan2(self.weights[..., 3], self.weights[..., 2])
+
+
+@dataclass
+class Genealogy:
+    """Compact record of a run, one row per generation.
+
+    Population ``g`` scores ``fitness[g]``, then its losers are replaced
+    by children of ``parents[g]`` (-1 for survivors), some of which are
+    ``mutated[g]``. ``fitness``, ``angles`` and ``active`` have one more
+    row than the rest, for the final population.
+    """
+    fitness: np.ndarray    # (generations + 1, teams) float32, mean episode steps survived
+    survived: np.ndarray   # (generations, teams) bool
+    parents: np.ndarray    # (generations, teams, 2) int32
+    mutated: np.ndarray    # (generations, teams) bool
+    angles: np.ndarray     # (generations + 1, teams, programs) float16
+    active: np.ndarray     # (generations + 1, teams, programs) bool
+
+    @property
+    def generations(self):
+        return len(self.survived)
+
+    def save(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Workers may evolve the same run at once, each writes its own partial file
+        partial = path.with_suffix(f".{os.getpid()}.part")
+        with partial.open("wb") as fp:
+            np.savez_compressed(fp, **vars(self))
+        partial.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(**{name: data[name] for name in cls.__dataclass_fields__})
+
+
+def evaluate(population, episodes, rng, max_steps=MAX_STEPS):
+    """Mean steps survived by every team over the same random starts.
+
+    All (team, episode) rollouts advance together, and finished ones are
+    dropped from the batch so late steps only pay for the survivors.
+    """
+    teams = len(population)
+    starts = rng.uniform(-0.05, 0.05, (episodes, 4))
+    survived = np.zeros(teams * episodes, dtype=np.int32)
+
+    # One row per rollout still running, with its team's programs alongside
+    rollout = np.arange(teams * episodes)
+    team = rollout // episodes
+    states = starts[rollout % episodes]
+    weights = population.weights[team].astype(np.float64)
+    bias = np.where(population.active, population.bias, -np.inf)[team]
+    actions = population.actions[team]
+
+    for _ in range(max_steps):
+        # Every program bids, the winner's action is applied
+        bids = (weights @ states[:, :, None])[..., 0] + bias
+        action = actions[np.arange(len(states)), bids.argmax(axis=1)]
+        states = step(states, FORCE * action, DT)
+        alive = (np.abs(states[:, THETA]) < THETA_LIMIT) & (np.abs(states[:, X]) < X_LIMIT)
+        survived[rollout[alive]] += 1
+        if not alive.all():
+            rollout, states, weights, bias, actions = (
+                value[alive] for value in (rollout, states, weights, bias, actions)
+            )
+            if not len(rollout):
+                break
+    return survived.reshape(teams, episodes).mean(axis=1).astype(np.float32)
+
+
+def breed(population, parents, rng, mutation_rate):
+    """Uniform crossover of program slots, then per-slot mutation."""
+    first, second = population.take(parents[:, 0]), population.take(parents[:, 1])
+    pick = rng.random(first.active.shape) < 0.5
+    children = Population(
+        weights=np.where(pick[..., None], first.weights, second.weights),
+        bias=np.where(pick, first.bias, second.bias),
+        actions=np.where(pick, first.actions, second.actions),
+        active=np.where(pick, first.active, second.active),
+    )
+
+    shape = children.active.shape
+    tweak = rng.random(shape) < mutation_rate
+    children.weights += tweak[..., None] * rng.normal(0, 0.5, children.weights.shape).astype(np.float32)
+    children.bias += tweak * rng.normal(0, 0.5, shape).astype(np.float32)
+    flip = rng.random(shape) < mutation_rate / 2
+    children.actions = np.where(flip, -children.actions, children.actions)
+    toggle = rng.random(shape) < mutation_rate / 2
+    children.active ^= toggle
+    # A team needs at least one program to act
+    empty = ~children.active.any(axis=1)
+    children.active[empty, 0] = True
+
+    mutated = (tweak | flip | toggle).any(axis=1)
+    return children, mutated
+
+
+def run_key(**params):
+    # Keyed on the code too, so edits to evaluation or breeding rerun the evolution
+    params = dict(params, code=code_hash(__file__))
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def evolve(teams=1000, generations=100, programs=4, episodes=3, gap=0.5, mutation_rate=0.2,
+           tournament=2, seed=0, cache=True):
+    """Evolve a population and return its Genealogy, cached on disk by parameters.
+
+    Each generation keeps the best ``1 - gap`` of the teams in place and
+    refills the other slots with children of tournament-selected survivors.
+    """
+    params = dict(teams=teams, generations=generations, programs=programs, episodes=episodes,
+                  gap=gap, mutation_rate=mutation_rate, tournament=tournament, seed=seed)
+    path = EVOLUTION_DIR / f"{run_key(**params)}.npz"
+    if cache and path.exists():
+        return Genealogy.load(path)
+
+    rng = np.random.default_rng(seed)
+    population = Population.random(teams, programs, rng)
+    keep = teams - int(gap * teams)
+    log = Genealogy(
+        fitness=np.zeros((generations + 1, teams), dtype=np.float32),
+        survived=np.zeros((generations, teams), dtype=bool),
+        parents=np.full((generations, teams, 2), -1, dtype=np.int32),
+        mutated=np.zeros((generations, teams), dtype=bool),
+        angles=np.zeros((generations + 1, teams, programs), dtype=np.float16),
+        active=np.zeros((generations + 1, teams, programs), dtype=bool),
+    )
+    log.angles[0], log.active[0] = population.arrow_angles(), population.active
+
+    for g in range(generations):
+        fitness = evaluate(population, episodes, rng)
+        ranking = np.argsort(-fitness, kind="stable")
+        survivors, losers = ranking[:keep], ranking[keep:]
+
+        # Each parent is the fittest of a few random survivors
+        entrants = rng.choice(survivors, (len(losers), 2, tournament))
+        parents = np.take_along_axis(
+            entrants, fitness[entrants].argmax(axis=-1)[..., None], axis=-1
+        )[..., 0]
+        children, mutated = breed(population, parents, rng, mutation_rate)
+        population.put(losers, children)
+
+        log.fitness[g] = fitness
+        log.survived[g, survivors] = True
+        log.parents[g, losers] = parents
+        log.mutated[g, losers] = mutated
+        log.angles[g + 1], log.active[g + 1] = population.arrow_angles(), population.active
+    log.fitness[generations] = evaluate(population, episodes, rng)
+
+    if cache:
+        log.save(path)
+    return log
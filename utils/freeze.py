@@ -0,0 +1,84 @@
+from manim import *
+import numpy as np
+
+from utils.nodes import PieNode
+
+
+def style_key(vmobject):
+    """Members with equal keys can share one VMobject without changing how they look."""
+    shared = (
+        vmobject.get_stroke_width(),
+        vmobject.get_stroke_width(background=True),
+        vmobject.get_stroke_rgbas(background=True).tobytes(),
+        vmobject.get_sheen_factor(),
+        vmobject.z_index,
+    )
+    if isinstance(vmobject, PieNode):
+        # Wedge colours travel with the points, only opacities must match
+        return ("pie", vmobject.get_fill_opacity(), vmobject.get_stroke_opacity(), *shared)
+    return (
+        "path",
+        vmobject.get_fill_rgbas().tobytes(),
+        vmobject.get_stroke_rgbas().tobytes(),
+        *shared,
+    )
+
+
+def merge_members(members):
+    """One VMobject holding the points of every member, styled like the first."""
+    first = members[0]
+    if isinstance(first, PieNode):
+        merged = PieNode(first.wedge_colors[:1], radius=first.radius)
+        merged.wedge_colors = np.concatenate([member.wedge_colors for member in members])
+    else:
+        merged = VMobject()
+    merged.set_points(np.concatenate([member.points for member in members]))
+    merged.set_style(**first.get_style())
+    merged.z_index = first.z_index
+    return merged
+
+
+class FrozenGroup(VGroup):
+    """A static composite collapsed into one VMobject per distinct style.
+
+    Members are grouped by style regardless of their original order, so
+    this is meant for composites whose differently styled parts do not
+    overlap, such as a graph of nodes, labels and arrows. Point-wise
+    transforms (move, scale, rotate, animate) apply to the frozen copy and
+    are carried back to the original mobjects by ``thaw``.
+    """
+
+    def __init__(self, mobject, **kwargs):
+        super().__init__(**kwargs)
+        self.original = mobject
+
+        groups = {}
+        for member in mobject.family_members_with_points():
+            groups.setdefault(style_key(member), []).append(member)
+
+        # (member, merged mobject, first point, last point + 1) for thawing
+        self.slices = []
+        for members in groups.values():
+            merged = merge_members(members)
+            start = 0
+            for member in members:
+                self.slices.append((member, len(self.submobjects), start, start + len(member.points)))
+                start += len(member.points)
+            self.add(merged)
+
+    def __deepcopy__(self, memo):
+        # Copies (e.g. animation targets) share the original instead of cloning it
+        memo[id(self.original)] = self.original
+        memo.update((id(member), member) for member, *_ in self.slices)
+        return super().__deepcopy__(memo)
+
+    def thaw(self):
+        """Write the current geometry back into the original composite and return it."""
+        for member, index, start, stop in self.slices:
+            member.set_points(self.submobjects[index].points[start:stop])
+        return self.original
+
+
+def freeze(mobject):
+    """Collapse a finished, static mobject into a FrozenGroup."""
+    return FrozenGroup(mobject)
@@ -0,0 +1,198 @@
+from functools import lru_cache
+
+from manim import *
+import numpy as np
+
+from utils.draft import arrow, is_draft
+from utils.labels import label
+from utils.layout import fit_positions, layered_layout
+from utils.linked import LinkedGraph
+from utils.loader import AgentGraph, load_agent_graph
+from utils.nodes import PieNode, flatten_paths
+from utils.streams import stream
+
+# Nodes per level of the TPG graph shown in HierarchyScene and ResultScene
+TPG_LEVELS = (1, 3, 4, 5, 5)
+
+# Edges between node indices, ensuring a hierarchical structure
+TPG_CONNECTIONS = (
+    # From root (Node 1) to Level 2
+    (0, 1), (0, 2), (0, 3),
+
+    # From Level 2 to Level 3
+    (1, 4), (1, 5),
+    (2, 5), (2, 6),
+    (3, 6), (3, 7),
+
+    # From Level 3 to Level 4
+    (4, 8), (4, 9),
+    (5, 9), (5, 10),
+    (6, 10), (6, 11),
+    (7, 11), (7, 12),
+
+    # From Level 4 to Level 5
+    (8, 13), (8, 14),
+    (9, 14), (9, 15),
+    (10, 15), (10, 16),
+    (11, 16), (11, 17),
+    (12, 17),
+
+    # Additional cross-connections for complexity
+    (2, 4), (2, 7),
+    (5, 8), (6, 12),
+    (9, 13), (10, 17),
+    (14, 16), (15, 17),
+)
+
+LEVEL_SPACING = 1.25  # Vertical spacing between levels
+NODE_SPACING = 1.5    # Horizontal spacing between nodes
+TOP_Y = 2.5           # Height of the root level
+
+# Wedge colour of each action in agent graphs, cycled for larger action sets
+ACTION_COLORS = (BLUE, RED, YELLOW, GREEN, PURPLE)
+TEAM_TARGET_COLOR = GRAY  # Wedge for programs that defer to another team
+MAX_WEDGES = 5
+
+
+def level_positions(level_sizes, level_spacing=LEVEL_SPACING, node_spacing=NODE_SPACING, top=TOP_Y):
+    """Positions of every node, level by level, each level centered horizontally."""
+    sizes = np.asarray(level_sizes)
+    level = np.repeat(np.arange(len(sizes)), sizes)
+    # Index of each node within its level
+    index = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+
+    positions = np.zeros((len(level), 3))
+    positions[:, 0] = (index - (sizes[level] - 1) / 2) * node_spacing
+    positions[:, 1] = top - level * level_spacing
+    return positions
+
+
+def create_complex_node(position, node_id, colors=None):
+    """Create a complex node with multiple color segments."""
+    if colors is None:
+        # Default colors if none provided
+        colors = [BLUE, RED, YELLOW, GREEN, PURPLE]
+        rng = stream("graph.colors")
+        colors = [colors[i] for i in rng.permutation(len(colors))[:rng.integers(2, 6)]]  # Use 2-5 colors
+
+    if is_draft():
+        # Same footprint and the same random draws, none of the detail
+        return Dot(position, radius=0.25, color=colors[0])
+
+    # All wedges share one point array, the id is a single merged glyph path
+    node = PieNode(colors, radius=0.25)  # Reduced radius for better fit
+    node.add(flatten_paths(label(str(node_id), font_size=14, color=WHITE)))  # Smaller font
+
+    node.move_to(position)
+    return node
+
+
+def create_edge(start, end):
+    """Thin arrow between two node centers."""
+    return arrow(
+        start=start,
+        end=end,
+        buff=0.2,
+        color=GREEN,
+        max_tip_length_to_length_ratio=0.08,  # Smaller arrowheads
+        stroke_width=1.5  # Thinner arrows
+    )
+
+
+def build_graph(positions, connections, colors=None):
+    """Build a VGroup(nodes, arrows) for nodes at the given positions.
+
+    ``colors`` optionally gives the wedge colours of every node, otherwise
+    they are picked at random.
+    """
+    if colors is None:
+        colors = [None] * len(positions)
+    nodes = VGroup(*(
+        create_complex_node(pos, i, node_colors)
+        for i, (pos, node_colors) in enumerate(zip(positions, colors), 1)
+    ))
+
+    # Arrows go between node centers, which are exactly the layout positions
+    edges = np.asarray(connections, dtype=int).reshape(-1, 2)
+    starts, ends = positions[edges[:, 0]], positions[edges[:, 1]]
+    arrows = VGroup(*(create_edge(start, end) for start, end in zip(starts, ends)))
+
+    return VGroup(nodes, arrows)
+
+
+@lru_cache(maxsize=8)
+def _graph_template(level_sizes, connections, draft, colors_state):
+    """The graph and the colour stream's state after drawing its colours."""
+    graph = build_graph(level_positions(level_sizes), connections)
+    return graph, stream("graph.colors").bit_generator.state
+
+
+def create_tpg_graph(level_sizes=TPG_LEVELS, connections=TPG_CONNECTIONS):
+    """A fresh copy of the layered TPG graph, built only once per process.
+
+    The returned VGroup holds ``nodes`` and ``arrows`` groups and can be
+    freely transformed without touching the cached template. The template
+    is keyed on the colour stream's state, which a hit moves on as a build
+    would, so reseeded scenes (e.g. batch variants) draw the same colours
+    as in a fresh process.
+    """
+    rng = stream("graph.colors")
+    template, state = _graph_template(tuple(level_sizes), tuple(map(tuple, connections)), is_draft(),
+                                      repr(rng.bit_generator.state))
+    rng.bit_generator.state = state
+    return template.copy()
+
+
+def create_layered_graph(num_nodes, connections, **layout_options):
+    """TPG graph of any topology, positioned by the layered layout engine."""
+    layout = layered_layout(num_nodes, connections, **layout_options)
+    return build_graph(layout.positions, connections)
+
+
+def create_linked_graph(num_nodes, connections, colors=None, **layout_options):
+    """Layered TPG graph whose arrows follow their nodes, for re-layout animations."""
+    layout = layered_layout(num_nodes, connections, **layout_options)
+    if colors is None:
+        colors = [None] * num_nodes
+    nodes = [
+        create_complex_node(pos, i, node_colors)
+        for i, (pos, node_colors) in enumerate(zip(layout.positions, colors), 1)
+    ]
+    return LinkedGraph(nodes, connections, buff=0.2, stroke_width=1.5)
+
+
+def team_colors(agent_graph, teams):
+    """Wedge colours of each team: one per distinct action its programs pick.
+
+    Teams with programs that point at other teams get a grey wedge too,
+    and teams without any programs are drawn all grey.
+    """
+    local = np.full(agent_graph.num_teams, -1)
+    local[teams] = np.arange(len(teams))
+    owner = local[agent_graph.program_team]
+    inside = owner >= 0
+    owner, target = owner[inside], agent_graph.program_target[inside]
+
+    # Distinct (team, wedge) pairs, wedge 0 for team targets, 1 + action otherwise
+    wedge = np.where(target < 0, -target, 0)
+    pairs = np.unique(np.stack([owner, wedge], axis=1), axis=0)
+    palette = [TEAM_TARGET_COLOR, *ACTION_COLORS]
+
+    colors = [[] for _ in teams]
+    for team, w in pairs:
+        if len(colors[team]) < MAX_WEDGES:
+            colors[team].append(palette[(w - 1) % len(ACTION_COLORS) + 1] if w else palette[0])
+    return [team_wedges or [TEAM_TARGET_COLOR] for team_wedges in colors]
+
+
+def create_agent_graph(source, roots=None, max_teams=40, width=12, height=6, **layout_options):
+    """Graph of a real TPG agent, loaded from an export path or an AgentGraph.
+
+    Only the ``max_teams`` teams reachable first from ``roots`` become
+    mobjects, so huge agents cost no more to draw than small ones.
+    """
+    agent = source if isinstance(source, AgentGraph) else load_agent_graph(source)
+    teams, edges = agent.visible_subgraph(roots, max_teams)
+    layout = layered_layout(len(teams), edges, **layout_options)
+    positions = fit_positions(layout.positions, width, height)
+    return build_graph(positions, edges, team_colors(agent, teams))
@@ -0,0 +1,52 @@
+from manim import *
+
+from utils.layers import fingerprint
+from utils.seeded import SeededScene
+
+
+class IdleFrameScene(SeededScene):
+    """Scene that re-emits the last frame when updaters left everything unchanged.
+
+    Mobjects with updaters make manim redraw every frame of a play or
+    wait, even while the updaters have nothing to do. Before drawing, the
+    points and styles of the moving mobjects (all of the scene's mobjects
+    when manim redraws everything) are fingerprinted; when that matches the
+    previous frame of the same play, the frame already in the camera is
+    written again. The static background is not compared, so the
+    fingerprint is dropped at the start of every play, where it may change.
+    ``idle_frames`` counts the reused frames and is logged when the scene
+    finishes.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.idle_frames = self.drawn_frames = 0
+        self.last_frame_key = None
+        renderer = self.renderer
+        if not hasattr(renderer, "render"):
+            return
+        render, play = renderer.render, renderer.play
+
+        def render_frame(scene, time, moving_mobjects):
+            key = fingerprint(moving_mobjects or scene.mobjects)
+            if key == self.last_frame_key:
+                self.idle_frames += 1
+                renderer.add_frame(renderer.get_frame())
+                return
+            self.last_frame_key = key
+            self.drawn_frames += 1
+            render(scene, time, moving_mobjects)
+
+        def play_frames(*args, **kwargs):
+            # The static background may change between plays, start afresh
+            self.last_frame_key = None
+            return play(*args, **kwargs)
+
+        renderer.render = render_frame
+        renderer.play = play_frames
+
+    def tear_down(self):
+        super().tear_down()
+        total = self.idle_frames + self.drawn_frames
+        if total:
+            logger.info(f"{type(self).__name__}: reused {self.idle_frames} of {total} frames with no changes")
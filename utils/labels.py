@@ -0,0 +1,91 @@
+from functools import lru_cache
+import hashlib
+import json
+import os
+
+from manim import *
+
+from utils.assets import cached_geometry
+from utils.cache import LABEL_EXTENT_DIR
+from utils.draft import is_draft
+
+# Distinct (text, font, size, weight) combinations kept parsed in memory
+CACHE_SIZE = 512
+
+# Width and height of every label typeset so far, so drafts can size their boxes.
+# One file per label, like the asset store, so concurrent workers never share a file.
+_extents = {}
+
+
+def _extent_key(text, font, font_size, weight):
+    return json.dumps([text, font, font_size, str(weight)])
+
+
+def _extent_path(key):
+    return LABEL_EXTENT_DIR / f"{hashlib.sha1(key.encode()).hexdigest()[:20]}.json"
+
+
+def _load_extent(key):
+    """Recorded [width, height] of a label, or None if it was never typeset."""
+    if key not in _extents:
+        path = _extent_path(key)
+        _extents[key] = json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+    return _extents[key]
+
+
+def _record_extent(key, width, height):
+    if _load_extent(key) == [width, height]:
+        return
+    _extents[key] = [width, height]
+    path = _extent_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(f".{os.getpid()}.part")
+    partial.write_text(json.dumps([width, height]), encoding="utf-8")
+    partial.replace(path)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _glyphs(text, font, font_size, weight):
+    glyphs, _ = cached_geometry("text", (text, font, font_size, str(weight)),
+                                lambda: Text(text, font=font, font_size=font_size, weight=weight))
+    _record_extent(_extent_key(text, font, font_size, weight), glyphs.width, glyphs.height)
+    return glyphs
+
+
+def text_box(text, font_size=DEFAULT_FONT_SIZE, color=WHITE, font="", weight=NORMAL):
+    """Flat box the size the label would have, used in place of glyphs in drafts.
+
+    Sizes come from earlier full renders; labels never typeset before get
+    a rough estimate, so only those can shift a draft's layout.
+    """
+    extent = _load_extent(_extent_key(str(text), font, float(font_size), weight))
+    if extent is None:
+        lines = str(text).split("\n")
+        height = 0.0125 * font_size
+        extent = (0.55 * height * max(map(len, lines)), height * len(lines))
+    return Rectangle(width=extent[0], height=extent[1], stroke_width=0, fill_color=color, fill_opacity=0.5)
+
+
+def label(text, font_size=DEFAULT_FONT_SIZE, color=WHITE, font="", weight=NORMAL):
+    """Drop-in for ``Text`` that lays out and parses each string only once.
+
+    Glyph outlines are cached by (text, font, size, weight); every call
+    returns an independent copy recoloured to ``color``. Draft renders get
+    a ``text_box`` instead.
+    """
+    if is_draft():
+        return text_box(text, font_size, color, font, weight)
+    return _glyphs(str(text), font, float(font_size), weight).copy().set_color(color)
+
+
+def prewarm(*texts, font_size=DEFAULT_FONT_SIZE, font="", weight=NORMAL):
+    """Parse labels ahead of time so later ``label`` calls are only copies."""
+    if is_draft():
+        return
+    for text in texts:
+        _glyphs(str(text), font, float(font_size), weight)
+
+
+def cache_info():
+    """Hit/miss statistics of the glyph cache."""
+    return _glyphs.cache_info()
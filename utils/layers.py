@@ -0,0 +1,89 @@
+import os
+import zlib
+
+from utils.seeded import SeededScene
+
+# Static/dynamic layer compositing for LayeredScene subclasses.
+# Set TPG_LAYERS=0 to render them with manim's own play-order layering.
+_enabled = os.environ.get("TPG_LAYERS", "1") not in ("", "0")
+
+# Static rasters kept per scene, each one full frame
+MAX_STATIC_FRAMES = 4
+
+
+def layers_enabled():
+    return _enabled
+
+
+def set_layers(enabled=True):
+    global _enabled
+    _enabled = enabled
+
+
+def fingerprint(mobjects, digest=0):
+    """CRC of every family member's geometry and style, cheap next to drawing them."""
+    for mobject in mobjects:
+        for member in mobject.family_members_with_points():
+            digest = zlib.crc32(member.points.tobytes(), digest)
+            for name in ("fill_rgbas", "stroke_rgbas", "rgbas"):
+                value = getattr(member, name, None)
+                if value is not None:
+                    digest = zlib.crc32(value.tobytes(), digest)
+            digest = zlib.crc32(repr((id(member), member.z_index, getattr(member, "stroke_width", None))).encode(), digest)
+    return digest
+
+
+def static_key(camera, mobjects):
+    """Fingerprint of a static layer: the camera state plus its mobjects."""
+    state = (getattr(camera, name, None) for name in ("frame_center", "frame_width", "frame_height", "background_color"))
+    return fingerprint(mobjects, zlib.crc32(repr([getattr(value, "tolist", lambda: value)() for value in state]).encode()))
+
+
+class LayeredScene(SeededScene):
+    """Scene that draws still mobjects once per play into a cached background layer.
+
+    Manim already rasterizes the mobjects a play leaves alone, but it
+    treats everything after the first moving mobject in the scene list as
+    moving too, and re-rasterizes on every play. Here only animated
+    mobjects, mobjects with updaters and foreground mobjects are redrawn
+    each frame, composited over a static raster that is reused for as
+    long as the camera and the still mobjects are unchanged. Moving
+    mobjects always draw on top of still ones, so use this for scenes
+    whose moving parts do not pass behind still ones.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.static_frames = {}
+        if hasattr(self.renderer, "save_static_frame_data"):
+            self.renderer.save_static_frame_data = self.save_static_frame_data
+
+    def get_moving_mobjects(self, *animations):
+        if not layers_enabled():
+            return super().get_moving_mobjects(*animations)
+        moving = set()
+        roots = [animation.mobject for animation in animations] + list(self.foreground_mobjects)
+        roots += [mobject for mobject in self.get_mobject_family_members() if mobject.updaters]
+        for root in roots:
+            moving.update(id(member) for member in root.get_family())
+        return [mobject for mobject in self.get_mobject_family_members() if id(mobject) in moving]
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        """Renderer hook: reuse the raster of an unchanged static layer."""
+        renderer = self.renderer
+        renderer.static_image = None
+        if not static_mobjects:
+            return None
+        if not layers_enabled():
+            renderer.update_frame(scene, mobjects=static_mobjects)
+            renderer.static_image = renderer.get_frame()
+            return renderer.static_image
+
+        key = static_key(renderer.camera, static_mobjects)
+        if key not in self.static_frames:
+            renderer.update_frame(scene, mobjects=static_mobjects)
+            if len(self.static_frames) >= MAX_STATIC_FRAMES:
+                self.static_frames.pop(next(iter(self.static_frames)))
+            self.static_frames[key] = renderer.get_frame()
+        renderer.static_image = self.static_frames[key]
+        return renderer.static_image
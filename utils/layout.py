@@ -0,0 +1,246 @@
+import hashlib
+import heapq
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from utils.arrays import csr_gather
+from utils.cache import CACHE_DIR, code_hash
+
+LAYOUT_CACHE_DIR = CACHE_DIR / "layouts"
+
+
+@dataclass
+class Layout:
+    """Result of a layered layout, one entry per input node."""
+    positions: np.ndarray  # (nodes, 3) scene coordinates
+    layers: np.ndarray     # (nodes,) layer index, 0 at the top
+    order: np.ndarray      # (nodes,) rank within the layer, left to right
+    flipped: np.ndarray    # (edges,) True where an edge was reversed to break a cycle
+
+
+def assign_layers(num_nodes, edges):
+    """Longest-path layering, reversing edges where needed to break cycles.
+
+    ``edges`` must not contain self-loops. Edges that point backwards in
+    the first peel are reversed and the now acyclic graph is peeled again,
+    since forced placements would otherwise stretch the layering.
+    """
+    layers = _peel(num_nodes, edges)
+    flipped = layers[edges[:, 0]] > layers[edges[:, 1]]
+    if flipped.any():
+        layers = _peel(num_nodes, np.where(flipped[:, None], edges[:, ::-1], edges))
+    return layers, flipped
+
+
+def _peel(num_nodes, edges):
+    """Layer of every node by frontier peeling.
+
+    Each round places every node whose predecessors are all placed, so a
+    node's layer is the length of the longest path reaching it. When only
+    cycles remain, the unplaced node with the fewest pending inputs is
+    forced through on its own, taken from a heap of (pending, node) built
+    the first time that happens.
+    """
+    src, dst = edges[:, 0], edges[:, 1]
+    by_src = np.argsort(src, kind="stable")
+    offsets = np.searchsorted(src[by_src], np.arange(num_nodes + 1))
+
+    pending = np.bincount(dst, minlength=num_nodes)
+    layers = np.full(num_nodes, -1)
+    frontier = np.flatnonzero(pending == 0)
+    depth = placed = 0
+    heap = None
+    while placed < num_nodes:
+        if len(frontier) == 0:
+            if heap is None:
+                unplaced = np.flatnonzero(layers < 0)
+                heap = list(zip(pending[unplaced].tolist(), unplaced.tolist()))
+                heapq.heapify(heap)
+            # Entries of placed nodes and outdated counts are dropped as they surface
+            count, node = heapq.heappop(heap)
+            while layers[node] >= 0 or pending[node] != count:
+                count, node = heapq.heappop(heap)
+            frontier = np.array([node])
+        layers[frontier] = depth
+        placed += len(frontier)
+
+        targets, counts = np.unique(dst[by_src[csr_gather(offsets, frontier)]], return_counts=True)
+        pending[targets] -= counts
+        targets = targets[layers[targets] < 0]
+        if heap is not None:
+            # Counts only drop, so the newest entry of a node is its current one
+            for item in zip(pending[targets].tolist(), targets.tolist()):
+                heapq.heappush(heap, item)
+        frontier = targets[pending[targets] == 0]
+        depth += 1
+    return layers
+
+
+def split_long_edges(layers, edges):
+    """Insert a dummy node on every layer a long edge passes through.
+
+    Returns the extended layer array and unit-length (upper, lower) edges.
+    Dummy nodes are numbered after the real ones.
+    """
+    upper, lower = edges[:, 0], edges[:, 1]
+    span = layers[lower] - layers[upper]
+    long = span > 1
+    short_edges = edges[~long]
+
+    upper, lower, span = upper[long], lower[long], span[long]
+    dummies_per_edge = span - 1
+    first_dummy = len(layers) + np.cumsum(dummies_per_edge) - dummies_per_edge
+
+    # Segment j of a long edge runs from its (j-1)th dummy to its jth one
+    j = np.arange(span.sum()) - np.repeat(np.cumsum(span) - span, span)
+    seg_first, seg_span = np.repeat(first_dummy, span), np.repeat(span, span)
+    seg_upper = np.where(j == 0, np.repeat(upper, span), seg_first + j - 1)
+    seg_lower = np.where(j == seg_span - 1, np.repeat(lower, span), seg_first + j)
+
+    dummy_layers = np.repeat(layers[upper], dummies_per_edge) + 1 + (
+        np.arange(dummies_per_edge.sum()) - np.repeat(np.cumsum(dummies_per_edge) - dummies_per_edge, dummies_per_edge)
+    )
+    all_layers = np.concatenate([layers, dummy_layers])
+    all_edges = np.concatenate([short_edges, np.stack([seg_upper, seg_lower], axis=1)])
+    return all_layers, all_edges
+
+
+def _edges_by_layer(edges, key_layers, num_layers):
+    """Edge indices sorted by the layer of one endpoint, with CSR offsets."""
+    order = np.argsort(key_layers, kind="stable")
+    offsets = np.searchsorted(key_layers[order], np.arange(num_layers + 1))
+    return order, offsets
+
+
+def reduce_crossings(layers, edges, sweeps=8):
+    """Order nodes within layers by alternating down/up barycenter sweeps.
+
+    Every layer step is a handful of NumPy calls over that layer's edges,
+    so a sweep costs O(edges + nodes) in total.
+    """
+    num_layers = layers.max() + 1
+    members_order = np.lexsort((np.arange(len(layers)), layers))
+    member_offsets = np.searchsorted(layers[members_order], np.arange(num_layers + 1))
+    members = [members_order[member_offsets[l]:member_offsets[l + 1]] for l in range(num_layers)]
+
+    rank = np.empty(len(layers))
+    for nodes in members:
+        rank[nodes] = np.arange(len(nodes))
+    local = rank.astype(int)
+
+    upper, lower = edges[:, 0], edges[:, 1]
+    down_order, down_offsets = _edges_by_layer(edges, layers[lower], num_layers)
+    up_order, up_offsets = _edges_by_layer(edges, layers[upper], num_layers)
+
+    def sweep(layer_range, edge_order, offsets, moving, fixed):
+        for l in layer_range:
+            nodes = members[l]
+            e = edge_order[offsets[l]:offsets[l + 1]]
+            if len(e) == 0:
+                continue
+            targets = local[moving[e]]
+            total = np.bincount(targets, weights=rank[fixed[e]], minlength=len(nodes))
+            count = np.bincount(targets, minlength=len(nodes))
+            # Nodes without neighbours on the fixed side keep their place
+            barycenter = np.where(count > 0, total / np.maximum(count, 1), rank[nodes])
+            nodes = nodes[np.argsort(barycenter, kind="stable")]
+            members[l] = nodes
+            rank[nodes] = np.arange(len(nodes))
+            local[nodes] = np.arange(len(nodes))
+
+    for i in range(sweeps):
+        if i % 2 == 0:
+            sweep(range(1, num_layers), down_order, down_offsets, lower, upper)
+        else:
+            sweep(range(num_layers - 2, -1, -1), up_order, up_offsets, upper, lower)
+    return members, local
+
+
+def assign_coordinates(layers, edges, members, iterations=4):
+    """Horizontal coordinates in node-spacing units, one unit apart per layer.
+
+    Starts from centered ranks and repeatedly pulls every node toward the
+    mean of its neighbours, then restores unit separation in rank order.
+    Dummy nodes take part, which straightens long edges.
+    """
+    x = np.empty(len(layers))
+    for nodes in members:
+        x[nodes] = np.arange(len(nodes)) - (len(nodes) - 1) / 2
+
+    neighbours = np.concatenate([edges, edges[:, ::-1]])
+    for _ in range(iterations):
+        total = np.bincount(neighbours[:, 0], weights=x[neighbours[:, 1]], minlength=len(x))
+        count = np.bincount(neighbours[:, 0], minlength=len(x))
+        desired = np.where(count > 0, total / np.maximum(count, 1), x)
+        for nodes in members:
+            want = desired[nodes]
+            steps = np.arange(len(nodes))
+            # Smallest non-decreasing shift that keeps nodes a unit apart
+            placed = np.maximum.accumulate(want - steps) + steps
+            x[nodes] = placed + (want - placed).mean()
+    return x
+
+
+def topology_key(num_nodes, edges, **params):
+    digest = hashlib.sha256()
+    # A changed layout algorithm must not serve layouts cached by the old one
+    digest.update(code_hash(__file__).encode())
+    digest.update(np.int64(num_nodes).tobytes())
+    digest.update(np.ascontiguousarray(edges, dtype=np.int64).tobytes())
+    digest.update(repr(sorted(params.items())).encode())
+    return digest.hexdigest()[:20]
+
+
+def layered_layout(num_nodes, edges, level_spacing=1.25, node_spacing=1.5, top=2.5,
+                   sweeps=8, iterations=4, max_span=8, cache=True):
+    """Sugiyama-style layout of a directed graph, cached on disk by topology.
+
+    ``edges`` is an (E, 2) array of (source, target) node indices. The
+    returned positions feed straight into ``utils.graph.build_graph``.
+    Edges spanning more than ``max_span`` layers are left out of crossing
+    reduction, which keeps the dummy-node count linear in the edge count.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    params = dict(level_spacing=level_spacing, node_spacing=node_spacing, top=top,
+                  sweeps=sweeps, iterations=iterations, max_span=max_span)
+    path = LAYOUT_CACHE_DIR / f"{topology_key(num_nodes, edges, **params)}.npz"
+    if cache and path.exists():
+        with np.load(path) as data:
+            return Layout(**{name: data[name] for name in Layout.__dataclass_fields__})
+
+    # Self-loops neither constrain layers nor get drawn across them
+    loop = edges[:, 0] == edges[:, 1]
+    kept = edges[~loop]
+    layers, kept_flipped = assign_layers(num_nodes, kept)
+    flipped = np.zeros(len(edges), dtype=bool)
+    flipped[~loop] = kept_flipped
+    oriented = np.where(kept_flipped[:, None], kept[:, ::-1], kept)
+    oriented = oriented[layers[oriented[:, 1]] - layers[oriented[:, 0]] <= max_span]
+
+    all_layers, unit_edges = split_long_edges(layers, oriented)
+    members, order = reduce_crossings(all_layers, unit_edges, sweeps)
+    x = assign_coordinates(all_layers, unit_edges, members, iterations)
+
+    positions = np.zeros((num_nodes, 3))
+    positions[:, 0] = x[:num_nodes] * node_spacing
+    positions[:, 1] = top - layers * level_spacing
+    layout = Layout(positions, layers, order[:num_nodes], flipped)
+
+    if cache:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write next to the target first so readers never see a partial file
+        partial = path.with_suffix(f".{os.getpid()}.part")
+        with partial.open("wb") as fp:
+            np.savez(fp, **vars(layout))
+        partial.replace(path)
+    return layout
+
+
+def fit_positions(positions, width, height):
+    """Uniformly scale and center positions to fit a width x height box."""
+    low, high = positions.min(axis=0), positions.max(axis=0)
+    extent = np.maximum(high - low, 1e-9)
+    scale = min(width / extent[0], height / extent[1])
+    return (positions - (low + high) / 2) * scale
@@ -0,0 +1,135 @@
+from manim import *
+import numpy as np
+
+from utils.arrays import csr_gather, line_curves
+
+# Shaft plus the three sides of the tip, as in PopulationGrid arrows
+EDGE_CURVES = 4
+
+
+def edge_points(starts, ends, buff=0.2, tip_length=0.12, tip_width=0.05):
+    """Bezier points of arrows between node centers, shaped (edges, EDGE_CURVES * 4, 3).
+
+    Arrows stop ``buff`` short of both centers; the tip is at most a third
+    of what is left.
+    """
+    delta = ends - starts
+    length = np.linalg.norm(delta, axis=1, keepdims=True)
+    direction = delta / np.maximum(length, 1e-9)
+    normal = np.stack([-direction[:, 1], direction[:, 0], np.zeros(len(direction))], axis=1)
+    start = starts + direction * buff
+    end = ends - direction * buff
+    tip = np.minimum(tip_length, np.maximum(length - 2 * buff, 0) / 3)
+    base = end - direction * tip
+    width = tip_width * tip / tip_length
+    left, right = base + normal * width, base - normal * width
+    curves = np.stack([line_curves(start, base), line_curves(left, end), line_curves(end, right),
+                       line_curves(right, left)], axis=1)
+    return curves.reshape(len(starts), -1, 3)
+
+
+class LinkedGraph(VGroup):
+    """Nodes and the arrows between them, with arrows that follow their nodes.
+
+    All arrows live in one VMobject, ``EDGE_CURVES`` cubics per edge, and a
+    node -> incident edge index (CSR, like the layout engine's) tells which
+    of them a moved node touches. ``move_nodes`` and ``MoveNodes`` rebuild
+    only those edges in one NumPy step, so moving a few nodes of a large
+    graph costs as much as those nodes and their edges. After moving nodes
+    any other way, ``sync`` finds the ones that moved and updates their
+    edges; ``follow_nodes`` does that every frame.
+    """
+
+    def __init__(self, nodes, edges, buff=0.2, tip_length=0.12, tip_width=0.05, color=GREEN,
+                 stroke_width=1.5, **kwargs):
+        self.nodes = VGroup(*nodes)
+        self.edges = np.asarray(edges, dtype=int).reshape(-1, 2)
+        self.edge_style = dict(buff=buff, tip_length=tip_length, tip_width=tip_width)
+        self.centers = np.array([node.get_center() for node in self.nodes]).reshape(-1, 3)
+
+        # Incident edges of node n are incident[offsets[n]:offsets[n + 1]]
+        ends = self.edges.ravel()
+        self.incident = np.argsort(ends, kind="stable") // 2
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(ends, minlength=len(self.nodes)))])
+
+        self.arrows = VMobject(stroke_color=color, stroke_width=stroke_width, fill_color=color, fill_opacity=1)
+        self.arrows.set_points(self.edge_points(np.arange(len(self.edges))).reshape(-1, 3))
+        super().__init__(self.nodes, self.arrows, **kwargs)
+
+    def incident_edges(self, nodes):
+        """Edges touching any of ``nodes``, each listed once."""
+        return np.unique(self.incident[csr_gather(self.offsets, np.asarray(nodes, dtype=int))])
+
+    def edge_points(self, edges):
+        starts, ends = self.centers[self.edges[edges, 0]], self.centers[self.edges[edges, 1]]
+        return edge_points(starts, ends, **self.edge_style)
+
+    def update_edges(self, nodes):
+        """Rebuild the arrows touching ``nodes`` from the stored centers."""
+        edges = self.incident_edges(nodes)
+        if len(edges) and len(self.arrows.points):
+            self.arrows.points.reshape(len(self.edges), -1, 3)[edges] = self.edge_points(edges)
+        return self
+
+    def move_nodes(self, nodes, positions):
+        """Move ``nodes`` to ``positions`` and update only their edges."""
+        nodes = np.asarray(nodes, dtype=int)
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        for node, position in zip(nodes, positions):
+            self.nodes[node].move_to(position)
+        self.centers[nodes] = positions
+        return self.update_edges(nodes)
+
+    def sync(self, tolerance=1e-6):
+        """Pick up nodes moved by other animations and update their edges."""
+        centers = np.array([node.get_center() for node in self.nodes]).reshape(-1, 3)
+        moved = np.flatnonzero(np.abs(centers - self.centers).max(axis=1) > tolerance)
+        if len(moved):
+            self.centers[moved] = centers[moved]
+            self.update_edges(moved)
+        return self
+
+    def follow_nodes(self):
+        self.add_updater(lambda graph: graph.sync())
+        return self
+
+
+class MoveNodes(Animation):
+    """Move some nodes of a LinkedGraph to new positions, dragging their edges along.
+
+    Incident edges are looked up once when the animation begins, so every
+    frame only moves the given nodes and rebuilds their edges. For a new
+    layout, pass just the nodes whose positions changed.
+    """
+
+    def __init__(self, graph, nodes, positions, **kwargs):
+        self.moving = np.asarray(nodes, dtype=int)
+        self.targets = np.asarray(positions, dtype=float).reshape(-1, 3)
+        super().__init__(graph, **kwargs)
+
+    def create_starting_mobject(self):
+        # Frames come from the stored centers, so the graph is never copied
+        return self.mobject
+
+    def begin(self):
+        graph = self.mobject
+        self.starts = graph.centers[self.moving].copy()
+        self.moved_edges = graph.incident_edges(self.moving)
+        self.edge_rows = graph.arrows.points.reshape(len(graph.edges), -1, 3)
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        graph = self.mobject
+        positions = self.starts + (self.targets - self.starts) * alpha
+        for node, position in zip(self.moving, positions):
+            graph.nodes[node].move_to(position)
+        graph.centers[self.moving] = positions
+        if len(self.moved_edges):
+            self.edge_rows[self.moved_edges] = graph.edge_points(self.moved_edges)
+
+
+def relayout(graph, positions, tolerance=1e-6, **kwargs):
+    """MoveNodes animation to a new layout, moving only the nodes whose place changed."""
+    positions = np.asarray(positions, dtype=float)
+    moved = np.flatnonzero(np.abs(positions - graph.centers).max(axis=1) > tolerance)
+    return MoveNodes(graph, moved, positions[moved], **kwargs)
@@ -0,0 +1,283 @@
+"""Stream TPG agent graphs exported by TPGEngine into compact NumPy arrays.
+
+Exports are read record by record, so memory depends on the size of the
+graph, never on the size of the file. Three layouts are accepted, plain or
+gzipped:
+
+* NDJSON, one record per line
+* a JSON array of records
+* a JSON object whose array values hold records, e.g.
+  ``{"teams": [...], "programs": [...], "actions": [...]}``
+
+Records look like::
+
+    {"type": "team", "id": "t1"}
+    {"type": "program", "id": "p7", "team": "t1", "action": 2}
+    {"type": "program", "id": "p8", "team": "t1", "target": "t4"}
+    {"type": "action", "id": 2, "name": "push left"}
+
+``type`` may be omitted inside a named array ("teams" -> "team"), and a
+team record may embed its programs as a ``programs`` list of program
+records without the ``team`` field.
+"""
+from array import array
+from dataclasses import dataclass
+import gzip
+import json
+from pathlib import Path
+
+import numpy as np
+
+from utils.arrays import csr_gather
+
+CHUNK_SIZE = 1 << 20
+# Characters that may follow a complete JSON value
+_DELIMITERS = frozenset(",:]} \t\r\n")
+
+
+@dataclass
+class AgentGraph:
+    """Teams, actions and the programs connecting them, as index arrays."""
+    team_ids: list
+    action_names: list
+    program_team: np.ndarray    # (programs,) index of the owning team
+    program_target: np.ndarray  # (programs,) team index, or -1 - action index
+
+    @property
+    def num_teams(self):
+        return len(self.team_ids)
+
+    @property
+    def team_edges(self):
+        """(E, 2) team -> team edges, one per program pointing at a team."""
+        to_team = self.program_target >= 0
+        return np.stack([self.program_team[to_team], self.program_target[to_team]], axis=1)
+
+    @property
+    def action_edges(self):
+        """(E, 2) team -> action edges, one per program choosing an action."""
+        to_action = self.program_target < 0
+        return np.stack([self.program_team[to_action], -1 - self.program_target[to_action]], axis=1)
+
+    def visible_subgraph(self, roots=None, max_teams=40):
+        """Teams reachable from ``roots`` in breadth-first order, capped at ``max_teams``.
+
+        Defaults to the root teams (no incoming team edges), or to the teams
+        with the most outgoing team edges when every team has a parent, as
+        in a fully cyclic export. Returns the
+        selected team indices and the team edges between them, renumbered
+        to positions in that selection.
+        """
+        edges = self.team_edges
+        if roots is None:
+            has_parent = np.zeros(self.num_teams, dtype=bool)
+            has_parent[edges[:, 1]] = True
+            roots = np.flatnonzero(~has_parent)[:max_teams]
+            if len(roots) == 0 and self.num_teams:
+                out_degree = np.bincount(edges[:, 0], minlength=self.num_teams)
+                roots = np.flatnonzero(out_degree == out_degree.max())[:max_teams]
+        roots = np.asarray(roots, dtype=np.int64)
+
+        by_src = np.argsort(edges[:, 0], kind="stable")
+        offsets = np.searchsorted(edges[by_src, 0], np.arange(self.num_teams + 1))
+        seen = np.zeros(self.num_teams, dtype=bool)
+        seen[roots] = True
+        selected, frontier = [roots], roots
+        total = len(roots)
+        while len(frontier) and total < max_teams:
+            children = edges[by_src[csr_gather(offsets, frontier)], 1]
+            # First occurrence only, keeping breadth-first order
+            children, first = np.unique(children[~seen[children]], return_index=True)
+            frontier = children[np.argsort(first)][:max_teams - total]
+            seen[frontier] = True
+            selected.append(frontier)
+            total += len(frontier)
+
+        teams = np.concatenate(selected)[:max_teams]
+        local = np.full(self.num_teams, -1)
+        local[teams] = np.arange(len(teams))
+        inside = (local[edges[:, 0]] >= 0) & (local[edges[:, 1]] >= 0)
+        return teams, local[edges[inside]]
+
+
+def _open(path):
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open(encoding="utf-8")
+
+
+class _Reader:
+    """Character buffer over a text file that is refilled and compacted on demand."""
+
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.mark = None  # Position that must survive compaction, for rewinding
+        self.eof = False
+
+    def fill(self):
+        chunk = self.fp.read(self.chunk_size)
+        start = self.pos if self.mark is None else min(self.pos, self.mark)
+        self.buffer = self.buffer[start:] + chunk
+        self.pos -= start
+        if self.mark is not None:
+            self.mark -= start
+        self.eof = not chunk
+        return bool(chunk)
+
+    def peek(self):
+        """Next non-whitespace character, or "" at the end of the file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in JSON export, found {self.peek()!r}")
+        self.pos += 1
+
+    def value(self, decoder=json.JSONDecoder()):
+        """Decode one complete JSON value, reading more input until it fits."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number cut off by the chunk boundary ("12." of "12.5") still
+            # decodes, so only trust values followed by a delimiter
+            cut = end == len(self.buffer) or self.buffer[end] not in _DELIMITERS
+            if cut and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def array(self):
+        """Yield the elements of the JSON array starting at the cursor."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+def is_ndjson(path):
+    return Path(path).name.endswith((".ndjson", ".ndjson.gz", ".jsonl", ".jsonl.gz"))
+
+
+def _opens_array(reader):
+    """Whether the object at the cursor is an object-shaped export.
+
+    Its keys are scanned until either an array value (an export) or a
+    record field ("id", "type") shows up. An export leaves the cursor just
+    inside its opening brace, a record is rewound to its start.
+    """
+    reader.mark = reader.pos
+    reader.expect("{")
+    found = False
+    while reader.peek() not in ("}", ""):
+        key = reader.value()
+        reader.expect(":")
+        if key in ("id", "type"):
+            break
+        if reader.peek() == "[":
+            found = True
+            break
+        reader.value()
+        if reader.peek() == ",":
+            reader.pos += 1
+    reader.pos, reader.mark = reader.mark, None
+    if found:
+        reader.expect("{")
+    return found
+
+
+def iter_records(path, chunk_size=CHUNK_SIZE):
+    """Yield ``(kind, record)`` pairs from an export without loading it whole.
+
+    ``kind`` is the name of the enclosing array for object-shaped exports
+    ("teams", "programs", ...) and None otherwise.
+    """
+    with _open(path) as fp:
+        reader = _Reader(fp, chunk_size)
+        first = reader.peek()
+        if first == "[":
+            for record in reader.array():
+                yield None, record
+        elif first == "{" and not is_ndjson(path) and _opens_array(reader):
+            while reader.peek() != "}":
+                key = reader.value()
+                reader.expect(":")
+                if reader.peek() == "[":
+                    for record in reader.array():
+                        yield key, record
+                else:
+                    reader.value()  # Export metadata, not part of the graph
+                if reader.peek() == ",":
+                    reader.pos += 1
+        else:
+            while reader.peek():
+                yield None, reader.value()
+
+
+def _kind(key, record):
+    kind = record.get("type")
+    if kind is None and key:
+        kind = key[:-1] if key.endswith("s") else key
+    return kind
+
+
+def load_agent_graph(path, chunk_size=CHUNK_SIZE):
+    """Build an AgentGraph from a streamed JSON or NDJSON export."""
+    teams, actions = {}, {}
+    action_names = {}
+    program_team, program_target = array("q"), array("q")
+
+    def team_index(team_id):
+        return teams.setdefault(team_id, len(teams))
+
+    def action_index(action_id):
+        return actions.setdefault(action_id, len(actions))
+
+    def add_program(record, team_id):
+        if "action" in record:
+            target = -1 - action_index(record["action"])
+        elif "target" in record:
+            target = team_index(record["target"])
+        else:
+            return
+        program_team.append(team_index(team_id))
+        program_target.append(target)
+
+    for key, record in iter_records(path, chunk_size):
+        kind = _kind(key, record)
+        if kind == "team":
+            team_index(record["id"])
+            for program in record.get("programs", ()):
+                if isinstance(program, dict):
+                    add_program(program, record["id"])
+        elif kind == "program":
+            add_program(record, record["team"])
+        elif kind == "action":
+            action_names[action_index(record["id"])] = record.get("name", str(record["id"]))
+
+    names = [action_names.get(index, str(action_id)) for action_id, index in actions.items()]
+    return AgentGraph(
+        team_ids=list(teams),
+        action_names=names,
+        program_team=np.frombuffer(program_team, dtype=np.int64).copy(),
+        program_target=np.frombuffer(program_target, dtype=np.int64).copy(),
+    )
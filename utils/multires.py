@@ -0,0 +1,172 @@
+"""Render one scene at several qualities from a single construct pass.
+
+The scene runs once at the quality with the highest frame rate and
+resolution. Every other quality gets its own camera and movie writer:
+whenever the main camera draws, the extra cameras draw the same mobjects
+at their own resolution, over their own copy of the static background,
+and each frame the main writer receives is also handed to every extra
+writer (every n-th frame, for qualities at a fraction of the frame
+rate). Construct, updaters and interpolation are paid once; only
+rasterizing and encoding scale with the number of outputs.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils.render import (OUTPUT_DIR, Render, SceneRender, concat_movies, render_config,
+                          resolve_quality, resolve_scenes, scene_class)
+
+# Writer calls that start, end or join partial movies, repeated for every output
+WRITER_CALLS = ("begin_animation", "end_animation", "add_partial_movie_file", "next_section", "finish")
+
+
+def quality_settings(quality):
+    """Frame size and rate of a manim quality, without changing the global config."""
+    from manim.constants import QUALITIES as MANIM_QUALITIES
+
+    settings = MANIM_QUALITIES[resolve_quality(quality)]
+    return settings["pixel_width"], settings["pixel_height"], settings["frame_rate"]
+
+
+class ExtraOutput:
+    """Camera and movie writer of one additional quality."""
+
+    def __init__(self, scene, quality, options, frame_step):
+        from manim import tempconfig
+        from manim.scene.scene_file_writer import SceneFileWriter
+
+        self.quality = quality
+        self.options = options
+        self.frame_step = frame_step
+        self.static_image = None
+        with tempconfig(options):
+            camera_class = type(scene.renderer.camera)
+            self.camera = camera_class()
+            self.writer = SceneFileWriter(scene.renderer, type(scene).__name__)
+
+    def call(self, name, *args, **kwargs):
+        """Run a writer method with this output's frame size and rate in the config."""
+        from manim import tempconfig
+
+        with tempconfig(self.options):
+            return getattr(self.writer, name)(*args, **kwargs)
+
+    def write(self, first_frame, num_frames):
+        """Encode the kept share of ``num_frames`` main frames starting at ``first_frame``."""
+        kept = -(-(first_frame + num_frames) // self.frame_step) - -(-first_frame // self.frame_step)
+        if kept:
+            self.writer.write_frame(self.camera.pixel_array.copy(), num_frames=kept)
+
+
+def attach_outputs(scene, qualities, media_dir=None):
+    """Fan a scene's rendering out to extra cameras and writers, one per quality.
+
+    Call with the scene's own quality in the config, before ``render()``.
+    """
+    from manim import config
+    from manim.utils.iterables import list_update
+
+    renderer = scene.renderer
+    outputs = []
+    for quality in qualities:
+        _, _, rate = quality_settings(quality)
+        if config.frame_rate % rate:
+            raise ValueError(f"{quality} runs at {rate} fps, which does not divide {config.frame_rate} fps")
+        options = render_config(type(scene).__name__, quality, media_dir, disable_caching=True)
+        outputs.append(ExtraOutput(scene, quality, options, int(config.frame_rate // rate)))
+
+    update_frame, add_frame = renderer.update_frame, renderer.add_frame
+    save_static = renderer.save_static_frame_data
+    frames_written = 0
+    drawing_static = False
+
+    def fan_update_frame(scene, mobjects=None, include_submobjects=True, ignore_skipping=True, **kwargs):
+        update_frame(scene, mobjects, include_submobjects, ignore_skipping, **kwargs)
+        if drawing_static or (renderer.skip_animations and not ignore_skipping):
+            return
+        shown = mobjects or list_update(scene.mobjects, scene.foreground_mobjects)
+        for output in outputs:
+            if renderer.static_image is not None and output.static_image is not None:
+                output.camera.set_frame_to_background(output.static_image)
+            else:
+                output.camera.reset()
+            output.camera.capture_mobjects(shown, include_submobjects=include_submobjects, **kwargs)
+
+    def fan_save_static(scene, static_mobjects):
+        nonlocal drawing_static
+        drawing_static = True
+        try:
+            image = save_static(scene, static_mobjects)
+        finally:
+            drawing_static = False
+        for output in outputs:
+            output.static_image = None
+            if image is not None:
+                output.camera.reset()
+                output.camera.capture_mobjects(static_mobjects)
+                output.static_image = output.camera.pixel_array.copy()
+        return image
+
+    def fan_add_frame(frame, num_frames=1):
+        nonlocal frames_written
+        add_frame(frame, num_frames)
+        if renderer.skip_animations:
+            return
+        for output in outputs:
+            output.write(frames_written, num_frames)
+        frames_written += num_frames
+
+    renderer.update_frame = fan_update_frame
+    renderer.save_static_frame_data = fan_save_static
+    renderer.add_frame = fan_add_frame
+
+    writer = renderer.file_writer
+    for name in WRITER_CALLS:
+        def fan_call(*args, _name=name, _main=getattr(writer, name), **kwargs):
+            result = _main(*args, **kwargs)
+            for output in outputs:
+                output.call(_name, *args, **kwargs)
+            return result
+        setattr(writer, name, fan_call)
+    return outputs
+
+
+def main_quality(qualities):
+    """The quality the scene runs at: highest frame rate, then largest frame."""
+    return max(qualities, key=lambda quality: quality_settings(quality)[::-1])
+
+
+def render_multi_resolution(name, qualities, media_dir=None, seed=None):
+    """Render one scene at every quality in one pass, returning ``{quality: SceneRender}``."""
+    start = time.perf_counter()
+    from manim import tempconfig
+
+    qualities = list(dict.fromkeys(resolve_quality(quality) for quality in qualities))
+    main = main_quality(qualities)
+    with tempconfig(render_config(name, main, media_dir, disable_caching=True)):
+        scene = scene_class(name)(random_seed=seed)
+        outputs = attach_outputs(scene, [quality for quality in qualities if quality != main], media_dir)
+        scene.render()
+        movies = {main: Path(scene.renderer.file_writer.movie_file_path)}
+        movies.update((output.quality, Path(output.writer.movie_file_path)) for output in outputs)
+    wall_time = time.perf_counter() - start
+    return {quality: SceneRender(name, movies[quality], wall_time) for quality in qualities}
+
+
+def publish(scenes=None, qualities=("l", "h", "k"), workers=None, seed=None):
+    """Render scenes in parallel, each once for all qualities, and join one video per quality."""
+    start = time.perf_counter()
+    names = resolve_scenes(scenes)
+    qualities = list(dict.fromkeys(resolve_quality(quality) for quality in qualities))
+    workers = workers or min(len(names), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(render_multi_resolution, name, qualities, None, seed) for name in names}
+        renders = {name: future.result() for name, future in futures.items()}
+
+    results = {}
+    for quality in qualities:
+        scene_renders = [renders[name][quality] for name in names]
+        movie = concat_movies([r.movie for r in scene_renders], OUTPUT_DIR / f"animations_{quality}.mp4")
+        results[quality] = Render(movie, scene_renders, time.perf_counter() - start)
+    return results
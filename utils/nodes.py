@@ -0,0 +1,79 @@
+from manim import *
+import numpy as np
+
+# Cubic curves per wedge arc, matching manim's default Arc(num_components=9)
+ARC_CURVES = 8
+# Line from the center, the arc, and the line back to the center
+CURVES_PER_WEDGE = ARC_CURVES + 2
+
+
+def wedge_points(num_wedges, radius):
+    """Bezier points of ``num_wedges`` equal pie wedges around the origin.
+
+    Every wedge is one closed subpath: a line out from the center to the
+    wedge's end angle, the outer arc traced clockwise back to its start
+    angle, and a line back to the center.
+    Returns an array of shape (num_wedges * CURVES_PER_WEDGE * 4, 3).
+    """
+    span = TAU / num_wedges
+    starts = np.arange(num_wedges) * span
+
+    # Arc anchors from the end angle back to the start angle, per wedge
+    theta = starts[:, None] + span * np.linspace(1, 0, ARC_CURVES + 1)[None, :]
+    anchors = radius * np.stack([np.cos(theta), np.sin(theta), np.zeros_like(theta)], axis=-1)
+    # Counter-clockwise tangents, (x, y) -> (-y, x)
+    tangents = np.stack([-anchors[..., 1], anchors[..., 0], np.zeros_like(theta)], axis=-1)
+    factor = 4 / 3 * np.tan(span / ARC_CURVES / 4)
+
+    curves = np.zeros((num_wedges, CURVES_PER_WEDGE, 4, 3))
+    # Arc curves run clockwise, so the handles point against the tangents
+    curves[:, 1:-1, 0] = anchors[:, :-1]
+    curves[:, 1:-1, 1] = anchors[:, :-1] - factor * tangents[:, :-1]
+    curves[:, 1:-1, 2] = anchors[:, 1:] + factor * tangents[:, 1:]
+    curves[:, 1:-1, 3] = anchors[:, 1:]
+
+    # Straight segments from and back to the center, as degenerate cubics
+    thirds = np.linspace(0, 1, 4)[None, :, None]
+    curves[:, 0] = thirds * anchors[:, None, 0]
+    curves[:, -1] = (1 - thirds) * anchors[:, None, -1]
+    return curves.reshape(-1, 3)
+
+
+def flatten_paths(mobject):
+    """Merge a mobject family into one VMobject styled like its first member.
+
+    Only valid when every member shares the same style, e.g. the glyphs
+    of a single-coloured Text.
+    """
+    members = mobject.family_members_with_points()
+    flat = VMobject()
+    flat.set_points(np.concatenate([member.points for member in members]))
+    flat.set_style(**members[0].get_style())
+    return flat
+
+
+class PieNode(VMobject):
+    """Pie-chart node whose wedges all live in a single point array.
+
+    Every wedge is one subpath of ``points`` with its own colour in
+    ``wedge_colors``; opacity and stroke width are shared and animate
+    like any VMobject. Per-wedge colours are drawn by ``TPGCamera``.
+    """
+
+    def __init__(self, colors, radius=0.25, stroke_width=0, **kwargs):
+        self.wedge_colors = np.array([ManimColor(color).to_rgb() for color in colors])
+        self.radius = radius
+        super().__init__(
+            fill_color=colors[0],
+            fill_opacity=1,
+            stroke_color=colors[0],
+            stroke_width=stroke_width,
+            **kwargs
+        )
+
+    def generate_points(self):
+        self.set_points(wedge_points(len(self.wedge_colors), self.radius))
+
+    def get_wedges(self):
+        """Points of each wedge, shaped (wedges, curves, 4, 3)."""
+        return self.points.reshape(len(self.wedge_colors), CURVES_PER_WEDGE, 4, 3)
@@ -0,0 +1,111 @@
+from manim import *
+import numpy as np
+
+from utils.streams import stream
+
+
+def path_polyline(path, samples_per_curve=8):
+    """Points along a VMobject path, sampling every cubic curve in one go.
+
+    Point arrays, e.g. corners of an edge route, are returned unchanged.
+    """
+    if not isinstance(path, VMobject):
+        return np.asarray(path, dtype=float)
+    curves = path.points.reshape(-1, 4, 3)
+    t = np.linspace(0, 1, samples_per_curve + 1)[:-1]
+    weights = np.stack([(1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t ** 2, t ** 3], axis=1)
+    sampled = np.einsum("sk,ckd->csd", weights, curves)
+    return np.vstack([sampled.reshape(-1, 3), curves[-1, 3]])
+
+
+class FlowPaths:
+    """Polylines joined into one table, so a particle's place is one lookup.
+
+    Path ``p`` covers the keys ``[p, p + 1)``, spread over its vertices by
+    arc length, so a particle at fraction ``s`` along path ``p`` sits at
+    key ``p + s`` whichever path it is on.
+    """
+
+    def __init__(self, paths, samples_per_curve=8):
+        polylines = [path_polyline(path, samples_per_curve) for path in paths]
+        keys = []
+        for index, line in enumerate(polylines):
+            lengths = np.concatenate([[0], np.cumsum(np.linalg.norm(np.diff(line, axis=0), axis=1))])
+            keys.append(index + lengths / max(lengths[-1], 1e-9))
+        self.vertices = np.vstack(polylines)
+        self.keys = np.concatenate(keys)
+        self.count = len(polylines)
+
+    def __len__(self):
+        return self.count
+
+    def positions(self, path, progress):
+        """Points at fraction ``progress`` along each particle's ``path``."""
+        key = path + np.clip(progress, 0, 1 - 1e-9)
+        segment = np.clip(np.searchsorted(self.keys, key, side="right") - 1, 0, len(self.keys) - 2)
+        start, end = self.keys[segment], self.keys[segment + 1]
+        alpha = ((key - start) / np.maximum(end - start, 1e-12))[:, None]
+        return self.vertices[segment] * (1 - alpha) + self.vertices[segment + 1] * alpha
+
+
+class ParticleSystem(PMobject):
+    """Thousands of inputs streaming along graph paths as one point cloud.
+
+    Each particle is a row of NumPy arrays: which path it follows, how far
+    along it is and how fast it moves (in paths per second), plus its
+    colour. ``advance`` moves every particle in one vectorized step, and
+    the Cairo camera draws the whole cloud by writing pixels directly, so
+    10k particles cost about as much as one mobject. Particles start
+    staggered behind their path's start and loop back once they reach the
+    end, making a steady stream, until ``drain`` lets the paths empty out.
+    """
+
+    def __init__(self, paths, count=1000, colors=YELLOW, speed=0.5, spread=1.0, stroke_width=4,
+                 rng=None, **kwargs):
+        rng = rng or stream("particles")
+        self.paths = paths if isinstance(paths, FlowPaths) else FlowPaths(paths)
+        self.path = rng.integers(0, len(self.paths), count)
+        # Negative progress waits off the path, so particles enter one by one
+        self.progress = -rng.random(count) * spread
+        self.speed = speed * rng.uniform(0.8, 1.2, count)
+        colors = colors if isinstance(colors, (list, tuple)) else [colors]
+        palette = np.array([ManimColor(color).to_rgba() for color in colors])
+        self.colors = palette[self.path % len(palette)]
+        self.looping = True
+        super().__init__(stroke_width=stroke_width, **kwargs)
+        self.update_points()
+
+    def update_points(self):
+        """Rebuild the point cloud from the particles currently on a path."""
+        shown = (self.progress >= 0) & (self.progress < 1)
+        self.points = self.paths.positions(self.path[shown], self.progress[shown])
+        self.rgbas = self.colors[shown].copy()
+        return self
+
+    def advance(self, dt):
+        self.progress += self.speed * dt
+        if self.looping:
+            # Particles past the end go round again, however many laps one step covers
+            past = self.progress >= 1
+            self.progress[past] -= np.floor(self.progress[past])
+        return self.update_points()
+
+    def drain(self):
+        """Let particles on a path run to its end, and no new ones enter."""
+        self.looping = False
+        self.progress[self.progress < 0] = np.inf
+        return self
+
+    @property
+    def drain_time(self):
+        """Seconds until every particle has left its path after ``drain``."""
+        return 1 / self.speed.min()
+
+    def start_flow(self):
+        """Advance with the scene clock until ``stop_flow``."""
+        self.add_updater(lambda particles, dt: particles.advance(dt))
+        return self
+
+    def stop_flow(self):
+        self.clear_updaters()
+        return self
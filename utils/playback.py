@@ -0,0 +1,191 @@
+from manim import *
+import numpy as np
+
+
+class CartPolePlayback(Animation):
+    """Play a precomputed cart-pole trajectory on a cart and its upright pole.
+
+    Cart positions and pole points for every frame are computed in one
+    NumPy pass when the animation begins, so each frame only copies them
+    in. The pole pivots around the top of the cart, and the trajectory's
+    first state is taken to match where the mobjects currently are.
+    """
+
+    def __init__(self, cart, pole, trajectory, x_scale=1.0, **kwargs):
+        self.cart = cart
+        self.pole = pole
+        self.trajectory = trajectory
+        self.x_scale = x_scale
+        kwargs.setdefault("run_time", trajectory.duration)
+        kwargs.setdefault("rate_func", linear)
+        super().__init__(VGroup(cart, pole), **kwargs)
+
+    def begin(self):
+        frames = max(int(round(self.run_time * config.frame_rate)), 1) + 1
+        x, theta = self.trajectory.sample(np.linspace(0, self.trajectory.duration, frames))
+
+        # Cart centers per frame, relative to where the cart is now
+        shifts = np.outer(self.x_scale * (x - x[0]), RIGHT)
+        self.cart_centers = self.cart.get_center() + shifts
+
+        # Pole points relative to the pivot, turned back upright, then rotated per frame
+        pivot = self.cart.get_top()
+        upright = rotate_points(self.pole.points - pivot, theta[0])
+        cos, sin = np.cos(theta)[:, None], np.sin(theta)[:, None]
+        self.pole_points = np.empty((frames, *upright.shape))
+        self.pole_points[..., 0] = upright[:, 0] * cos + upright[:, 1] * sin
+        self.pole_points[..., 1] = upright[:, 1] * cos - upright[:, 0] * sin
+        self.pole_points[..., 2] = upright[:, 2]
+        self.pole_points += (pivot + shifts)[:, None]
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        frame = int(round(alpha * (len(self.cart_centers) - 1)))
+        self.cart.move_to(self.cart_centers[frame])
+        self.pole.set_points(self.pole_points[frame])
+
+
+def rotate_points(points, angle):
+    """Rotate points counterclockwise by ``angle`` about the origin, in the xy-plane."""
+    cos, sin = np.cos(angle), np.sin(angle)
+    rotated = points.copy()
+    rotated[:, 0] = points[:, 0] * cos - points[:, 1] * sin
+    rotated[:, 1] = points[:, 0] * sin + points[:, 1] * cos
+    return rotated
+
+
+def bid_heights(bids, bid_range, min_height=0.1, max_height=1.5):
+    """Bar heights of bids on one scale, where the lowest bid of the range sits a quarter of the way up."""
+    bids = np.asarray(bids, dtype=float)
+    low, high = bid_range
+    if high <= low:
+        return np.full_like(bids, max_height)
+    low -= 0.25 * (high - low)
+    return min_height + (max_height - min_height) * (bids - low) / (high - low)
+
+
+class BidPlayback(Animation):
+    """Play a sequence of program bids on a row of bars, one input state after another.
+
+    ``bids`` is shaped (inputs, programs), as returned by
+    ``utils.programs.execute``, with one bar per program. Bars grow from
+    their bottom edge, on one height scale for the whole sequence, and the
+    highest bid of each input is drawn fully opaque. Pass ``bid_range`` to
+    share one scale between several playbacks of the same sequence. If program ``arrows``
+    are given, the winner's arrow takes ``winner_color``. Heights for every
+    input are computed when the animation begins, so a frame only picks a
+    row, and long sequences skip inputs to fit the run time.
+    """
+
+    def __init__(self, bars, bids, arrows=None, bid_range=None, min_height=0.1, max_height=1.5,
+                 winner_color=YELLOW, loser_opacity=0.4, **kwargs):
+        self.bars = list(bars)
+        self.bids = np.atleast_2d(np.asarray(bids, dtype=float))
+        self.arrows = list(arrows) if arrows is not None else None
+        self.bid_range = bid_range or (self.bids.min(), self.bids.max())
+        self.min_height = min_height
+        self.max_height = max_height
+        self.winner_color = winner_color
+        self.loser_opacity = loser_opacity
+        super().__init__(VGroup(*self.bars, *(self.arrows or [])), **kwargs)
+
+    def begin(self):
+        heights = bid_heights(self.bids, self.bid_range, self.min_height, self.max_height)
+        # Row 0 holds the current heights, so the first input grows out of them
+        current = [bar.height for bar in self.bars]
+        self.heights = np.vstack([current, heights])
+        self.winners = self.bids.argmax(axis=1)
+
+        # Bar points with unit height above their bottom edge
+        self.bottoms = [bar.get_bottom() for bar in self.bars]
+        self.unit_points = []
+        for bar, bottom, height in zip(self.bars, self.bottoms, current):
+            points = bar.points - bottom
+            points[:, 1] /= height
+            self.unit_points.append(points)
+        self.opacity = [bar.get_fill_opacity() for bar in self.bars]
+        self.arrow_colors = [arrow.get_color() for arrow in self.arrows or []]
+        self.shown_winner = None
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        position = alpha * (len(self.heights) - 1)
+        row = min(int(position), len(self.heights) - 2)
+        blend = position - row
+        heights = self.heights[row] * (1 - blend) + self.heights[row + 1] * blend
+        for bar, bottom, points, height in zip(self.bars, self.bottoms, self.unit_points, heights):
+            bar.set_points(bottom + points * (1, height, 1))
+
+        # Winners switch once the bars have reached their input
+        winner = self.winners[int(round(position)) - 1] if position >= 0.5 else None
+        if winner != self.shown_winner:
+            self.show_winner(winner)
+
+    def show_winner(self, winner):
+        self.shown_winner = winner
+        for index, bar in enumerate(self.bars):
+            opacity = self.opacity[index] if winner in (None, index) else self.loser_opacity
+            bar.set_fill(opacity=opacity)
+        for index, arrow in enumerate(self.arrows or []):
+            arrow.set_color(self.winner_color if index == winner else self.arrow_colors[index])
+
+
+class TraceReplay(Animation):
+    """Light up graph nodes and edges by how often a recorded trace visited them.
+
+    ``node_rates`` and ``edge_rates`` hold one row per slice of the trace,
+    as returned by ``utils.replay.replay_rates``, and the animation steps
+    through the rows evenly. Each mobject's stroke runs from its own colour
+    at rate 0 to ``color`` at rate 1, and nodes also fill in. Colours are
+    only reset when the row changes, and restored once the replay ends.
+    """
+
+    def __init__(self, nodes, edges, node_rates, edge_rates, color=YELLOW, node_fill=0.5, **kwargs):
+        self.nodes = list(nodes)
+        self.edges = list(edges)
+        self.node_rates = np.asarray(node_rates)
+        self.edge_rates = np.asarray(edge_rates)
+        self.color = color
+        self.node_fill = node_fill
+        kwargs.setdefault("rate_func", linear)
+        super().__init__(VGroup(*self.nodes, *self.edges), **kwargs)
+
+    def begin(self):
+        self.targets = self.nodes + self.edges
+        self.rates = np.hstack([self.node_rates, self.edge_rates])
+        # Stroke colour of every mobject in every row, blended in one go
+        self.base = np.array([mobject.get_stroke_color().to_rgb() for mobject in self.targets])
+        lit = np.array(ManimColor(self.color).to_rgb())
+        self.colors = self.base + (lit - self.base) * self.rates[..., None]
+        self.fills = [node.get_fill_opacity() for node in self.nodes]
+        self.row = None
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        row = min(int(alpha * len(self.rates)), len(self.rates) - 1)
+        if row != self.row:
+            self.show_row(row)
+
+    def show_row(self, row):
+        self.row = row
+        for index, mobject in enumerate(self.targets):
+            color = ManimColor.from_rgb(self.colors[row, index])
+            if index < len(self.nodes):
+                mobject.set_stroke(color=color)
+            else:
+                # Edge arrows take the colour on their tips too
+                mobject.set_color(color)
+        for node, rate, fill in zip(self.nodes, self.rates[row], self.fills):
+            node.set_fill(self.color, opacity=max(fill, self.node_fill * rate))
+
+    def clean_up_from_scene(self, scene):
+        # Leave the graph as it was before the replay
+        super().clean_up_from_scene(scene)
+        for index, mobject in enumerate(self.targets):
+            color = ManimColor.from_rgb(self.base[index])
+            if index < len(self.nodes):
+                mobject.set_stroke(color=color)
+            else:
+                mobject.set_color(color)
+        for node, fill in zip(self.nodes, self.fills):
+            node.set_fill(opacity=fill)
@@ -0,0 +1,229 @@
+from dataclasses import dataclass
+
+from manim import *
+import numpy as np
+
+from utils.arrays import line_curves
+from utils.evolution import MAX_STEPS
+from utils.streams import stream
+
+# Cubic curves in a team circle, matching manim's Circle
+CIRCLE_CURVES = 8
+# Shaft plus the three sides of the tip
+ARROW_CURVES = 4
+ARROW_LENGTH = 1.2   # Arrow length past the circle, in team radii
+TIP_WIDTH = 0.25     # Half width of an arrow tip, in team radii
+TIP_LENGTH = 0.35
+
+# Team colours from failing straight away to balancing for a whole episode
+FITNESS_COLORS = (RED, YELLOW, GREEN)
+
+
+@dataclass
+class PopulationState:
+    """Every team of a population as rows of NumPy arrays."""
+    positions: np.ndarray  # (teams, 3) circle centers
+    colors: np.ndarray     # (teams, 3) circle RGB
+    angles: np.ndarray     # (teams, arrows) program arrow directions, radians
+    arrows: np.ndarray     # (teams, arrows) 1 where the team has that program, fades through (0, 1)
+    opacity: np.ndarray    # (teams,)
+    scale: np.ndarray      # (teams,) size relative to the grid's team radius
+
+    def __len__(self):
+        return len(self.positions)
+
+    def copy(self):
+        return PopulationState(*(np.array(value) for value in vars(self).values()))
+
+
+def interpolate_states(start, end, alpha):
+    """Blend two states row by row, turning arrows the short way round."""
+    turn = (end.angles - start.angles + PI) % TAU - PI
+    return PopulationState(
+        positions=start.positions + (end.positions - start.positions) * alpha,
+        colors=start.colors + (end.colors - start.colors) * alpha,
+        angles=start.angles + turn * alpha,
+        arrows=start.arrows + (end.arrows - start.arrows) * alpha,
+        opacity=start.opacity + (end.opacity - start.opacity) * alpha,
+        scale=start.scale + (end.scale - start.scale) * alpha,
+    )
+
+
+def _unit_circle():
+    theta = np.linspace(0, TAU, CIRCLE_CURVES + 1)
+    anchors = np.stack([np.cos(theta), np.sin(theta), np.zeros_like(theta)], axis=-1)
+    tangents = np.stack([-anchors[:, 1], anchors[:, 0], np.zeros_like(theta)], axis=-1)
+    factor = 4 / 3 * np.tan(TAU / CIRCLE_CURVES / 4)
+    return np.stack([
+        anchors[:-1],
+        anchors[:-1] + factor * tangents[:-1],
+        anchors[1:] - factor * tangents[1:],
+        anchors[1:],
+    ], axis=1)
+
+
+UNIT_CIRCLE = _unit_circle()
+
+
+def population_points(state, radius):
+    """Bezier points of every team, one fixed-size block of curves per team."""
+    size = radius * state.scale
+    centers = state.positions
+    circles = centers[:, None, None] + size[:, None, None, None] * UNIT_CIRCLE
+
+    direction = np.stack([np.cos(state.angles), np.sin(state.angles), np.zeros_like(state.angles)], axis=-1)
+    normal = np.stack([-direction[..., 1], direction[..., 0], direction[..., 2]], axis=-1)
+    size = size[:, None, None]
+    start = centers[:, None] + direction * size
+    end = start + direction * size * ARROW_LENGTH
+    base = end - direction * size * TIP_LENGTH
+    left, right = base + normal * size * TIP_WIDTH, base - normal * size * TIP_WIDTH
+    arrows = np.stack([
+        line_curves(start, base), line_curves(left, end), line_curves(end, right), line_curves(right, left),
+    ], axis=2)
+
+    teams = len(state)
+    return np.concatenate([
+        circles.reshape(teams, -1, 3),
+        arrows.reshape(teams, -1, 3),
+    ], axis=1).reshape(-1, 3)
+
+
+def grid_layout(count, width, height, center=ORIGIN):
+    """Centers of ``count`` cells filling a width x height box, and the cell size."""
+    columns = max(int(np.ceil(np.sqrt(count * width / height))), 1)
+    rows = int(np.ceil(count / columns))
+    cell = min(width / columns, height / rows)
+    index = np.arange(count)
+    positions = np.zeros((count, 3))
+    positions[:, 0] = (index % columns - (columns - 1) / 2) * cell
+    positions[:, 1] = ((rows - 1) / 2 - index // columns) * cell
+    return positions + center, cell
+
+
+class PopulationGrid(VMobject):
+    """A whole population of teams held in one ``PopulationState``.
+
+    Points are rebuilt from the state in one vectorized call, and
+    ``TPGCamera`` strokes the circles in their own colours. Move teams by
+    changing their positions in the state; point-wise transforms of the
+    mobject are lost on the next ``set_state``.
+    """
+
+    def __init__(self, state, radius, arrow_color=GREEN, stroke_width=2, **kwargs):
+        self.state = state
+        self.radius = radius
+        self.arrow_rgb = np.array(ManimColor(arrow_color).to_rgb())
+        super().__init__(stroke_color=arrow_color, stroke_width=stroke_width, fill_opacity=1, **kwargs)
+
+    @classmethod
+    def random(cls, count, width=12, height=6, center=ORIGIN, arrows=2, color=BLUE, rng=None, **kwargs):
+        """Teams on a grid, each with a rightward program and maybe a downward one."""
+        rng = rng or stream("population")
+        positions, cell = grid_layout(count, width, height, center)
+        has_arrow = np.ones((count, arrows))
+        has_arrow[:, 1:] = rng.random((count, arrows - 1)) > 0.5
+        state = PopulationState(
+            positions=positions,
+            colors=np.tile(ManimColor(color).to_rgb(), (count, 1)),
+            angles=np.tile(-np.arange(arrows) * PI / 2, (count, 1)),
+            arrows=has_arrow,
+            opacity=np.ones(count),
+            scale=np.ones(count),
+        )
+        # Circle plus the longest arrow must fit in a cell
+        return cls(state, radius=0.45 * cell / (1 + ARROW_LENGTH), **kwargs)
+
+    @classmethod
+    def from_log(cls, log, width=12, height=6, center=ORIGIN, arrows=2, **kwargs):
+        """The first population of an evolution log, laid out on a grid."""
+        positions, cell = grid_layout(log.fitness.shape[1], width, height, center)
+        return cls(logged_state(log, 0, positions, arrows), radius=0.45 * cell / (1 + ARROW_LENGTH), **kwargs)
+
+    @property
+    def curves_per_team(self):
+        return CIRCLE_CURVES + self.state.angles.shape[1] * ARROW_CURVES
+
+    def generate_points(self):
+        self.set_points(population_points(self.state, self.radius))
+
+    def set_state(self, state):
+        self.state = state
+        self.generate_points()
+        return self
+
+    def get_teams(self):
+        """Points of every team, shaped (teams, curves, 4, 3)."""
+        return self.points.reshape(len(self.state), self.curves_per_team, 4, 3)
+
+
+class PopulationTransition(Animation):
+    """Move a whole population from its current state to ``target`` in one animation.
+
+    Rows flagged in ``replaced`` are culled during the first half, shrinking
+    away, and their successors grow from ``origins`` (e.g. the midpoint of
+    their parents) into place during the second half. Every other row,
+    including mutations, blends smoothly. Each frame is a few array
+    operations over all teams, however large the population.
+    """
+
+    def __init__(self, grid, target, replaced=None, origins=None, **kwargs):
+        self.target = target
+        self.replaced = np.zeros(len(target), dtype=bool) if replaced is None else np.asarray(replaced)
+        self.origins = target.positions if origins is None else np.asarray(origins)
+        super().__init__(grid, **kwargs)
+
+    def begin(self):
+        self.start = self.mobject.state.copy()
+        # Culled teams shrink away in place, successors grow from their origin
+        self.culled = self.start.copy()
+        self.culled.scale[self.replaced] = 0
+        self.culled.opacity[self.replaced] = 0
+        self.born = self.target.copy()
+        self.born.positions[self.replaced] = self.origins[self.replaced]
+        self.born.scale[self.replaced] = 0
+        self.born.opacity[self.replaced] = 0
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        state = interpolate_states(self.start, self.target, alpha)
+        if self.replaced.any():
+            if alpha < 0.5:
+                phase = interpolate_states(self.start, self.culled, 2 * alpha)
+            else:
+                phase = interpolate_states(self.born, self.target, 2 * alpha - 1)
+            rows = self.replaced
+            for name, value in vars(phase).items():
+                getattr(state, name)[rows] = value[rows]
+        self.mobject.set_state(state)
+
+
+def fitness_colors(fitness, best=MAX_STEPS, stops=FITNESS_COLORS):
+    """RGB per team, running through ``stops`` from no fitness up to ``best``."""
+    stops = np.array([ManimColor(color).to_rgb() for color in stops])
+    position = np.clip(np.asarray(fitness) / best, 0, 1) * (len(stops) - 1)
+    low = np.minimum(position.astype(int), len(stops) - 2)
+    alpha = (position - low)[:, None]
+    return stops[low] * (1 - alpha) + stops[low + 1] * alpha
+
+
+def logged_state(log, generation, positions, arrows=2):
+    """Population ``generation`` of an evolution log, coloured by fitness."""
+    count = len(positions)
+    return PopulationState(
+        positions=np.array(positions, dtype=float),
+        colors=fitness_colors(log.fitness[generation]),
+        angles=log.angles[generation, :, :arrows].astype(float),
+        arrows=log.active[generation, :, :arrows].astype(float),
+        opacity=np.ones(count),
+        scale=np.ones(count),
+    )
+
+
+def logged_generation(log, generation, positions, arrows=2):
+    """Target state, replaced rows and child origins for replaying one logged generation."""
+    target = logged_state(log, generation + 1, positions, arrows)
+    replaced = ~log.survived[generation]
+    origins = target.positions.copy()
+    origins[replaced] = target.positions[log.parents[generation, replaced]].mean(axis=1)
+    return target, replaced, origins
@@ -0,0 +1,124 @@
+"""Register-machine TPG programs, executed for many programs and inputs at once.
+
+A program is a list of instructions ``R[target] = R[target] <op> source``,
+where the source is another register or one input feature, and its bid
+is register 0 once every instruction has run. Programs of one set are
+padded to the same length with no-op instructions and stored as arrays,
+so ``execute`` loops over instruction positions only: each position runs
+for every program and every input state in a handful of array operations.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from utils.streams import stream
+
+REGISTERS = 8
+
+# Operation codes, as in linear genetic programming
+NOOP, ADD, SUB, MUL, DIV, COS, LOG, NEGATE = range(8)
+OPERATIONS = ("noop", "add", "sub", "mul", "div", "cos", "log", "negate")
+
+
+@dataclass
+class Programs:
+    """Instructions of several programs, shaped (programs, instructions)."""
+    operations: np.ndarray  # int8 operation codes, NOOP as padding
+    targets: np.ndarray     # register written by each instruction
+    sources: np.ndarray     # register or input feature read by each instruction
+    from_input: np.ndarray  # bool, whether the source is an input feature
+    actions: np.ndarray     # (programs,) action index suggested by each program
+
+    def __len__(self):
+        return len(self.operations)
+
+    @classmethod
+    def random(cls, count, inputs, length=12, actions=None, rng=None, registers=REGISTERS):
+        """``count`` random programs of up to ``length`` instructions over ``inputs`` features."""
+        rng = rng or stream("programs")
+        shape = (count, length)
+        operations = rng.integers(ADD, len(OPERATIONS), shape).astype(np.int8)
+        # Programs get different lengths, the tail padded with no-ops
+        lengths = rng.integers(1, length + 1, count)
+        operations[np.arange(length) >= lengths[:, None]] = NOOP
+        from_input = rng.random(shape) < 0.5
+        targets = rng.integers(0, registers, shape)
+        # Start from an input rather than the zeroed registers, and end on the bid register
+        operations[:, 0], from_input[:, 0], targets[:, 0] = ADD, True, 0
+        targets[np.arange(count), lengths - 1] = 0
+        return cls(
+            operations=operations,
+            targets=targets,
+            sources=np.where(from_input, rng.integers(0, inputs, shape), rng.integers(0, registers, shape)),
+            from_input=from_input,
+            actions=np.arange(count) if actions is None else np.asarray(actions),
+        )
+
+    @classmethod
+    def compile(cls, programs, actions=None):
+        """Programs from readable instructions like ``("add", 0, "x2")``.
+
+        Each instruction names an operation, the target register and a
+        source, ``"xN"`` for input feature N or ``"rN"`` for register N.
+        """
+        length = max(len(program) for program in programs)
+        shape = (len(programs), length)
+        operations = np.full(shape, NOOP, dtype=np.int8)
+        targets, sources = np.zeros(shape, dtype=int), np.zeros(shape, dtype=int)
+        from_input = np.zeros(shape, dtype=bool)
+        for row, program in enumerate(programs):
+            for column, (operation, target, source) in enumerate(program):
+                if source[0] not in "xr":
+                    raise ValueError(f"Source must be xN or rN, got {source!r}")
+                operations[row, column] = OPERATIONS.index(operation)
+                targets[row, column] = target
+                sources[row, column] = int(source[1:])
+                from_input[row, column] = source[0] == "x"
+        return cls(operations, targets, sources, from_input,
+                   np.arange(len(programs)) if actions is None else np.asarray(actions))
+
+
+def execute(programs, states, registers=REGISTERS):
+    """Bid of every program on every input state, shaped (states, programs).
+
+    Registers start at zero for each state. Division and logarithm are
+    protected, leaving the target unchanged where they are undefined, and
+    ``negate`` flips the target's sign when it is below the source.
+    """
+    states = np.atleast_2d(np.asarray(states, dtype=np.float64))
+    count = len(programs)
+    memory = np.zeros((count, registers, len(states)))
+    rows = np.arange(count)
+
+    with np.errstate(all="ignore"):
+        for position in range(programs.operations.shape[1]):
+            operation = programs.operations[:, position]
+            if not operation.any():
+                break
+            target = programs.targets[:, position]
+            source = programs.sources[:, position]
+            value = memory[rows, target]
+            operand = np.where(
+                programs.from_input[:, position, None],
+                states.T[source % states.shape[1]],
+                memory[rows, source % registers],
+            )
+
+            operation = operation[:, None]
+            result = np.select(
+                [operation == ADD, operation == SUB, operation == MUL, operation == DIV,
+                 operation == COS, operation == LOG, operation == NEGATE],
+                [value + operand, value - operand, value * operand,
+                 np.where(operand != 0, value / operand, value),
+                 np.cos(operand),
+                 np.where(operand != 0, np.log(np.abs(operand)), value),
+                 np.where(value < operand, -value, value)],
+                default=value,
+            )
+            memory[rows, target] = np.nan_to_num(result, posinf=1e12, neginf=-1e12)
+    return memory[:, 0].T
+
+
+def winners(bids):
+    """Index of the highest bidding program for each input state."""
+    return np.asarray(bids).argmax(axis=-1)
@@ -0,0 +1,187 @@
+import importlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+OUTPUT_DIR = ROOT / "output"
+
+# Scene classes in story order, mapped to the module that defines them
+SCENES = {
+    "ChallengeScene": "scenes.challenge",
+    "TPGScene": "scenes.tpg",
+    "EvolutionScene": "scenes.evolution",
+    "HierarchyScene": "scenes.hierarchy",
+    "ResultScene": "scenes.result",
+}
+
+# Short manim CLI flags (-ql, -qh, ...) and their config names
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+@dataclass
+class SceneRender:
+    """A single rendered scene and how long it took."""
+    name: str
+    movie: Path
+    wall_time: float
+    cached: bool = False
+    segments: int = 1  # Worker processes the scene was split across
+
+
+@dataclass
+class Render:
+    """The joined video plus the per-scene renders it was built from."""
+    movie: Path
+    scenes: list[SceneRender] = field(default_factory=list)
+    wall_time: float = 0.0
+
+
+def resolve_quality(quality):
+    """Accept either a short flag ("h") or a manim quality name ("high_quality")."""
+    if quality in QUALITIES:
+        return QUALITIES[quality]
+    if quality in QUALITIES.values():
+        return quality
+    raise ValueError(f"Unknown quality {quality!r}, expected one of {list(QUALITIES)}")
+
+
+def resolve_scenes(scenes=None):
+    """Return the requested scene names in story order."""
+    if scenes is None:
+        return list(SCENES)
+    unknown = [name for name in scenes if name not in SCENES]
+    if unknown:
+        raise ValueError(f"Unknown scene(s) {unknown}, expected some of {list(SCENES)}")
+    return [name for name in SCENES if name in scenes]
+
+
+def scene_file(name):
+    """Path of the source file defining a scene class."""
+    return ROOT / (SCENES[name].replace(".", os.sep) + ".py")
+
+
+def scene_class(name):
+    """Import and return a scene class by name."""
+    module = importlib.import_module(SCENES[name])
+    return getattr(module, name)
+
+
+def render_config(name, quality, media_dir=None, **overrides):
+    """Manim config for rendering one scene into the project output directory."""
+    options = {
+        "quality": resolve_quality(quality),
+        "media_dir": str(media_dir or OUTPUT_DIR / "media"),
+        "input_file": str(scene_file(name)),
+        "progress_bar": "none",
+        "verbosity": "WARNING",
+    }
+    options.update(overrides)
+    return options
+
+
+def render_scene(name, quality="h", media_dir=None, seed=None, trace=False, draft=False):
+    """Render one scene in the current process and return its movie file.
+
+    This is the unit of work handed to pool workers, so it imports manim
+    lazily and only reads plain arguments. With ``trace`` on, a Chrome
+    trace of every play() is written to output/traces/. ``draft`` renders
+    with the stand-in geometry of ``utils.draft``.
+    """
+    start = time.perf_counter()
+    from manim import tempconfig
+    from utils.draft import set_draft
+
+    set_draft(draft)
+    with tempconfig(render_config(name, quality, media_dir)):
+        scene = scene_class(name)(random_seed=seed)
+        if trace:
+            from utils.tracing import render_traced
+            render_traced(scene)
+        else:
+            scene.render()
+        movie = Path(scene.renderer.file_writer.movie_file_path)
+    return SceneRender(name, movie, time.perf_counter() - start)
+
+
+def concat_movies(movies, output):
+    """Join movie files end to end without re-encoding."""
+    import av
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    file_list = output.with_suffix(".txt")
+    with file_list.open("w", encoding="utf-8") as fp:
+        for movie in movies:
+            fp.write(f"file 'file:{Path(movie).as_posix()}'\n")
+
+    with av.open(str(file_list), options={"safe": "0"}, format="concat") as source:
+        source_stream = source.streams.video[0]
+        with av.open(str(output), mode="w") as target:
+            target_stream = target.add_stream(template=source_stream)
+            for packet in source.demux(source_stream):
+                # Skip the flushing packets that demux() yields at the end
+                if packet.dts is None:
+                    continue
+                # Timestamps restart in every input file, let libav recompute them
+                packet.dts = None
+                packet.stream = target_stream
+                target.mux(packet)
+    file_list.unlink()
+    return output
+
+
+def render(scenes=None, quality="h", workers=None, output=None, seed=None, cache=True, trace=False,
+           draft=False, segments=None):
+    """Render scenes in parallel and join them into one video in story order.
+
+    Each scene runs in its own worker process, so the total wall time is
+    close to that of the slowest scene rather than the sum of all of them.
+    With ``cache`` on, scenes whose sources and parameters are unchanged
+    are served from the render store without starting a worker. Traced
+    renders always run, since a cached movie has nothing to trace.
+    Draft renders are cached and named separately from full ones.
+
+    With ``segments``, scenes render one after another instead, each split
+    across that many workers by ``utils.segments``. Their random numbers
+    are reseeded between plays, so they bypass the cache too.
+    """
+    from utils.cache import cached_render_scene, lookup
+
+    start = time.perf_counter()
+    names = resolve_scenes(scenes)
+    suffix = "_draft" if draft else ""
+    output = Path(output or OUTPUT_DIR / f"animations_{resolve_quality(quality)}{suffix}.mp4")
+
+    renders = {}
+    if trace or segments:
+        cache = False
+    if cache:
+        for name in names:
+            hit = lookup(name, quality, seed, draft)
+            if hit is not None:
+                renders[name] = hit
+    pending = [name for name in names if name not in renders]
+
+    if pending and segments:
+        from utils.segments import render_segmented
+        renders.update((name, render_segmented(name, quality, segments, seed, draft)) for name in pending)
+    elif pending:
+        task = cached_render_scene if cache else render_scene
+        workers = workers or min(len(pending), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(task, name, quality, None, seed, trace, draft) for name in pending}
+            renders.update((name, future.result()) for name, future in futures.items())
+
+    renders = [renders[name] for name in names]
+
+    movie = concat_movies([r.movie for r in renders], output)
+    return Render(movie, renders, time.perf_counter() - start)
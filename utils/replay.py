@@ -0,0 +1,139 @@
+"""Recorded TPG execution traces, stored as fixed-size binary records.
+
+A trace holds one record per timestep: the chain of teams visited from
+the root, padded with -1, and the action chosen at the end of it. Files
+start with a small header and are read through ``np.memmap``, so replay
+only touches the pages of the chunk in hand and memory stays constant
+however many steps were recorded.
+
+Team ``t`` is node ``t`` of a replay and action ``a`` is node
+``teams + a``, so the last team of each chain links to its action.
+"""
+import os
+
+import numpy as np
+
+from utils.cartpole import DT, THETA, balancing_policy, simulate
+
+MAGIC = b"TPGTRACE"
+VERSION = 1
+HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("depth", "<u4"), ("teams", "<u4")])
+CHUNK_STEPS = 1 << 16
+
+
+def record_dtype(depth):
+    return np.dtype([("teams", "<i4", (depth,)), ("action", "<i4")])
+
+
+class TraceWriter:
+    """Append steps to a trace file, written next to ``path`` until closed."""
+
+    def __init__(self, path, depth, teams):
+        self.path = path
+        self.dtype = record_dtype(depth)
+        self.depth = depth
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.partial = path.with_suffix(f".{os.getpid()}.part")
+        self.file = self.partial.open("wb")
+        self.file.write(np.array((MAGIC, VERSION, depth, teams), dtype=HEADER).tobytes())
+
+    def append(self, chains, actions):
+        """Write a batch of steps: chains shaped (steps, <= depth) padded with -1."""
+        chains = np.asarray(chains)
+        records = np.empty(len(chains), dtype=self.dtype)
+        records["teams"] = -1
+        records["teams"][:, :chains.shape[1]] = chains
+        records["action"] = actions
+        self.file.write(records.tobytes())
+
+    def close(self):
+        self.file.close()
+        self.partial.replace(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+        else:
+            self.file.close()
+            self.partial.unlink()
+
+
+def read_trace(path):
+    """The header and a read-only memory map of a trace's records."""
+    header = np.fromfile(path, dtype=HEADER, count=1)[0]
+    if header["magic"] != MAGIC or header["version"] != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} TPG trace")
+    records = np.memmap(path, dtype=record_dtype(int(header["depth"])), mode="r", offset=HEADER.itemsize)
+    return header, records
+
+
+def replay_rates(path, bins, node_map, edges, chunk_steps=CHUNK_STEPS):
+    """Fraction of steps visiting each shown node and edge, in ``bins`` equal slices.
+
+    ``node_map`` sends every trace node (teams, then actions) to a shown
+    node, or -1 to leave it out, and ``edges`` lists shown (from, to)
+    pairs. Traces shorter than ``bins`` get one bin per step. Returns
+    ``(node_rates, edge_rates)`` shaped (bins, nodes) and (bins, edges).
+    """
+    header, records = read_trace(path)
+    teams, steps = int(header["teams"]), len(records)
+    bins = max(min(bins, steps), 1)
+    node_map = np.asarray(node_map)
+    shown = int(node_map.max()) + 1
+    edge_index = np.full((shown, shown), -1)
+    for index, (start, end) in enumerate(edges):
+        edge_index[start, end] = index
+
+    node_counts = np.zeros(bins * shown)
+    edge_counts = np.zeros(bins * len(edges))
+    for first in range(0, steps, chunk_steps):
+        chunk = records[first:first + chunk_steps]
+        # Each step's bin, and its chain with the action appended after the last team
+        step_bins = (np.arange(first, first + len(chunk)) * bins) // steps
+        chains = np.asarray(chunk["teams"])
+        length = (chains >= 0).sum(axis=1)
+        nodes = np.full((len(chunk), chains.shape[1] + 1), -1)
+        nodes[:, :-1] = chains
+        nodes[np.arange(len(chunk)), length] = teams + chunk["action"]
+        nodes = np.where(nodes >= 0, node_map[np.maximum(nodes, 0)], -1)
+
+        visited = nodes >= 0
+        node_counts += np.bincount((step_bins[:, None] * shown + nodes)[visited], minlength=len(node_counts))
+        start, end = nodes[:, :-1], nodes[:, 1:]
+        edge = np.where((start >= 0) & (end >= 0), edge_index[np.maximum(start, 0), np.maximum(end, 0)], -1)
+        taken = edge >= 0
+        edge_counts += np.bincount((step_bins[:, None] * len(edges) + edge)[taken], minlength=len(edge_counts))
+
+    # Steps per bin: bin b starts at the first step s with s * bins >= b * steps
+    starts = (np.arange(bins + 1) * steps + bins - 1) // bins
+    sizes = np.diff(starts)[:, None]
+    node_rates = np.minimum(node_counts.reshape(bins, shown) / sizes, 1)
+    edge_rates = np.minimum(edge_counts.reshape(bins, len(edges)) / sizes, 1)
+    return node_rates, edge_rates
+
+
+def record_cartpole_trace(path, steps, rollouts=1000, seed=0):
+    """Trace of a small hierarchy balancing the cart-pole, for trying out replay.
+
+    Root team 0 hands the state to team 1 while the pole leans left and
+    to team 2 while it leans right; both defer to team 3, which pushes
+    left (action 0) or right (action 1). ``rollouts`` episodes from random
+    starts are simulated together and written one after the other.
+    """
+    rng = np.random.default_rng(seed)
+    policy = balancing_policy()
+    per_rollout = -(-steps // rollouts)
+    states = simulate(rng.uniform(-0.1, 0.1, (rollouts, 4)), per_rollout * DT, policy=policy).states
+    states = states[:, :-1].reshape(-1, 4)[:steps]
+
+    with TraceWriter(path, depth=3, teams=4) as writer:
+        for first in range(0, len(states), CHUNK_STEPS):
+            chunk = states[first:first + CHUNK_STEPS]
+            chains = np.zeros((len(chunk), 3), dtype=np.int32)
+            chains[:, 1] = np.where(chunk[:, THETA] < 0, 1, 2)
+            chains[:, 2] = 3
+            writer.append(chains, (policy(chunk, 0) > 0).astype(np.int32))
+    return path
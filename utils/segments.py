@@ -0,0 +1,149 @@
+"""Render one long scene in parallel, split into contiguous ranges of plays.
+
+A first pass runs construct() with every animation skipped to find how
+long each play is. The timeline is then cut into ranges of about equal
+duration, and each worker renders one range: plays before it are
+skipped (construct still runs, so the scene state is the same), and the
+scene ends early after it. The segment movies are joined in order.
+
+Workers must see the same random numbers, but skipped plays do not run
+their updaters frame by frame, so anything random inside a play could
+leave the generators in a different state. Segmented renders therefore
+reseed ``random``, ``numpy.random`` and the ``utils.streams`` streams
+from (seed, play index) after every play, so all workers agree whatever
+range they render.
+
+Updaters that take ``dt`` cannot be fast-forwarded that way: a skipped
+play advances them in one step of its whole run time rather than frame
+by frame, so a worker starting after them would draw a different state
+than a single process. Scenes with such updaters (e.g. the particle
+stream of HierarchyScene) are therefore rendered as one segment.
+"""
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from utils.render import OUTPUT_DIR, SceneRender, concat_movies, render_config, resolve_quality, scene_class
+from utils.streams import set_seed
+
+SEGMENT_DIR = OUTPUT_DIR / "media" / "segments"
+
+
+def play_seed(seed, index):
+    """Seed for the construct code that follows play ``index``."""
+    return int(np.random.SeedSequence([seed, index]).generate_state(1)[0])
+
+
+def reseed_between_plays(scene, seed, start=0, stop=None):
+    """Reseed after every play and skip plays outside ``[start, stop)``."""
+    from manim.utils.exceptions import EndSceneEarlyException
+
+    renderer = scene.renderer
+    play, update_skipping = renderer.play, renderer.update_skipping_status
+
+    def update_skipping_status():
+        update_skipping()
+        if renderer.num_plays < start:
+            renderer.skip_animations = True
+        if stop is not None and renderer.num_plays >= stop:
+            renderer.skip_animations = True
+            raise EndSceneEarlyException()
+
+    def seeded_play(*args, **kwargs):
+        try:
+            return play(*args, **kwargs)
+        finally:
+            state = play_seed(seed, renderer.num_plays)
+            random.seed(state)
+            np.random.seed(state)
+            set_seed(state)
+
+    renderer.update_skipping_status = update_skipping_status
+    renderer.play = seeded_play
+
+
+def has_dt_updaters(scene):
+    return any(mobject.has_time_based_updater() for mobject in scene.get_mobject_family_members())
+
+
+def play_durations(name, quality="h", seed=0, draft=False):
+    """Run time of every play of a scene, from a pass with all animations skipped.
+
+    Also returns whether any play ran with ``dt`` updaters on screen.
+    """
+    from manim import tempconfig
+    from utils.draft import set_draft
+
+    set_draft(draft)
+    durations = []
+    dt_updaters = False
+    with tempconfig(render_config(name, quality, SEGMENT_DIR, write_to_movie=False)):
+        scene = scene_class(name)(random_seed=seed, skip_animations=True)
+        reseed_between_plays(scene, seed)
+        play = scene.play
+
+        def timed_play(*args, **kwargs):
+            nonlocal dt_updaters
+            dt_updaters = dt_updaters or has_dt_updaters(scene)
+            play(*args, **kwargs)
+            dt_updaters = dt_updaters or has_dt_updaters(scene)
+            durations.append(scene.duration)
+        scene.play = timed_play
+        scene.render()
+    return durations, dt_updaters
+
+
+def split_plays(durations, segments):
+    """Contiguous ``(start, stop)`` play ranges of about equal total duration."""
+    segments = max(min(segments, len(durations)), 1)
+    ends = np.cumsum(durations)
+    cuts = np.searchsorted(ends, ends[-1] * np.arange(1, segments) / segments, side="right")
+    # Every segment keeps at least one play
+    cuts = np.maximum(cuts, np.arange(1, segments))
+    cuts = np.minimum(cuts, len(durations) - segments + np.arange(1, segments))
+    bounds = [0, *np.maximum.accumulate(cuts).tolist(), len(durations)]
+    return [(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+
+
+def render_segment(name, quality, seed, start, stop, index, draft=False):
+    """Render plays ``[start, stop)`` of a scene into their own movie."""
+    from manim import tempconfig
+    from utils.draft import set_draft
+
+    set_draft(draft)
+    media_dir = SEGMENT_DIR / f"{name}_{index:03}"
+    with tempconfig(render_config(name, quality, media_dir, disable_caching=True)):
+        scene = scene_class(name)(random_seed=seed)
+        reseed_between_plays(scene, seed, start, stop)
+        scene.render()
+        return Path(scene.renderer.file_writer.movie_file_path)
+
+
+def render_segmented(name, quality="h", segments=None, seed=None, draft=False, output=None):
+    """Render one scene across ``segments`` worker processes and join the pieces.
+
+    Scenes with ``dt`` updaters are rendered as a single segment, see the
+    module docstring.
+    """
+    start = time.perf_counter()
+    segments = segments or os.cpu_count() or 1
+    seed = random.randrange(2**32) if seed is None else seed
+    quality = resolve_quality(quality)
+
+    with ProcessPoolExecutor(max_workers=segments) as pool:
+        durations, dt_updaters = pool.submit(play_durations, name, quality, seed, draft).result()
+        ranges = split_plays(durations, 1 if dt_updaters else segments)
+        futures = [
+            pool.submit(render_segment, name, quality, seed, first, stop, index, draft)
+            for index, (first, stop) in enumerate(ranges)
+        ]
+        movies = [future.result() for future in futures]
+
+    suffix = "_draft" if draft else ""
+    output = Path(output or SEGMENT_DIR / f"{name}_{quality}{suffix}.mp4")
+    movie = concat_movies(movies, output)
+    return SceneRender(name, movie, time.perf_counter() - start, segments=len(ranges))
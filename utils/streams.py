@@ -0,0 +1,43 @@
+"""Named random streams that all follow one project seed.
+
+Every consumer asks for its own stream by name, e.g.
+``stream("graph.colors")``, instead of drawing from the global
+``random``/``numpy.random`` state. A stream's numbers depend only on the
+seed and its name, so adding draws to one stream, or a new stream, leaves
+every other one unchanged. ``set_seed`` (called by ``SeededScene`` with
+the scene's seed) restarts all streams, including generators already
+handed out.
+"""
+import os
+import zlib
+
+import numpy as np
+
+# Seed used when a scene is rendered without --seed
+DEFAULT_SEED = int(os.environ.get("TPG_SEED", "0"))
+
+_seed = DEFAULT_SEED
+_streams = {}
+
+
+def _bit_generator(name):
+    return np.random.PCG64(np.random.SeedSequence([_seed, zlib.crc32(name.encode())]))
+
+
+def get_seed():
+    return _seed
+
+
+def set_seed(seed=None):
+    """Restart every stream from ``seed`` (``DEFAULT_SEED`` when None)."""
+    global _seed
+    _seed = DEFAULT_SEED if seed is None else int(seed)
+    for name, generator in _streams.items():
+        generator.bit_generator.state = _bit_generator(name).state
+
+
+def stream(name):
+    """The ``numpy.random.Generator`` of stream ``name``, created on first use."""
+    if name not in _streams:
+        _streams[name] = np.random.Generator(_bit_generator(name))
+    return _streams[name]
@@ -0,0 +1,147 @@
+"""Per-play profiling of a scene render, written as a Chrome trace.
+
+``trace_scene`` wraps the bound methods of one scene instance, its
+renderer and its file writer, so scenes that are not traced run the
+untouched manim code. Every ``play``/``wait`` becomes a slice carrying
+its source line, animation types, run time, frame count, family size and
+the time spent interpolating, rendering and encoding, with one child
+slice per frame phase. Open the JSON in https://ui.perfetto.dev or
+chrome://tracing.
+"""
+from collections import Counter
+import json
+import os
+from pathlib import Path
+import sys
+import time
+
+from utils.render import OUTPUT_DIR, ROOT
+
+TRACE_DIR = OUTPUT_DIR / "traces"
+
+
+def _now():
+    return time.perf_counter_ns() / 1000
+
+
+def _internal_paths():
+    """Source paths skipped when looking for the line that called play()."""
+    import manim
+
+    return str(Path(__file__).resolve()), str(Path(manim.__file__).resolve().parent)
+
+
+def _source_line(internal):
+    """``file:line`` of the innermost caller outside ``internal`` paths."""
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename.startswith(internal):
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    path = Path(frame.f_code.co_filename)
+    if path.is_relative_to(ROOT):
+        path = path.relative_to(ROOT)
+    return f"{path.as_posix()}:{frame.f_lineno}"
+
+
+def _animation_names(animations):
+    counts = Counter(type(animation).__name__ for animation in animations)
+    return ", ".join(name if count == 1 else f"{name} x{count}" for name, count in counts.items())
+
+
+class Tracer:
+    """Collects Chrome trace events for one process."""
+
+    def __init__(self, name):
+        self.pid = os.getpid()
+        self.events = [
+            {"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0, "args": {"name": name}},
+        ]
+        self.play = None  # Phase totals of the play in progress
+
+    def slice(self, name, start, end, category, **args):
+        self.events.append({
+            "name": name, "cat": category, "ph": "X", "pid": self.pid, "tid": 0,
+            "ts": start, "dur": end - start, "args": args,
+        })
+
+    def counter(self, name, timestamp, **values):
+        self.events.append({
+            "name": name, "ph": "C", "pid": self.pid, "tid": 0, "ts": timestamp, "args": values,
+        })
+
+    def timed(self, phase, function, category="frame"):
+        """Wrap ``function`` so each call becomes a ``phase`` slice and adds to the play totals."""
+        def wrapper(*args, **kwargs):
+            start = _now()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                end = _now()
+                self.slice(phase, start, end, category)
+                if self.play is not None and phase in self.play:
+                    self.play[phase] += end - start
+        return wrapper
+
+    def write(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as fp:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, fp)
+        return path
+
+
+def trace_scene(scene, tracer=None):
+    """Instrument one scene instance and return its Tracer."""
+    tracer = tracer or Tracer(type(scene).__name__)
+    renderer, writer = scene.renderer, scene.renderer.file_writer
+    internal = _internal_paths()
+    frames = 0
+
+    scene.update_to_time = tracer.timed("interpolate", scene.update_to_time)
+    renderer.update_frame = tracer.timed("render", renderer.update_frame)
+    write_frame = tracer.timed("encode", writer.write_frame)
+
+    def count_frames(frame, num_frames=1):
+        nonlocal frames
+        frames += num_frames
+        return write_frame(frame, num_frames=num_frames)
+    writer.write_frame = count_frames
+
+    play = scene.play
+
+    def traced_play(*args, **kwargs):
+        source = _source_line(internal)
+        outer = tracer.play
+        tracer.play = dict.fromkeys(("interpolate", "render", "encode"), 0.0)
+        frames_before, start = frames, _now()
+        try:
+            return play(*args, **kwargs)
+        finally:
+            end = _now()
+            totals, tracer.play = tracer.play, outer
+            family = len(scene.get_mobject_family_members())
+            animations = getattr(scene, "animations", None) or []
+            tracer.slice(
+                _animation_names(animations) or "play", start, end, "play",
+                source=source,
+                run_time=getattr(scene, "duration", None),
+                frames=frames - frames_before,
+                family_size=family,
+                **{f"{phase}_ms": round(total / 1000, 3) for phase, total in totals.items()},
+            )
+            tracer.counter("mobjects", end, family=family)
+    scene.play = traced_play
+
+    for name in ("end_animation", "finish"):
+        setattr(writer, name, tracer.timed(name, getattr(writer, name), "movie"))
+    return tracer
+
+
+def render_traced(scene, path=None):
+    """Render a scene with tracing on and write its trace file."""
+    tracer = trace_scene(scene)
+    start = _now()
+    scene.render()
+    tracer.slice("render", start, _now(), "scene")
+    return tracer.write(path or TRACE_DIR / f"{type(scene).__name__}.trace.json")